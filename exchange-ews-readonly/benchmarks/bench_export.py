@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Export a synthetic mailbox to gzip NDJSON and report throughput and peak RSS."""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+
+_BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _IdQuery:
+    """Id-only FindItem projection materialised page by page, never as a full list."""
+
+    def __init__(self, count: int) -> None:
+        self._count = count
+
+    def all(self) -> "_IdQuery":
+        return self
+
+    def filter(self, **_kwargs: object) -> "_IdQuery":
+        return self
+
+    def order_by(self, _field: str) -> "_IdQuery":
+        return self
+
+    def values_list(self, *_fields: str) -> "_IdQuery":
+        return self
+
+    def __getitem__(self, page: slice) -> list[tuple[str, str]]:
+        return [(f"item-{n}", "ck") for n in range(page.start, min(page.stop, self._count))]
+
+
+class _Account:
+    def __init__(self, count: int, body_chars: int) -> None:
+        self.inbox = _IdQuery(count)
+        self._body = "lorem ipsum " * (body_chars // 12)
+
+    def fetch(self, ids: list[tuple[str, str]], folder: object, only_fields: list[str]) -> list[object]:
+        return [
+            SimpleNamespace(
+                id=item_id,
+                subject=f"subject {item_id}",
+                sender=SimpleNamespace(email_address="sender@example.local"),
+                to_recipients=[SimpleNamespace(email_address="user@example.local")],
+                cc_recipients=[],
+                datetime_received=_BASE + timedelta(seconds=int(item_id.split("-")[1])),
+                text_body=self._body,
+            )
+            for item_id, _ in ids
+        ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--body-chars", type=int, default=4000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    settings = Settings(
+        server="bench.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(
+            mailbox_rate_per_sec=100_000,
+            mailbox_burst=10_000,
+            mailbox_max_concurrency=16,
+            server_rate_per_sec=100_000,
+            server_burst=10_000,
+        ),
+    )
+    account = _Account(args.items, args.body_chars)
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "export.ndjson.gz")
+        result = service.export_messages(output, batch_size=args.batch, workers=args.workers)
+
+    print(f"items exported    {result.items}")
+    print(f"elapsed           {result.seconds:.2f} s ({result.items_per_second:,.0f} items/s)")
+    print(f"output size       {result.output_bytes / 1024:,.0f} KiB")
+    print(f"peak RSS          {result.peak_rss_kb:,} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare get/list tail latency across two simulated CAS nodes with and without hedged requests."""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+
+_HOSTS = ("cas1.sim.local", "cas2.sim.local")
+
+
+def _run(args: argparse.Namespace, hedge: bool) -> tuple[list[float], dict[str, object]]:
+    mailboxes = {
+        host: SimulatedMailbox(
+            items=args.items,
+            seed=1,
+            latency_seconds=args.latency_ms / 1000,
+            slow_fraction=args.slow_fraction,
+            slow_seconds=args.slow_ms / 1000,
+        )
+        for host in _HOSTS
+    }
+    settings = Settings(
+        server=_HOSTS[0],
+        failover_servers=_HOSTS[1:],
+        hedge_requests=hedge,
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(
+            mailbox_rate_per_sec=100_000,
+            mailbox_burst=10_000,
+            server_rate_per_sec=100_000,
+            server_burst=10_000,
+        ),
+    )
+    service = EwsReadonlyService(settings=settings, account_factory=lambda s: mailboxes[s.server])
+    message_id = service.list_messages(limit=1)[0].id
+    latencies: list[float] = []
+    for index in range(args.requests):
+        started = time.perf_counter()
+        if index % 2:
+            service.get_message(message_id)
+        else:
+            service.list_messages(limit=5)
+        latencies.append(time.perf_counter() - started)
+    service.close()
+    return sorted(latencies), service.endpoint_stats()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--slow-ms", type=float, default=150.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.01, help="Share of round-trips that hit the tail")
+    parser.add_argument("--histograms", action="store_true", help="Print per-endpoint latency histograms")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'hedges':>7} {'wins':>6}")
+    for hedge in (False, True):
+        latencies, stats = _run(args, hedge)
+        print(
+            f"{'hedged' if hedge else 'plain':<8} {_percentile(latencies, 0.50):>8.2f} {_percentile(latencies, 0.95):>8.2f} "
+            f"{_percentile(latencies, 0.99):>8.2f} {latencies[-1] * 1000:>8.2f} {stats['hedges']:>7} {stats['hedge_wins']:>6}"
+        )
+        if args.histograms:
+            print(json.dumps({host: entry["operations"] for host, entry in stats["endpoints"].items()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Run concurrent simulated clients against the service and compare throughput, latency, round-trips and RSS with a baseline."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+
+from exchange_ews_readonly.loadtest import (
+    LoadConfig,
+    compare_to_baseline,
+    load_baseline,
+    median_report,
+    run_load,
+    write_baseline,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = LoadConfig()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=defaults.items)
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--requests", type=int, default=defaults.requests_per_client, help="Requests per client per operation")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Simulated latency per round-trip")
+    parser.add_argument("--runs", type=int, default=1, help="Repeat and report the per-metric median")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--write-baseline", action="store_true", help="Overwrite --baseline with this run instead")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        items=args.items,
+        clients=args.clients,
+        requests_per_client=args.requests,
+        latency_ms=args.latency_ms,
+    )
+    report = median_report([run_load(config) for _ in range(max(1, args.runs))])
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(f"{'operation':<14} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'trips/op':>9} {'KiB/op':>8}")
+        for name, entry in report.operations.items():
+            print(
+                f"{name:<14} {entry.throughput_per_sec:>8.1f} {entry.p50_ms:>8.2f} {entry.p95_ms:>8.2f} "
+                f"{entry.p99_ms:>8.2f} {entry.round_trips_per_op:>9.2f} {entry.bytes_per_op / 1024:>8.1f}"
+            )
+        print(f"peak RSS {report.peak_rss_kb} KiB, growth during load {report.rss_growth_kb} KiB")
+
+    if args.write_baseline:
+        write_baseline(args.baseline, report)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    regressions = compare_to_baseline(report, load_baseline(args.baseline))
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Run mailbox_stats over a synthetic 100k-item mailbox and report time and peak memory.
+
+Runs a skewed (Pareto) sender mix and a uniform one where nearly every sender is
+distinct, which makes the heavy-hitter counter evict on almost every row.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+
+
+class _StreamingFolder:
+    """Serves (sender, received, is_read) rows page by page, like an offset-paged FindItem projection."""
+
+    def __init__(self, count: int, senders: int, seed: int, uniform: bool) -> None:
+        self.total_count = count
+        self.unread_count = count // 10
+        self.page_size: int | None = None
+        self._count = count
+        self._senders = [SimpleNamespace(email_address=f"sender{n}@example.local") for n in range(senders)]
+        self._seed = seed
+        self._uniform = uniform
+        self._rows = self._generate()
+        self._position = 0
+
+    def filter(self, **_kwargs: object) -> "_StreamingFolder":
+        return self
+
+    def order_by(self, _field: str) -> "_StreamingFolder":
+        return self
+
+    def values_list(self, *_fields: str) -> "_StreamingFolder":
+        return self
+
+    def __getitem__(self, window: slice) -> list[tuple[object, datetime, bool]]:
+        # Pages are requested in order; generating rows lazily keeps memory flat.
+        assert window.start == self._position, "pages must be read in order"
+        page = list(itertools.islice(self._rows, window.stop - window.start))
+        self._position += len(page)
+        return page
+
+    def _generate(self):
+        rng = random.Random(self._seed)
+        now = datetime.now(timezone.utc)
+        last = len(self._senders) - 1
+        for _ in range(self._count):
+            if self._uniform:
+                sender = self._senders[rng.randrange(len(self._senders))]
+            else:
+                # Skewed sender distribution: a few heavy senders and a long tail.
+                sender = self._senders[min(int(rng.paretovariate(1.2)) - 1, last)]
+            yield sender, now - timedelta(minutes=rng.randrange(30 * 24 * 60)), rng.random() < 0.9
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--senders", type=int, default=20_000)
+    parser.add_argument("--distinct-senders", type=int, default=50_000, help="Sender pool of the uniform mix")
+    args = parser.parse_args(argv)
+
+    settings = Settings(
+        server="bench.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    for mix, senders, uniform in (("pareto", args.senders, False), ("uniform", args.distinct_senders, True)):
+        account = SimpleNamespace(inbox=_StreamingFolder(args.items, senders, seed=1, uniform=uniform))
+        service = EwsReadonlyService(settings=settings, account_factory=lambda _, a=account: a)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        stats = service.mailbox_stats(days=30, top=5)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"== {mix} senders ({senders} in pool)")
+        print(f"items scanned     {stats.scanned}")
+        print(f"elapsed           {elapsed:.2f} s ({stats.scanned / elapsed:,.0f} items/s)")
+        print(f"peak traced mem   {peak / 1024:,.0f} KiB")
+        print(f"senders exact     {stats.senders_exact}")
+        for row in stats.top_senders:
+            print(f"  {row['sender']:<32} {row['count']:>7} unread {row['unread']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Compare the compiled QueryMatcher with the legacy per-item haystack loop."""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from exchange_ews_readonly.query import QueryMatcher
+
+_WORDS = ["invoice", "reminder", "meeting", "report", "budget", "review", "contract", "order", "status", "deadline"]
+
+
+def _synthetic_items(count: int, body_chars: int, seed: int) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    items = []
+    for index in range(count):
+        subject = " ".join(rng.choice(_WORDS).title() for _ in range(4))
+        sender = f"user{index % 97}@example.local"
+        filler = "".join(rng.choice(string.ascii_lowercase + "     ") for _ in range(body_chars))
+        items.append((subject, sender, filler))
+    return items
+
+
+def _legacy(needle: str, items: list[tuple[str, str, str]]) -> int:
+    hits = 0
+    for subject, sender, body in items:
+        haystack = " ".join([subject, sender, body]).lower()
+        if needle in haystack:
+            hits += 1
+    return hits
+
+
+def _compiled(matcher: QueryMatcher, items: list[tuple[str, str, str]]) -> int:
+    hits = 0
+    for subject, sender, body in items:
+        if matcher.matches(subject=subject, sender=sender, body=lambda body=body: body):
+            hits += 1
+    return hits
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--body-chars", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    items = _synthetic_items(args.items, args.body_chars, seed=1)
+    for query in ["invoice", "subject:invoice", "invoice OR deadline", " ".join(f"zz{n}" for n in range(20))]:
+        matcher = QueryMatcher(query)
+        compiled = _best_of(args.repeat, lambda: _compiled(matcher, items))
+        line = f"{query[:40]:<42} compiled {compiled * 1000:8.1f} ms"
+        if " " not in query and ":" not in query:
+            legacy = _best_of(args.repeat, lambda: _legacy(query, items))
+            line += f"   legacy {legacy * 1000:8.1f} ms   speedup {legacy / compiled:5.1f}x"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Time service operations against the in-process mailbox simulator and report EWS round-trips and bytes."""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pstats
+import time
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--body-chars", type=int, default=2000, help="Median body size")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--profile", action="store_true", help="Print the top cProfile entries per operation")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    mailbox = SimulatedMailbox(items=args.items, body_median_chars=args.body_chars)
+    print(f"generated {args.items:,} items in {time.perf_counter() - started:.2f} s")
+
+    settings = Settings(
+        server="sim.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(
+            mailbox_rate_per_sec=100_000,
+            mailbox_burst=10_000,
+            server_rate_per_sec=100_000,
+            server_burst=10_000,
+        ),
+    )
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+    newest = service.list_messages(limit=1)[0].id
+    operations = {
+        "list": lambda: service.list_messages(limit=50),
+        "get": lambda: service.get_message(newest),
+        "search": lambda: service.search_messages("invoice OR budget", days=30, limit=50),
+        "conversations": lambda: service.list_conversations(limit=20, days=30),
+    }
+
+    print(f"{'operation':<14} {'ms/op':>8} {'trips/op':>9} {'KiB/op':>9}")
+    for name, operation in operations.items():
+        mailbox.stats.reset()
+        profiler = cProfile.Profile() if args.profile else None
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        for _ in range(args.repeat):
+            operation()
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+        trips = mailbox.stats.round_trips / args.repeat
+        size = mailbox.stats.bytes / args.repeat / 1024
+        print(f"{name:<14} {elapsed / args.repeat * 1000:>8.2f} {trips:>9.1f} {size:>9.0f}")
+        if profiler is not None:
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(8)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Wire vs decoded size of simulated FindItem/GetItem responses, and XML parse time by read chunk size."""
+from __future__ import annotations
+
+import argparse
+import gzip
+import time
+import zlib
+
+import requests
+from exchangelib.util import to_xml
+
+from exchange_ews_readonly.simulator import SimulatedMailbox, soap_response
+
+
+def _parse_seconds(payload: bytes, chunk_size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        response = requests.Response()
+        response._content = payload
+        response._content_consumed = True
+        started = time.perf_counter()
+        to_xml(response.iter_content(chunk_size))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--page", type=int, default=100, help="Messages per response (FindItem page / GetItem chunk)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    mailbox = SimulatedMailbox(items=args.items, seed=1)
+    headers = list(mailbox.inbox.all().order_by("-datetime_received").only("id", "subject", "sender")[: args.page])
+    bodies = list(mailbox.fetch(ids=headers, only_fields=["subject", "sender", "datetime_received", "text_body", "body"]))
+    print(f"{'response':<16} {'decoded KiB':>12} {'gzip KiB':>9} {'deflate KiB':>12} {'1 B chunks ms':>14} {'64 KiB ms':>10}")
+    for name, payload in (("FindItem", soap_response("FindItem", headers)), ("GetItem+bodies", soap_response("GetItem", bodies))):
+        print(
+            f"{name:<16} {len(payload) / 1024:>12.1f} {len(gzip.compress(payload)) / 1024:>9.1f} "
+            f"{len(zlib.compress(payload)) / 1024:>12.1f} {_parse_seconds(payload, 1, args.repeat) * 1000:>14.1f} "
+            f"{_parse_seconds(payload, 64 * 1024, args.repeat) * 1000:>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
 from .config import AuthType, Settings
+from .transport import scope_transport
+from .version_cache import VersionCache
+
+# exchangelib error class names raised when the requested schema/server version is rejected.
+_VERSION_ERROR_NAMES = frozenset(
+    {
+        "ErrorInvalidServerVersion",
+        "ErrorIncorrectSchemaVersion",
+        "ErrorInvalidSchemaVersionForMailboxVersion",
+    }
+)
 
 
 class EwsConnectionError(RuntimeError):
@@ -15,10 +26,19 @@ def build_account(settings: Settings) -> object:
     - Uses autodiscover=False by design.
     - Supports NTLM (default) and BASIC auth only.
     - Does not perform or expose any mailbox write operation.
+    - Safe to call from several threads; the HTTP session pool is sized to
+      ``settings.account_pool_size`` so pooled accounts do not queue on one session.
+    - Reuses a cached server version/endpoint (see ``remember_version``) so the
+      first request does not pay for exchangelib's version probe.
+    - Timeout and TLS verification are scoped to this endpoint's protocol (see
+      ``scope_transport``), so services for different tenants can share a process.
+    - Responses are requested gzip/deflate-compressed and decoded incrementally;
+      wire and decoded bytes are counted per EWS operation (``transport_stats``).
     """
     try:
-        from exchangelib import Account, BASIC, Configuration, Credentials, DELEGATE, NTLM
-        from exchangelib.protocol import BaseProtocol, NoVerifyHTTPAdapter
+        from exchangelib import Account, BASIC, Build, Configuration, Credentials, DELEGATE, NTLM, Version
+        from exchangelib.protocol import NoVerifyHTTPAdapter, Protocol
+        from requests.adapters import HTTPAdapter
     except Exception as exc:  # pragma: no cover - environment dependent
         raise EwsConnectionError(
             "Failed to import exchangelib runtime dependencies"
@@ -32,16 +52,26 @@ def build_account(settings: Settings) -> object:
 
         auth_type = NTLM if settings.auth_type == AuthType.NTLM else BASIC
 
-        # Global exchangelib protocol options.
-        BaseProtocol.TIMEOUT = settings.timeout_seconds
-        if not settings.verify_tls:
-            BaseProtocol.HTTP_ADAPTER_CLS = NoVerifyHTTPAdapter
+        cached = _version_cache(settings).load(settings) if settings.version_cache_path else None
+        if cached is not None:
+            config = Configuration(
+                service_endpoint=cached.service_endpoint,
+                credentials=credentials,
+                auth_type=auth_type,
+                version=Version(build=Build(*cached.build), api_version=cached.api_version),
+                max_connections=settings.account_pool_size,
+            )
+        else:
+            config = Configuration(
+                server=settings.server,
+                credentials=credentials,
+                auth_type=auth_type,
+                max_connections=settings.account_pool_size,
+            )
 
-        config = Configuration(
-            server=settings.server,
-            credentials=credentials,
-            auth_type=auth_type,
-        )
+        # Account() looks up the same cached protocol, so scope it before any request is made.
+        protocol = Protocol(config=config)
+        scope_transport(protocol, settings, HTTPAdapter if settings.verify_tls else NoVerifyHTTPAdapter)
 
         account = Account(
             primary_smtp_address=settings.email,
@@ -56,3 +86,59 @@ def build_account(settings: Settings) -> object:
             "Failed to create EWS account connection. "
             "Check server/auth/TLS settings and mailbox permissions."
         ) from exc
+
+
+def remember_version(settings: Settings, account: object) -> bool:
+    """
+    Persist the version exchangelib negotiated for ``account``, if known.
+
+    Reads the protocol configuration directly so it never triggers a probe itself.
+    Returns True when an entry was written.
+    """
+    if not settings.version_cache_path:
+        return False
+    protocol = getattr(account, "protocol", None)
+    config = getattr(protocol, "config", None)
+    version = getattr(config, "version", None)
+    build = getattr(version, "build", None)
+    endpoint = getattr(config, "service_endpoint", None)
+    if build is None or not endpoint:
+        return False
+    try:
+        parts = (build.major_version, build.minor_version, build.major_build, build.minor_build)
+        cache = _version_cache(settings)
+        cached = cache.load(settings)
+        if cached is not None and (cached.build, cached.api_version, cached.service_endpoint) == (
+            parts,
+            str(version.api_version),
+            str(endpoint),
+        ):
+            return True
+        cache.store(settings, parts, str(version.api_version), str(endpoint))
+    except (AttributeError, OSError):
+        return False
+    return True
+
+
+def forget_version(settings: Settings, account: object | None = None) -> None:
+    """Drop the cached version and make ``account`` re-probe it on the next request."""
+    if settings.version_cache_path:
+        try:
+            _version_cache(settings).invalidate(settings)
+        except OSError:
+            pass
+    config = getattr(getattr(account, "protocol", None), "config", None)
+    if config is not None and hasattr(config, "version"):
+        config.version = None
+    # exchangelib's Account copies the protocol version on first use and services send that copy,
+    # so it has to go as well. Checked via vars(): reading ``account.version`` would start a probe.
+    if "_version" in getattr(account, "__dict__", {}):
+        account.version = None
+
+
+def is_version_error(exc: BaseException) -> bool:
+    return any(klass.__name__ in _VERSION_ERROR_NAMES for klass in type(exc).__mro__)
+
+
+def _version_cache(settings: Settings) -> VersionCache:
+    return VersionCache(settings.version_cache_path)
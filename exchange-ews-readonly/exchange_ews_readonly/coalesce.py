@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one execution.
+
+    Callers that arrive while a call with the same key is running wait for it and
+    receive its result (or its exception). With ``ttl_seconds > 0`` a finished
+    result is also reused for that long, which absorbs short bursts. Expired
+    results are swept on every insert and at most ``max_results`` are kept
+    (the soonest to expire go first), so many distinct keys cannot grow the
+    cache without bound.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_results: int = 1024,
+    ) -> None:
+        if max_results <= 0:
+            raise ValueError("max_results must be > 0")
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._max_results = max_results
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        # Insertion order is expiry order: every entry lives for the same ttl.
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._calls = 0
+        self._shared = 0
+        self._cached = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self._calls += 1
+            cached = self._results.get(key)
+            if cached is not None:
+                expires_at, value = cached
+                if self._clock() < expires_at:
+                    self._cached += 1
+                    return value
+                del self._results[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self._shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self._ttl_seconds > 0:
+                    self._store(key, flight.result)
+            flight.done.set()
+        return flight.result
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = self._clock()
+        self._results.pop(key, None)
+        self._results[key] = (now + self._ttl_seconds, value)
+        while self._results:
+            oldest_key, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now and len(self._results) <= self._max_results:
+                break
+            del self._results[oldest_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            hits = self._shared + self._cached
+            return {
+                "calls": self._calls,
+                "shared": self._shared,
+                "cached": self._cached,
+                "results": len(self._results),
+                "hit_rate": round(hits / self._calls, 4) if self._calls else 0.0,
+            }
@@ -6,6 +6,10 @@ from enum import Enum
 
 from .errors import ConfigError
 
+DEFAULT_VERSION_CACHE_PATH = "~/.cache/exchange-ews-readonly/versions.json"
+DEFAULT_SEARCH_CACHE_PATH = "~/.cache/exchange-ews-readonly/search.json"
+DEFAULT_HANDLE_MAP_PATH = "~/.cache/exchange-ews-readonly/handles.json"
+
 try:
     from cryptography.fernet import Fernet, InvalidToken
 except Exception:  # pragma: no cover - dependency/runtime dependent
@@ -26,11 +30,58 @@ class Limits:
     search_days_max: int = 30
     preview_default: int = 500
     preview_max: int = 1000
+    conversations_default: int = 5
+    conversations_max: int = 20
+    conversation_scan_max: int = 500
+    stats_top_default: int = 10
+    stats_top_max: int = 100
+    watch_poll_seconds_default: int = 5
+    watch_poll_seconds_max: int = 60
+    export_batch_default: int = 100
+    export_batch_max: int = 500
+    export_workers_default: int = 4
+    export_workers_max: int = 8
+    calendar_days_default: int = 7
+    calendar_days_max: int = 31
+    calendar_default: int = 50
+    calendar_max: int = 200
 
     def __post_init__(self) -> None:
         _validate_limit_pair("list", self.list_default, self.list_max)
         _validate_limit_pair("search days", self.search_days_default, self.search_days_max)
         _validate_limit_pair("preview", self.preview_default, self.preview_max)
+        _validate_limit_pair("conversations", self.conversations_default, self.conversations_max)
+        _validate_limit_pair("stats top", self.stats_top_default, self.stats_top_max)
+        _validate_limit_pair("watch poll seconds", self.watch_poll_seconds_default, self.watch_poll_seconds_max)
+        _validate_limit_pair("export batch", self.export_batch_default, self.export_batch_max)
+        _validate_limit_pair("export workers", self.export_workers_default, self.export_workers_max)
+        _validate_limit_pair("calendar days", self.calendar_days_default, self.calendar_days_max)
+        _validate_limit_pair("calendar", self.calendar_default, self.calendar_max)
+        if self.conversation_scan_max <= 0:
+            raise ConfigError("conversation scan max must be > 0")
+
+
+@dataclass(frozen=True)
+class Throttling:
+    mailbox_rate_per_sec: float = 5.0
+    mailbox_burst: int = 10
+    mailbox_max_concurrency: int = 4
+    server_rate_per_sec: float = 20.0
+    server_burst: int = 40
+    server_max_concurrency: int = 16
+    min_rate_per_sec: float = 0.2
+    lock_dir: str = ""
+    process_max_concurrency: int = 0
+
+    def __post_init__(self) -> None:
+        _validate_rate("mailbox", self.mailbox_rate_per_sec, self.mailbox_burst, self.mailbox_max_concurrency)
+        _validate_rate("server", self.server_rate_per_sec, self.server_burst, self.server_max_concurrency)
+        if self.min_rate_per_sec <= 0:
+            raise ConfigError("throttle min rate must be > 0")
+        if self.min_rate_per_sec > min(self.mailbox_rate_per_sec, self.server_rate_per_sec):
+            raise ConfigError("throttle min rate cannot exceed mailbox or server rate")
+        if self.process_max_concurrency < 0:
+            raise ConfigError("process max connections must be >= 0")
 
 
 @dataclass(frozen=True)
@@ -43,10 +94,26 @@ class Settings:
     verify_tls: bool = True
     timeout_seconds: int = 30
     limits: Limits = field(default_factory=Limits)
+    throttling: Throttling = field(default_factory=Throttling)
+    result_ttl_seconds: float = 0.0
+    account_pool_size: int = 1
+    version_cache_path: str = ""
+    search_cache: str = ""
+    search_cache_ttl_seconds: float = 300.0
+    search_cache_size: int = 128
+    eager_connect: bool = False
+    failover_servers: tuple[str, ...] = ()
+    hedge_requests: bool = False
+    handle_map_path: str = DEFAULT_HANDLE_MAP_PATH
+
+    @property
+    def servers(self) -> tuple[str, ...]:
+        """Every configured EWS host, primary first."""
+        return (self.server, *self.failover_servers)
 
     @classmethod
     def from_env(cls) -> "Settings":
-        server = _read_server("EXCHANGE_EWS_SERVER")
+        server, *failover_servers = _read_servers("EXCHANGE_EWS_SERVER")
         email = _read_email("EXCHANGE_EWS_EMAIL")
         username = _optional_env("EXCHANGE_EWS_USERNAME") or email
         password = _read_password()
@@ -55,6 +122,18 @@ class Settings:
         auth_type = _read_auth_type(raw_auth)
         verify_tls = _read_bool("EXCHANGE_EWS_VERIFY_TLS", default=True)
         timeout_seconds = _read_int("EXCHANGE_EWS_TIMEOUT_SEC", default=30, minimum=1, maximum=300)
+        throttling = _read_throttling()
+        version_cache_path = _read_version_cache_path()
+        account_pool_size = _read_int("EXCHANGE_EWS_ACCOUNT_POOL_SIZE", default=1, minimum=1, maximum=64)
+        result_ttl_seconds = _read_float("EXCHANGE_EWS_RESULT_TTL_SEC", default=0.0, minimum=0.0, maximum=60.0)
+        search_cache = _read_search_cache()
+        search_cache_ttl_seconds = _read_float(
+            "EXCHANGE_EWS_SEARCH_CACHE_TTL_SEC", default=300.0, minimum=1.0, maximum=86400.0
+        )
+        search_cache_size = _read_int("EXCHANGE_EWS_SEARCH_CACHE_SIZE", default=128, minimum=1, maximum=10000)
+        eager_connect = _read_bool("EXCHANGE_EWS_EAGER_CONNECT", default=False)
+        hedge_requests = _read_bool("EXCHANGE_EWS_HEDGE", default=False)
+        handle_map_path = _optional_env("EXCHANGE_EWS_HANDLE_MAP") or DEFAULT_HANDLE_MAP_PATH
 
         return cls(
             server=server,
@@ -65,16 +144,79 @@ class Settings:
             verify_tls=verify_tls,
             timeout_seconds=timeout_seconds,
             limits=Limits(),
+            throttling=throttling,
+            result_ttl_seconds=result_ttl_seconds,
+            account_pool_size=account_pool_size,
+            version_cache_path=version_cache_path,
+            search_cache=search_cache,
+            search_cache_ttl_seconds=search_cache_ttl_seconds,
+            search_cache_size=search_cache_size,
+            eager_connect=eager_connect,
+            failover_servers=tuple(failover_servers),
+            hedge_requests=hedge_requests,
+            handle_map_path=handle_map_path,
         )
 
 
-def _read_server(name: str) -> str:
-    value = _require_env(name)
-    if "://" in value:
-        raise ConfigError(f"{name} must be a host name only (without http/https scheme)")
-    if "/" in value:
-        raise ConfigError(f"{name} must not contain a URL path")
-    return value
+def _read_version_cache_path() -> str:
+    raw = _optional_env("EXCHANGE_EWS_VERSION_CACHE")
+    if not raw:
+        return DEFAULT_VERSION_CACHE_PATH
+    if raw.lower() in {"0", "false", "no", "off", "none"}:
+        return ""
+    return raw
+
+
+def _read_search_cache() -> str:
+    raw = _optional_env("EXCHANGE_EWS_SEARCH_CACHE")
+    if raw.lower() in {"", "0", "false", "no", "off", "none"}:
+        return ""
+    if raw.lower() == "memory":
+        return "memory"
+    if raw.lower() == "disk":
+        return DEFAULT_SEARCH_CACHE_PATH
+    return raw
+
+
+def _read_throttling() -> Throttling:
+    defaults = Throttling()
+    mailbox_rate = _read_float("EXCHANGE_EWS_RATE_PER_SEC", default=defaults.mailbox_rate_per_sec, minimum=0.01, maximum=1000)
+    server_rate = _read_float(
+        "EXCHANGE_EWS_SERVER_RATE_PER_SEC", default=defaults.server_rate_per_sec, minimum=0.01, maximum=10000
+    )
+    return Throttling(
+        mailbox_rate_per_sec=mailbox_rate,
+        mailbox_burst=_read_int("EXCHANGE_EWS_RATE_BURST", default=defaults.mailbox_burst, minimum=1, maximum=1000),
+        mailbox_max_concurrency=_read_int(
+            "EXCHANGE_EWS_MAX_CONCURRENCY", default=defaults.mailbox_max_concurrency, minimum=1, maximum=100
+        ),
+        server_rate_per_sec=server_rate,
+        server_burst=_read_int("EXCHANGE_EWS_SERVER_RATE_BURST", default=defaults.server_burst, minimum=1, maximum=10000),
+        server_max_concurrency=_read_int(
+            "EXCHANGE_EWS_SERVER_MAX_CONCURRENCY", default=defaults.server_max_concurrency, minimum=1, maximum=1000
+        ),
+        # Adaptive back-off never drops below this floor; keep it under both configured rates.
+        min_rate_per_sec=min(defaults.min_rate_per_sec, mailbox_rate, server_rate),
+        lock_dir=_optional_env("EXCHANGE_EWS_THROTTLE_LOCK_DIR"),
+        process_max_concurrency=_read_int(
+            "EXCHANGE_EWS_PROCESS_MAX_CONNECTIONS", default=0, minimum=0, maximum=10000
+        ),
+    )
+
+
+def _read_servers(name: str) -> list[str]:
+    # A comma-separated list names several CAS nodes for the same mailboxes; the first is the primary.
+    values = [value.strip() for value in _require_env(name).split(",")]
+    if not all(values):
+        raise ConfigError(f"{name} must not contain empty host names")
+    if len({value.lower() for value in values}) != len(values):
+        raise ConfigError(f"{name} must not repeat a host name")
+    for value in values:
+        if "://" in value:
+            raise ConfigError(f"{name} must be a host name only (without http/https scheme)")
+        if "/" in value:
+            raise ConfigError(f"{name} must not contain a URL path")
+    return values
 
 
 def _read_email(name: str) -> str:
@@ -170,6 +312,19 @@ def _read_int(name: str, default: int, minimum: int, maximum: int) -> int:
     return value
 
 
+def _read_float(name: str, default: float, minimum: float, maximum: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise ConfigError(f"{name} must be a number") from exc
+    if value < minimum or value > maximum:
+        raise ConfigError(f"{name} must be between {minimum:g} and {maximum:g}")
+    return value
+
+
 def _validate_limit_pair(label: str, default: int, maximum: int) -> None:
     if default <= 0:
         raise ConfigError(f"{label} default must be > 0")
@@ -177,3 +332,12 @@ def _validate_limit_pair(label: str, default: int, maximum: int) -> None:
         raise ConfigError(f"{label} max must be > 0")
     if default > maximum:
         raise ConfigError(f"{label} default cannot exceed max")
+
+
+def _validate_rate(label: str, rate: float, burst: int, max_concurrency: int) -> None:
+    if rate <= 0:
+        raise ConfigError(f"{label} rate must be > 0")
+    if burst <= 0:
+        raise ConfigError(f"{label} burst must be > 0")
+    if max_concurrency <= 0:
+        raise ConfigError(f"{label} max concurrency must be > 0")
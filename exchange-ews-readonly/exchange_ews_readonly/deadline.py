@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from .errors import DeadlineExceededError
+
+_CURRENT: ContextVar[Deadline | None] = ContextVar("exchange_ews_readonly_deadline", default=None)
+
+
+class Deadline:
+    """An absolute point in time by which an operation, and all its EWS requests, must finish."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if seconds <= 0:
+            raise ValueError("deadline must be > 0")
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._expires_at
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceededError("operation deadline exceeded")
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[Deadline | None]:
+    """
+    Make ``seconds`` the deadline of everything run in this context.
+
+    Nested scopes never extend an outer deadline. ``None`` keeps the current one.
+    """
+    outer = _CURRENT.get()
+    if seconds is None:
+        yield outer
+        return
+    deadline = Deadline(seconds)
+    if outer is not None and outer.remaining() < deadline.remaining():
+        deadline = outer
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _CURRENT.get()
+
+
+def check_deadline() -> None:
+    deadline = _CURRENT.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def deadline_expired() -> bool:
+    deadline = _CURRENT.get()
+    return deadline is not None and deadline.expired
+
+
+def wait_within_deadline(cond: threading.Condition, timeout: float | None = None) -> None:
+    """
+    ``cond.wait(timeout)`` that never waits past the current deadline.
+
+    Raises ``DeadlineExceededError`` once the deadline has passed, so a caller
+    looping on a condition gives up instead of blocking forever.
+    """
+    deadline = _CURRENT.get()
+    if deadline is not None:
+        deadline.check()
+        remaining = deadline.remaining()
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    cond.wait(timeout)
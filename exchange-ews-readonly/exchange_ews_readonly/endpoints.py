@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable
+
+from .errors import DeadlineExceededError
+from .throttle import is_throttling_error
+
+# exchangelib error class names that mean "this node could not answer", not "the answer is no".
+_FAILOVER_ERROR_NAMES = frozenset(
+    {
+        "TransportError",
+        "RedirectError",
+        "ErrorInternalServerTransientError",
+        "ErrorMailboxStoreUnavailable",
+    }
+)
+
+# Log-spaced bucket upper bounds from 1 ms to ~2 min, 25% apart.
+_BUCKET_BOUNDS = tuple(0.001 * 1.25**index for index in range(53))
+
+
+def is_failover_error(exc: BaseException) -> bool:
+    """True when another endpoint may succeed where this one failed."""
+    if isinstance(exc, DeadlineExceededError):
+        return False
+    # Throttling budgets are per mailbox across the whole CAS array; another node would refuse too.
+    if is_throttling_error(exc):
+        return False
+    if isinstance(exc, OSError):
+        return True
+    return any(klass.__name__ in _FAILOVER_ERROR_NAMES for klass in type(exc).__mro__)
+
+
+class LatencyHistogram:
+    """Fixed log-bucket latency histogram; percentiles are bucket upper bounds (at most 25% high)."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def record(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self._count += 1
+        self._max = max(self._max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if self._count == 0:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self._count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(_BUCKET_BOUNDS[index], self._max) if index < len(_BUCKET_BOUNDS) else self._max
+        return self._max  # pragma: no cover
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self._count,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self._max * 1000, 3),
+        }
+
+
+class _Endpoint:
+    def __init__(self, host: str, order: int) -> None:
+        self.host = host
+        self.order = order
+        self.latency = LatencyHistogram()
+        self.operations: dict[str, LatencyHistogram] = {}
+        self.ewma_seconds = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+
+class EndpointSet:
+    """
+    Health-scored ordering of equivalent EWS endpoints.
+
+    Healthy endpoints are ranked by a moving average of their latency (ties keep
+    the configured order, so the primary is tried first until there is data).
+    A failed endpoint is skipped for ``cooldown_seconds``, doubling per
+    consecutive failure up to ``max_cooldown_seconds``; it is still tried last
+    rather than never. Latency is kept per endpoint and per operation label,
+    and the per-operation p95 drives the hedge delay.
+    """
+
+    def __init__(
+        self,
+        hosts: tuple[str, ...] | list[str],
+        cooldown_seconds: float = 5.0,
+        max_cooldown_seconds: float = 300.0,
+        hedge_min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not hosts:
+            raise ValueError("endpoint set needs at least one host")
+        self._endpoints = {host: _Endpoint(host, order) for order, host in enumerate(hosts)}
+        self._cooldown = cooldown_seconds
+        self._max_cooldown = max_cooldown_seconds
+        self._hedge_min_samples = hedge_min_samples
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._failovers = 0
+
+    @property
+    def hosts(self) -> list[str]:
+        return list(self._endpoints)
+
+    def ranked(self) -> list[str]:
+        now = self._clock()
+        with self._lock:
+            endpoints = sorted(
+                self._endpoints.values(),
+                key=lambda endpoint: (endpoint.down_until > now, endpoint.ewma_seconds, endpoint.order),
+            )
+        return [endpoint.host for endpoint in endpoints]
+
+    def record_success(self, host: str, operation: str, seconds: float) -> None:
+        with self._lock:
+            endpoint = self._endpoints[host]
+            endpoint.requests += 1
+            endpoint.consecutive_failures = 0
+            endpoint.down_until = 0.0
+            endpoint.latency.record(seconds)
+            endpoint.operations.setdefault(operation, LatencyHistogram()).record(seconds)
+            endpoint.ewma_seconds = seconds if endpoint.requests == 1 else 0.8 * endpoint.ewma_seconds + 0.2 * seconds
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            endpoint = self._endpoints[host]
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            cooldown = min(self._cooldown * 2 ** (endpoint.consecutive_failures - 1), self._max_cooldown)
+            endpoint.down_until = self._clock() + cooldown
+
+    def record_failover(self) -> None:
+        with self._lock:
+            self._failovers += 1
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self._hedges += 1
+            self._hedge_wins += int(won)
+
+    def hedge_delay(self, host: str, operation: str) -> float | None:
+        """p95 latency of ``operation`` on ``host``, or None until enough samples exist."""
+        with self._lock:
+            histogram = self._endpoints[host].operations.get(operation)
+            if histogram is None or histogram.count < self._hedge_min_samples:
+                return None
+            return histogram.percentile(0.95)
+
+    def stats(self) -> dict[str, object]:
+        now = self._clock()
+        with self._lock:
+            endpoints = {
+                endpoint.host: {
+                    "healthy": endpoint.down_until <= now,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "consecutive_failures": endpoint.consecutive_failures,
+                    "latency": endpoint.latency.snapshot(),
+                    "operations": {name: histogram.snapshot() for name, histogram in sorted(endpoint.operations.items())},
+                }
+                for endpoint in self._endpoints.values()
+            }
+            return {
+                "endpoints": endpoints,
+                "failovers": self._failovers,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+            }
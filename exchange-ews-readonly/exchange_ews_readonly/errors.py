@@ -14,3 +14,7 @@ class ConfigError(ValueError):
 
 class MessageNotFoundError(LookupError):
     """Raised when message lookup returns no result."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when an operation's deadline passes before its next EWS request."""
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+from .models import ExportResult
+
+try:
+    import resource
+except Exception:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+_CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def checkpoint_path(output_path: str) -> str:
+    return output_path + _CHECKPOINT_SUFFIX
+
+
+class ExportCheckpoint:
+    """
+    Resume point of an export: where the last complete gzip member ends in the
+    output file, and the newest ``datetime_received`` (with the ids seen at that
+    exact timestamp) that made it into the file. ``folder`` and ``days`` record
+    which export the file belongs to, so a different one never resumes it.
+    """
+
+    def __init__(
+        self,
+        output_bytes: int = 0,
+        items: int = 0,
+        last_received: str = "",
+        ids_at_last: list[str] | None = None,
+        folder: str = "",
+        days: int | None = None,
+    ) -> None:
+        self.folder = folder
+        self.days = days
+        self.output_bytes = output_bytes
+        self.items = items
+        self.last_received = last_received
+        self.ids_at_last = ids_at_last or []
+
+    @classmethod
+    def load(cls, path: str) -> ExportCheckpoint | None:
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            days = data["days"]
+            return cls(
+                folder=str(data["folder"]),
+                days=None if days is None else int(days),
+                output_bytes=int(data["output_bytes"]),
+                items=int(data["items"]),
+                last_received=str(data["last_received"]),
+                ids_at_last=[str(value) for value in data["ids_at_last"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".export-", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "folder": self.folder,
+                    "days": self.days,
+                    "output_bytes": self.output_bytes,
+                    "items": self.items,
+                    "last_received": self.last_received,
+                    "ids_at_last": self.ids_at_last,
+                },
+                handle,
+            )
+        os.replace(tmp_path, path)
+
+    def advance(self, received: str, item_id: str) -> None:
+        self.items += 1
+        if received != self.last_received:
+            self.last_received = received
+            self.ids_at_last = []
+        self.ids_at_last.append(item_id)
+
+
+class MailboxExporter:
+    """
+    Streaming export pipeline: id pages -> bounded parallel batch fetch -> gzip NDJSON.
+
+    ``id_pages`` yields lists of ``(id, changekey)`` oldest first. Up to
+    ``workers * 2`` batches are in flight, and batches are written in order, so
+    memory is bounded by the in-flight window rather than the mailbox size.
+    Every ``checkpoint_every`` batches the current gzip member is closed, the
+    file is flushed and the checkpoint updated; a resumed export truncates the
+    file to the last checkpoint and appends a new member. Resuming a file
+    written for another ``folder`` or ``days`` window raises ``ValueError``.
+    """
+
+    def __init__(
+        self,
+        id_pages: Callable[[ExportCheckpoint], Iterator[list[tuple[str, str]]]],
+        fetch_batch: Callable[[list[tuple[str, str]]], list[dict[str, Any]]],
+        batch_size: int,
+        workers: int,
+        checkpoint_every: int = 10,
+        clock: Callable[[], float] = time.perf_counter,
+        folder: str = "",
+        days: int | None = None,
+    ) -> None:
+        self._id_pages = id_pages
+        self._fetch_batch = fetch_batch
+        self._batch_size = batch_size
+        self._workers = workers
+        self._checkpoint_every = checkpoint_every
+        self._clock = clock
+        self._folder = folder
+        self._days = days
+
+    def run(self, output_path: str) -> ExportResult:
+        started = self._clock()
+        state_path = checkpoint_path(output_path)
+        checkpoint = ExportCheckpoint.load(state_path) if os.path.exists(output_path) else None
+        if checkpoint is not None and (checkpoint.folder, checkpoint.days) != (self._folder, self._days):
+            raise ValueError(
+                f"{output_path} is an export of folder {checkpoint.folder!r} with days={checkpoint.days}, "
+                f"not folder {self._folder!r} with days={self._days}; use another --output or delete it"
+            )
+        resumed_from = checkpoint.items if checkpoint is not None else 0
+        checkpoint = checkpoint or ExportCheckpoint(folder=self._folder, days=self._days)
+
+        # Anything past the checkpointed offset is a torn gzip member from an interrupted run.
+        mode = "r+b" if checkpoint.output_bytes else "wb"
+        written = 0
+        with open(output_path, mode) as raw:
+            raw.seek(checkpoint.output_bytes)
+            raw.truncate()
+            member = gzip.GzipFile(fileobj=raw, mode="wb")
+            batches_since_checkpoint = 0
+            try:
+                for rows in self._ordered_batches(checkpoint):
+                    for row in rows:
+                        member.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+                        checkpoint.advance(str(row.get("datetime_received", "")), str(row.get("id", "")))
+                        written += 1
+                    batches_since_checkpoint += 1
+                    if batches_since_checkpoint >= self._checkpoint_every:
+                        member = self._checkpoint(member, raw, checkpoint, state_path)
+                        batches_since_checkpoint = 0
+            finally:
+                member.close()
+                raw.flush()
+                os.fsync(raw.fileno())
+            checkpoint.output_bytes = raw.tell()
+            checkpoint.save(state_path)
+
+        elapsed = max(self._clock() - started, 1e-9)
+        return ExportResult(
+            path=output_path,
+            items=checkpoint.items,
+            written=written,
+            resumed_from=resumed_from,
+            output_bytes=checkpoint.output_bytes,
+            seconds=round(elapsed, 3),
+            items_per_second=round(written / elapsed, 1),
+            peak_rss_kb=peak_rss_kb(),
+        )
+
+    def _ordered_batches(self, checkpoint: ExportCheckpoint) -> Iterator[list[dict[str, Any]]]:
+        window = self._workers * 2
+        in_flight: deque[Future[list[dict[str, Any]]]] = deque()
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="ews-export") as executor:
+            for batch in self._id_batches(checkpoint):
+                in_flight.append(executor.submit(self._fetch_batch, batch))
+                if len(in_flight) >= window:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _id_batches(self, checkpoint: ExportCheckpoint) -> Iterator[list[tuple[str, str]]]:
+        skip = set(checkpoint.ids_at_last)
+        batch: list[tuple[str, str]] = []
+        for page in self._id_pages(checkpoint):
+            for item_id in page:
+                if item_id[0] in skip:
+                    continue
+                batch.append(item_id)
+                if len(batch) >= self._batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _checkpoint(
+        self,
+        member: gzip.GzipFile,
+        raw: Any,
+        checkpoint: ExportCheckpoint,
+        state_path: str,
+    ) -> gzip.GzipFile:
+        member.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+        checkpoint.output_bytes = raw.tell()
+        checkpoint.save(state_path)
+        return gzip.GzipFile(fileobj=raw, mode="wb")
+
+
+def peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak / 1024) if sys.platform == "darwin" else int(peak)
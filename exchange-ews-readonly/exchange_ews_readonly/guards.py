@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from .errors import ReadOnlyViolationError
+from .models import SUMMARY_OUTPUT_FIELDS
 
 ALLOWED_ACTIONS = {
     "health",
     "list",
     "get",
     "search",
+    "conversations",
+    "stats",
+    "watch",
+    "export",
+    "calendar",
 }
 
 
@@ -38,10 +46,51 @@ def clamp_search_days(value: int | None, default: int = 7, maximum: int = 30) ->
     return _clamp_positive(value=value, default=default, maximum=maximum, label="search days")
 
 
+def clamp_conversation_limit(value: int | None, default: int = 5, maximum: int = 20) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="conversation limit")
+
+
+def clamp_stats_top(value: int | None, default: int = 10, maximum: int = 100) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="stats top")
+
+
+def clamp_watch_poll_seconds(value: int | None, default: int = 5, maximum: int = 60) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="watch poll seconds")
+
+
+def clamp_export_batch(value: int | None, default: int = 100, maximum: int = 500) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="export batch")
+
+
+def clamp_export_workers(value: int | None, default: int = 4, maximum: int = 8) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="export workers")
+
+
+def clamp_calendar_days(value: int | None, default: int = 7, maximum: int = 31) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="calendar days")
+
+
+def clamp_calendar_limit(value: int | None, default: int = 50, maximum: int = 200) -> int:
+    return _clamp_positive(value=value, default=default, maximum=maximum, label="calendar limit")
+
+
 def clamp_preview_chars(value: int | None, default: int = 500, maximum: int = 1000) -> int:
     return _clamp_positive(value=value, default=default, maximum=maximum, label="preview")
 
 
+def select_summary_fields(fields: Sequence[str] | None) -> tuple[str, ...]:
+    """Validate a field selection and return it in output order; None selects every field."""
+    if fields is None:
+        return SUMMARY_OUTPUT_FIELDS
+    wanted = {field.strip().lower() for field in fields if field.strip()}
+    if not wanted:
+        raise ValueError("fields must name at least one field")
+    unknown = sorted(wanted.difference(SUMMARY_OUTPUT_FIELDS))
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)} (choose from {', '.join(SUMMARY_OUTPUT_FIELDS)})")
+    return tuple(field for field in SUMMARY_OUTPUT_FIELDS if field in wanted)
+
+
 def _clamp_positive(value: int | None, default: int, maximum: int, label: str) -> int:
     if value is None:
         return default
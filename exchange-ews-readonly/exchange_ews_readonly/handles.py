@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+_LOCK = threading.Lock()
+
+_MIN_LENGTH = 8
+_MAX_LENGTH = 16
+
+
+class HandleMap:
+    """
+    Short, stable handles for long EWS item ids, kept in a small JSON file.
+
+    A handle is a prefix of a base32 hash of the id, so the same message gets
+    the same handle in every run; the file only exists so ``resolve`` can map
+    it back. On a prefix collision with a different id the handle grows by one
+    character. The file keeps the ``capacity`` most recently used handles and
+    is merged with what is on disk before each write, so concurrent CLI
+    processes do not drop each other's entries. Unreadable files are treated
+    as empty.
+    """
+
+    def __init__(self, path: str, capacity: int = 10_000) -> None:
+        if capacity <= 0:
+            raise ValueError("handle map capacity must be > 0")
+        self._path = os.path.expanduser(path)
+        self._capacity = capacity
+        self._entries: OrderedDict[str, str] | None = None
+        self._added: dict[str, str] = {}
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def shorten(self, item_id: str) -> str:
+        if not item_id:
+            return item_id
+        entries = self._load()
+        digest = base64.b32encode(hashlib.blake2b(item_id.encode("utf-8"), digest_size=10).digest()).decode("ascii")
+        digest = digest.lower()
+        for length in range(_MIN_LENGTH, _MAX_LENGTH + 1):
+            handle = digest[:length]
+            known = entries.get(handle)
+            if known is None or known == item_id:
+                break
+        else:  # pragma: no cover - needs a 80-bit hash collision
+            return item_id
+        entries[handle] = item_id
+        entries.move_to_end(handle)
+        self._added[handle] = item_id
+        return handle
+
+    def resolve(self, value: str) -> str:
+        """Return the EWS id behind ``value``, or ``value`` itself when it is not a known handle."""
+        if len(value) > _MAX_LENGTH:
+            return value
+        return self._load().get(value.strip().lower(), value)
+
+    def save(self) -> None:
+        if not self._added:
+            return
+        with _LOCK:
+            entries = self._read()
+            for handle, item_id in self._added.items():
+                entries[handle] = item_id
+                entries.move_to_end(handle)
+            while len(entries) > self._capacity:
+                entries.popitem(last=False)
+            self._write(entries)
+        self._entries = entries
+        self._added = {}
+
+    def _load(self) -> OrderedDict[str, str]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _read(self) -> OrderedDict[str, str]:
+        try:
+            with open(self._path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            return OrderedDict((str(key), str(value)) for key, value in data["handles"].items())
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return OrderedDict()
+
+    def _write(self, entries: OrderedDict[str, str]) -> None:
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".handles-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"handles": entries}, handle)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
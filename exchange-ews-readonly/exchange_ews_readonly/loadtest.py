@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from .config import Settings, Throttling
+from .export import peak_rss_kb
+from .service import EwsReadonlyService
+from .simulator import SimulatedMailbox
+
+Operation = Callable[[EwsReadonlyService, int, int], object]
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    items: int = 2000
+    clients: int = 8
+    requests_per_client: int = 12
+    latency_ms: float = 1.0
+    seed: int = 7
+
+
+@dataclass(frozen=True)
+class OperationReport:
+    requests: int
+    errors: int
+    seconds: float
+    throughput_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    round_trips_per_op: float
+    bytes_per_op: float
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    config: LoadConfig
+    operations: dict[str, OperationReport]
+    peak_rss_kb: int | None
+    rss_growth_kb: int | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Tolerances:
+    """
+    How far a run may drift from the baseline before it counts as a regression.
+
+    Round-trips and bytes per operation are deterministic against the simulator,
+    so they get a tight ratio; latency and throughput depend on the machine and
+    get wide ones, p99 (a handful of samples) the widest. RSS growth may exceed
+    the baseline by ``rss_growth_ratio`` plus ``rss_growth_slack_kb``. With
+    ``timings=False`` only the deterministic counters are checked.
+    """
+
+    latency_ratio: float = 2.5
+    tail_latency_ratio: float = 4.0
+    throughput_ratio: float = 0.4
+    round_trips_ratio: float = 1.0
+    bytes_ratio: float = 1.05
+    rss_growth_ratio: float = 2.0
+    rss_growth_slack_kb: int = 32 * 1024
+    timings: bool = True
+
+
+def default_operations(message_ids: list[str]) -> dict[str, Operation]:
+    """The CLI's read paths; operations get the client index and request number to vary their arguments."""
+    return {
+        "list": lambda service, client, n: service.list_messages(limit=20),
+        "list_fields": lambda service, client, n: service.list_messages(limit=20, fields=["id", "subject", "sender"]),
+        "get": lambda service, client, n: service.get_message(message_ids[(client + n) % len(message_ids)]),
+        "search": lambda service, client, n: service.search_messages("invoice OR budget", days=30, limit=10),
+        "conversations": lambda service, client, n: service.list_conversations(limit=5, days=30),
+        "stats": lambda service, client, n: service.mailbox_stats(days=7, folders=["inbox"], top=5),
+    }
+
+
+def run_load(config: LoadConfig, operations: dict[str, Operation] | None = None) -> LoadReport:
+    """
+    Drive ``config.clients`` concurrent clients against one simulated mailbox.
+
+    Each client has its own service, like separate CLI processes, so request
+    coalescing never merges work across clients and round-trips stay
+    deterministic. Operations run one phase at a time so simulator counters can
+    be attributed to them; RSS is sampled throughout.
+    """
+    mailbox = SimulatedMailbox(items=config.items, seed=config.seed, latency_seconds=config.latency_ms / 1000)
+    if operations is None:
+        operations = default_operations([item.id for item in mailbox.inbox.all().order_by("-datetime_received")[:50]])
+    services = [_client_service(mailbox, client) for client in range(config.clients)]
+    # Build accounts up front so the first phase does not pay for it.
+    for service in services:
+        service.list_messages(limit=1)
+
+    sampler = _RssSampler()
+    sampler.start()
+    try:
+        reports = {name: _run_phase(mailbox, services, operation, config) for name, operation in operations.items()}
+    finally:
+        sampler.stop()
+        for service in services:
+            service.close()
+    return LoadReport(
+        config=config,
+        operations=reports,
+        peak_rss_kb=peak_rss_kb(),
+        rss_growth_kb=sampler.growth_kb,
+    )
+
+
+def compare_to_baseline(report: LoadReport, baseline: dict[str, Any], tolerances: Tolerances | None = None) -> list[str]:
+    """Return one line per metric that regressed past ``tolerances``; empty when the run is within bounds."""
+    tolerances = tolerances or Tolerances(**baseline.get("tolerances", {}))
+    regressions: list[str] = []
+    for name, expected in baseline.get("operations", {}).items():
+        current = report.operations.get(name)
+        if current is None:
+            regressions.append(f"{name}: operation missing from the run")
+            continue
+        if current.errors:
+            regressions.append(f"{name}: {current.errors} failed requests")
+        _check_above(regressions, name, "round_trips_per_op", current.round_trips_per_op, expected, tolerances.round_trips_ratio)
+        _check_above(regressions, name, "bytes_per_op", current.bytes_per_op, expected, tolerances.bytes_ratio)
+        if tolerances.timings:
+            for metric in ("p50_ms", "p95_ms"):
+                _check_above(regressions, name, metric, getattr(current, metric), expected, tolerances.latency_ratio)
+            _check_above(regressions, name, "p99_ms", current.p99_ms, expected, tolerances.tail_latency_ratio)
+            floor = expected["throughput_per_sec"] * tolerances.throughput_ratio
+            if current.throughput_per_sec < floor:
+                regressions.append(
+                    f"{name}: throughput_per_sec {current.throughput_per_sec:.1f} < {floor:.1f} "
+                    f"(baseline {expected['throughput_per_sec']:.1f})"
+                )
+    expected_growth = baseline.get("rss_growth_kb")
+    if expected_growth is not None and report.rss_growth_kb is not None:
+        ceiling = expected_growth * tolerances.rss_growth_ratio + tolerances.rss_growth_slack_kb
+        if report.rss_growth_kb > ceiling:
+            regressions.append(f"rss_growth_kb {report.rss_growth_kb} > {ceiling:.0f} (baseline {expected_growth})")
+    return regressions
+
+
+def median_report(reports: list[LoadReport]) -> LoadReport:
+    """Per-metric median of several runs of the same config, for a less noisy baseline."""
+    if not reports:
+        raise ValueError("median_report needs at least one report")
+    operations = {
+        name: OperationReport(
+            **{
+                metric: statistics.median(getattr(report.operations[name], metric) for report in reports)
+                for metric in OperationReport.__dataclass_fields__
+            }
+        )
+        for name in reports[0].operations
+    }
+    growth = [report.rss_growth_kb for report in reports if report.rss_growth_kb is not None]
+    peaks = [report.peak_rss_kb for report in reports if report.peak_rss_kb is not None]
+    return LoadReport(
+        config=reports[0].config,
+        operations=operations,
+        peak_rss_kb=max(peaks) if peaks else None,
+        rss_growth_kb=int(statistics.median(growth)) if growth else None,
+    )
+
+
+def load_baseline(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_baseline(path: str, report: LoadReport, tolerances: Tolerances | None = None) -> None:
+    data = report.to_dict()
+    data["tolerances"] = asdict(tolerances or Tolerances())
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def _run_phase(
+    mailbox: SimulatedMailbox,
+    services: list[EwsReadonlyService],
+    operation: Operation,
+    config: LoadConfig,
+) -> OperationReport:
+    latencies: list[list[float]] = [[] for _ in services]
+    errors = [0] * len(services)
+    start = threading.Barrier(len(services) + 1)
+
+    def client(index: int) -> None:
+        service = services[index]
+        start.wait()
+        for n in range(config.requests_per_client):
+            began = time.perf_counter()
+            try:
+                operation(service, index, n)
+            except Exception:
+                errors[index] += 1
+            latencies[index].append(time.perf_counter() - began)
+
+    threads = [threading.Thread(target=client, args=(index,), name=f"load-client-{index}") for index in range(len(services))]
+    for thread in threads:
+        thread.start()
+    mailbox.stats.reset()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - began
+
+    ordered = sorted(value for values in latencies for value in values)
+    requests = len(ordered)
+    return OperationReport(
+        requests=requests,
+        errors=sum(errors),
+        seconds=round(seconds, 4),
+        throughput_per_sec=round(requests / seconds, 1) if seconds else 0.0,
+        p50_ms=_percentile_ms(ordered, 0.50),
+        p95_ms=_percentile_ms(ordered, 0.95),
+        p99_ms=_percentile_ms(ordered, 0.99),
+        round_trips_per_op=round(mailbox.stats.round_trips / requests, 3) if requests else 0.0,
+        bytes_per_op=round(mailbox.stats.bytes / requests, 1) if requests else 0.0,
+    )
+
+
+def _client_service(mailbox: SimulatedMailbox, client: int) -> EwsReadonlyService:
+    settings = Settings(
+        server="load.sim.local",
+        email=f"client{client}@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(
+            mailbox_rate_per_sec=100_000,
+            mailbox_burst=10_000,
+            mailbox_max_concurrency=64,
+            server_rate_per_sec=100_000,
+            server_burst=10_000,
+            server_max_concurrency=1000,
+        ),
+    )
+    return EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+
+
+def _percentile_ms(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return round(ordered[rank - 1] * 1000, 3)
+
+
+def _check_above(
+    regressions: list[str],
+    name: str,
+    metric: str,
+    value: float,
+    expected: dict[str, Any],
+    ratio: float,
+) -> None:
+    ceiling = expected[metric] * ratio
+    # A tiny absolute allowance keeps float rounding of deterministic counters from tripping the gate.
+    if value > ceiling + 1e-6:
+        regressions.append(f"{name}: {metric} {value} > {ceiling:.3f} (baseline {expected[metric]})")
+
+
+class _RssSampler:
+    """Samples current RSS from /proc every few milliseconds; growth is peak minus the starting value."""
+
+    def __init__(self, interval_seconds: float = 0.005) -> None:
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-rss-sampler", daemon=True)
+        self._start_kb = _current_rss_kb()
+        self._peak_kb = self._start_kb
+
+    @property
+    def growth_kb(self) -> int | None:
+        if self._start_kb is None or self._peak_kb is None:
+            return None
+        return self._peak_kb - self._start_kb
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            current = _current_rss_kb()
+            if current is not None and self._peak_kb is not None:
+                self._peak_kb = max(self._peak_kb, current)
+
+
+def _current_rss_kb() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
@@ -1,7 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from typing import Any
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Output fields of ``MailSummary``, in output order; ``--fields`` selects from these.
+SUMMARY_OUTPUT_FIELDS = ("id", "subject", "sender", "datetime_received", "preview")
+
+
+class ResultList(list[T]):
+    """A plain list of results that also says whether an operation deadline cut it short."""
+
+    def __init__(self, items: Iterable[T] = (), truncated: bool = False) -> None:
+        super().__init__(items)
+        self.truncated = truncated
 
 
 @dataclass(frozen=True)
@@ -10,6 +23,10 @@ class HealthResult:
     server: str
     email: str
     inbox_accessible: bool
+    mode: str = "light"
+    total_count: int | None = None
+    unread_count: int | None = None
+    timings_ms: dict[str, float] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -23,8 +40,10 @@ class MailSummary:
     datetime_received: str
     preview: str
 
-    def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+    def to_dict(self, fields: Sequence[str] | None = None) -> dict[str, Any]:
+        if fields is None:
+            return asdict(self)
+        return {name: getattr(self, name) for name in fields}
 
 
 @dataclass(frozen=True)
@@ -39,3 +58,71 @@ class MailDetail:
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    id: str
+    subject: str
+    start: str
+    end: str
+    is_all_day: bool
+    location: str
+    organizer: str
+    is_recurring: bool
+    is_cancelled: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ConversationSummary:
+    conversation_id: str
+    topic: str
+    message_count: int
+    last_received: str
+    messages: list[MailSummary]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class MailboxStats:
+    days: int
+    since: str
+    scanned: int
+    folders: dict[str, dict[str, int | None]]
+    per_day: dict[str, dict[str, int]]
+    top_senders: list[dict[str, Any]]
+    senders_exact: bool
+    truncated: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class MailEvent:
+    event: str
+    watermark: str
+    message: MailSummary
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    path: str
+    items: int
+    written: int
+    resumed_from: int
+    output_bytes: int
+    seconds: float
+    items_per_second: float
+    peak_rss_kb: int | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .config import Settings
+from .deadline import wait_within_deadline
+from .tracing import span
+
+
+class AccountPool:
+    """
+    Fixed-size pool of EWS accounts handed out one per call.
+
+    Accounts are built lazily (or all at once via ``warm()``) under a lock, so a
+    cold pool hit by many threads never builds more than ``size`` accounts.
+    Callers beyond ``size`` block until an account is returned, or raise
+    ``DeadlineExceededError`` once the current deadline passes.
+    """
+
+    def __init__(self, settings: Settings, account_factory: Callable[[Settings], object], size: int) -> None:
+        if size <= 0:
+            raise ValueError("account pool size must be > 0")
+        self._settings = settings
+        self._account_factory = account_factory
+        self._size = size
+        self._cond = threading.Condition()
+        self._idle: list[object] = []
+        self._built = 0
+        self._leased = 0
+        self._waits = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def warm(self) -> None:
+        """Build every pooled account up front instead of on first use."""
+        while True:
+            with self._cond:
+                if self._built >= self._size:
+                    return
+                self._built += 1
+            account = self._build()
+            with self._cond:
+                self._idle.append(account)
+                self._cond.notify()
+
+    @contextmanager
+    def lease(self) -> Iterator[object]:
+        account = self._checkout()
+        try:
+            yield account
+        finally:
+            with self._cond:
+                self._idle.append(account)
+                self._leased -= 1
+                self._cond.notify()
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "size": self._size,
+                "built": self._built,
+                "idle": len(self._idle),
+                "leased": self._leased,
+                "waits": self._waits,
+            }
+
+    def _checkout(self) -> object:
+        with self._cond:
+            while not self._idle:
+                if self._built < self._size:
+                    # Reserve the slot before building outside the lock.
+                    self._built += 1
+                    break
+                self._waits += 1
+                wait_within_deadline(self._cond)
+            else:
+                self._leased += 1
+                return self._idle.pop()
+
+        account = self._build()
+        with self._cond:
+            self._leased += 1
+        return account
+
+    def _build(self) -> object:
+        try:
+            with span("build_account", pooled=True):
+                return self._account_factory(self._settings)
+        except BaseException:
+            with self._cond:
+                self._built -= 1
+                self._cond.notify()
+            raise
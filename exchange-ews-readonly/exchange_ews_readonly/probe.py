@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import socket
+import ssl
+import time
+
+
+def measure_connect(host: str, port: int = 443, timeout: float = 10.0, verify_tls: bool = True) -> dict[str, float]:
+    """
+    Time DNS resolution, TCP connect and TLS handshake to the EWS host.
+
+    Uses a separate short-lived connection, so the numbers reflect a cold
+    connection even when exchangelib already holds warm pooled sessions.
+    """
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    timings["dns_ms"] = _elapsed_ms(started)
+
+    family, socktype, proto, _, address = infos[0]
+    sock = socket.socket(family, socktype, proto)
+    sock.settimeout(timeout)
+    try:
+        started = time.perf_counter()
+        sock.connect(address)
+        timings["tcp_ms"] = _elapsed_ms(started)
+
+        context = ssl.create_default_context()
+        if not verify_tls:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        started = time.perf_counter()
+        with context.wrap_socket(sock, server_hostname=host):
+            timings["tls_ms"] = _elapsed_ms(started)
+    finally:
+        sock.close()
+    return timings
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
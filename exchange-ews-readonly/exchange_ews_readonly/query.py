@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+FIELDS = ("subject", "sender", "body")
+
+_FIELD_ALIASES = {
+    "from": "sender",
+    "sender": "sender",
+    "subject": "subject",
+    "body": "body",
+}
+
+_TOKEN_PATTERN = re.compile(r'(-?)(?:(\w+):)?(?:"([^"]*)"?|/((?:[^/\\]|\\.)+)/|(\S+))')
+
+
+@dataclass(frozen=True)
+class Term:
+    text: str
+    fields: tuple[str, ...] = FIELDS
+    negated: bool = False
+    regex: re.Pattern[str] | None = field(default=None, compare=False)
+
+
+class QueryMatcher:
+    """
+    Client-side mail matcher compiled once per query.
+
+    Syntax: whitespace-separated terms are ANDed, ``OR`` separates alternatives,
+    ``-term`` or ``NOT term`` negates, ``"quoted text"`` is a phrase and
+    ``from:``/``subject:``/``body:`` scope a term to one field. With
+    ``allow_regex=True`` a ``/pattern/`` term is a case-insensitive regex.
+
+    Matching is case-insensitive and works per field instead of on a joined
+    haystack: each field is lowercased at most once per item, terms are checked
+    with C-level substring search, and the body (the expensive field) is only
+    read when the result still depends on it.
+    """
+
+    def __init__(self, query: str, allow_regex: bool = False) -> None:
+        self.query = query
+        self.allow_regex = allow_regex
+        self.alternatives = _parse(query, allow_regex)
+        self.key = _normalized_key(self.alternatives)
+        self._simple: str | None = None
+        if len(self.alternatives) == 1 and len(self.alternatives[0]) == 1:
+            only = self.alternatives[0][0]
+            if only.regex is None and not only.negated and only.fields == FIELDS:
+                self._simple = only.text
+
+    @property
+    def matches_everything(self) -> bool:
+        return not self.alternatives
+
+    @property
+    def fields(self) -> frozenset[str]:
+        """Item fields (``subject``, ``sender``, ``body``) any term can look at."""
+        return frozenset(name for conjunction in self.alternatives for term in conjunction for name in term.fields)
+
+    def matches(self, subject: str, sender: str, body: Callable[[], str]) -> bool:
+        if not self.alternatives:
+            return True
+        if self._simple is not None:
+            # Fast path for the common single-term query.
+            needle = self._simple
+            return needle in subject.lower() or needle in sender.lower() or needle in body().lower()
+        context = _MatchContext({"subject": lambda: subject, "sender": lambda: sender, "body": body})
+        for conjunction in self.alternatives:
+            if all(context.term_matches(term) != term.negated for term in conjunction):
+                return True
+        return False
+
+
+class _MatchContext:
+    def __init__(self, sources: dict[str, Callable[[], str]]) -> None:
+        self._sources = sources
+        self._texts: dict[str, str] = {}
+        self._lowered: dict[str, str] = {}
+
+    def term_matches(self, term: Term) -> bool:
+        for name in term.fields:
+            if term.regex is not None:
+                if term.regex.search(self._text(name)):
+                    return True
+            elif term.text in self._lower(name):
+                return True
+        return False
+
+    def _text(self, name: str) -> str:
+        text = self._texts.get(name)
+        if text is None:
+            text = self._sources[name]() or ""
+            self._texts[name] = text
+        return text
+
+    def _lower(self, name: str) -> str:
+        lowered = self._lowered.get(name)
+        if lowered is None:
+            lowered = self._text(name).lower()
+            self._lowered[name] = lowered
+        return lowered
+
+
+def _parse(query: str, allow_regex: bool) -> list[list[Term]]:
+    alternatives: list[list[Term]] = []
+    current: list[Term] = []
+    negate_next = False
+    for match in _TOKEN_PATTERN.finditer(query.strip()):
+        dash, scope, phrase, pattern, word = match.groups()
+        if scope is None and phrase is None and pattern is None and word in {"OR", "NOT"}:
+            if word == "OR":
+                if current:
+                    alternatives.append(current)
+                current = []
+            else:
+                negate_next = True
+            continue
+
+        fields = FIELDS
+        if scope is not None:
+            if scope.lower() in _FIELD_ALIASES:
+                fields = (_FIELD_ALIASES[scope.lower()],)
+            else:
+                # Unknown prefixes such as "re:" or "http:" are ordinary text.
+                phrase, pattern, word = None, None, match.group(0)[len(dash) :]
+        negated = bool(dash) or negate_next
+        negate_next = False
+
+        if pattern is not None:
+            if not allow_regex:
+                current.append(Term(text=f"/{pattern}/".lower(), fields=fields, negated=negated))
+                continue
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as exc:
+                raise ValueError(f"invalid search regex: {exc}") from exc
+            current.append(Term(text=pattern, fields=fields, negated=negated, regex=compiled))
+            continue
+
+        text = phrase if phrase is not None else word
+        text = (text or "").strip().lower()
+        if text:
+            current.append(Term(text=text, fields=fields, negated=negated))
+
+    if current:
+        alternatives.append(current)
+    return alternatives
+
+
+def _normalized_key(alternatives: list[list[Term]]) -> str:
+    parts = []
+    for conjunction in alternatives:
+        terms = []
+        for term in conjunction:
+            kind = "re" if term.regex is not None else "tx"
+            terms.append(f"{'-' if term.negated else '+'}{','.join(term.fields)}:{kind}:{term.text}")
+        parts.append(" ".join(sorted(terms)))
+    return " OR ".join(sorted(set(parts)))
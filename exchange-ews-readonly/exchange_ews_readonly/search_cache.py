@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator
+
+from .config import Settings
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - platform dependent
+    fcntl = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class CachedSearch:
+    ids: list[str]
+    newest_received: str
+    saved_at: float
+
+
+class MemorySearchCache:
+    """In-process LRU of search results, keyed by the normalised search arguments."""
+
+    def __init__(self, capacity: int, ttl_seconds: float, clock: Callable[[], float] = time.time) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._capacity = capacity
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedSearch] = OrderedDict()
+        self._lookups = 0
+        self._hits = 0
+        self._delta_items = 0
+
+    def get(self, key: str) -> CachedSearch | None:
+        with self._locked():
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry.saved_at > self._ttl_seconds:
+                del entries[key]
+                self._save(entries)
+                return None
+            entries.move_to_end(key)
+            self._save(entries)
+            return entry
+
+    def put(self, key: str, entry: CachedSearch) -> None:
+        with self._locked():
+            entries = self._load()
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self._capacity:
+                entries.popitem(last=False)
+            self._save(entries)
+
+    def discard(self, key: str) -> None:
+        with self._locked():
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    def record(self, hit: bool, delta: int = 0) -> None:
+        # Outcomes are recorded by the caller: an entry that fails revalidation is a miss.
+        with self._lock:
+            self._lookups += 1
+            if hit:
+                self._hits += 1
+                self._delta_items += delta
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "lookups": self._lookups,
+                "hits": self._hits,
+                "misses": self._lookups - self._hits,
+                "delta_items": self._delta_items,
+                "hit_rate": round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+                "entries": len(self._load()),
+            }
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Held around every load-modify-save so concurrent updates are not lost.
+        with self._lock:
+            yield
+
+    def _load(self) -> OrderedDict[str, CachedSearch]:
+        return self._entries
+
+    def _save(self, entries: OrderedDict[str, CachedSearch]) -> None:
+        self._entries = entries
+
+
+class DiskSearchCache(MemorySearchCache):
+    """
+    The same LRU persisted to a JSON file, so short-lived CLI processes share it.
+
+    Recency order is the order of the ``entries`` object; every access rewrites
+    the file with write-then-rename while holding an exclusive ``flock`` on a
+    sidecar ``.lock`` file, so concurrent processes do not drop each other's
+    entries. Unreadable files are treated as empty.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(capacity, ttl_seconds, clock)
+        self._path = os.path.expanduser(path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:  # pragma: no cover - platform dependent
+                yield
+                return
+            directory = os.path.dirname(self._path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # The index itself is replaced on every save, so lock a file that stays put.
+            fd = os.open(f"{self._path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+    def _load(self) -> OrderedDict[str, CachedSearch]:
+        try:
+            with open(self._path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            entries = OrderedDict()
+            for key, raw in data["entries"].items():
+                entries[key] = CachedSearch(
+                    ids=[str(item_id) for item_id in raw["ids"]],
+                    newest_received=str(raw["newest_received"]),
+                    saved_at=float(raw["saved_at"]),
+                )
+            return entries
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return OrderedDict()
+
+    def _save(self, entries: OrderedDict[str, CachedSearch]) -> None:
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".search-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"entries": {key: asdict(entry) for key, entry in entries.items()}}, handle)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def search_cache_for(settings: Settings) -> MemorySearchCache | None:
+    if not settings.search_cache:
+        return None
+    if settings.search_cache == "memory":
+        return MemorySearchCache(settings.search_cache_size, settings.search_cache_ttl_seconds)
+    return DiskSearchCache(settings.search_cache, settings.search_cache_size, settings.search_cache_ttl_seconds)
+
+
+def search_cache_key(settings: Settings, folder: str, days: int, limit: int, preview: int, query_key: str) -> str:
+    return f"{settings.server.lower()}|{settings.email.lower()}|{folder}|{days}|{limit}|{preview}|{query_key}"
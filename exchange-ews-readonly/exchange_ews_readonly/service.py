@@ -1,62 +1,494 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Callable
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Iterator, Sequence, TypeVar
 
-from .client import build_account
+from .client import build_account, forget_version, is_version_error, remember_version
+from .coalesce import SingleFlight
 from .config import Settings
-from .errors import MessageNotFoundError
-from .guards import assert_read_only, clamp_list_limit, clamp_preview_chars, clamp_search_days
-from .models import HealthResult, MailDetail, MailSummary
+from .deadline import check_deadline, current_deadline, deadline_expired, deadline_scope
+from .endpoints import EndpointSet, is_failover_error
+from .errors import DeadlineExceededError, MessageNotFoundError
+from .guards import (
+    assert_read_only,
+    clamp_calendar_days,
+    clamp_calendar_limit,
+    clamp_conversation_limit,
+    clamp_export_batch,
+    clamp_export_workers,
+    clamp_list_limit,
+    clamp_preview_chars,
+    clamp_search_days,
+    clamp_stats_top,
+    clamp_watch_poll_seconds,
+    select_summary_fields,
+)
+from .export import ExportCheckpoint, MailboxExporter
+from .models import (
+    CalendarEvent,
+    ConversationSummary,
+    ExportResult,
+    HealthResult,
+    MailboxStats,
+    MailDetail,
+    MailEvent,
+    MailSummary,
+    ResultList,
+    SUMMARY_OUTPUT_FIELDS,
+)
+from .pool import AccountPool
+from .probe import measure_connect
+from .query import QueryMatcher
+from .search_cache import CachedSearch, MemorySearchCache, search_cache_for, search_cache_key
+from .stats import StatsAggregator
+from .throttle import CompositeLimiter, is_throttling_error, limiter_for
+from .tracing import span, tracing_enabled
+from .transport import transport_stats
+from .watch import MailWatcher, WatermarkStore
+
+T = TypeVar("T")
+
+logger = logging.getLogger("exchange_ews_readonly")
+
+# FindItem projection for thread grouping: no bodies, those come from one bulk GetItem.
+_CONVERSATION_SCAN_FIELDS = (
+    "id",
+    "changekey",
+    "subject",
+    "sender",
+    "datetime_received",
+    "conversation_id",
+    "conversation_topic",
+)
+_SUMMARY_FIELDS = ("subject", "sender", "datetime_received", "text_body", "body")
+_DETAIL_FIELDS = _SUMMARY_FIELDS + ("to_recipients", "cc_recipients")
+# EWS fields behind each MailSummary output field. Without "preview" a FindItem alone
+# answers the query; bodies need the extra GetItem.
+_SUMMARY_SOURCE_FIELDS = {
+    "id": (),
+    "subject": ("subject",),
+    "sender": ("sender",),
+    "datetime_received": ("datetime_received",),
+    "preview": ("text_body", "body"),
+}
+_CALENDAR_FIELDS = (
+    "subject",
+    "start",
+    "end",
+    "is_all_day",
+    "location",
+    "organizer",
+    "is_recurring",
+    "is_cancelled",
+)
+_MATCH_SOURCE_FIELDS = {"subject": ("subject",), "sender": ("sender",), "body": ("text_body", "body")}
+
+# Folders `stats` and `export` may read, mapped to exchangelib Account attributes.
+MAIL_FOLDERS = ("inbox", "sent", "junk")
+_STATS_PAGE_SIZE = 1000
+# exchangelib's FindItem page size; deadline-bound scans make one throttled call per page.
+_DEADLINE_PAGE_SIZE = 100
+_EXPORT_ID_PAGE_SIZE = 1000
 
 
 class EwsReadonlyService:
+    """
+    Read-only mailbox operations.
+
+    One instance may be shared by many threads: the account is built exactly once
+    under a lock, and with ``settings.account_pool_size > 1`` each EWS call leases
+    its own pooled account so concurrent workers do not serialise on one session.
+
+    Operations accept ``deadline_seconds``: it bounds every EWS request the
+    operation makes, and list-like results come back as ``ResultList`` with
+    ``truncated=True`` when the deadline stopped the work early. With
+    ``eager_connect`` the account is built and authenticated in a background
+    thread as soon as the service is constructed.
+
+    With several hosts in ``settings.servers`` each host gets its own account.
+    Calls go to the healthiest host; ``get``/``list``/``search`` retry once per
+    other host on connection-level failures and, with ``settings.hedge_requests``,
+    send a second request to the next host once the first is slower than that
+    operation's p95 there, keeping whichever answers first. ``close()`` stops
+    the hedge worker threads.
+    """
+
     def __init__(
         self,
         settings: Settings,
         account_factory: Callable[[Settings], object] = build_account,
+        limiter: CompositeLimiter | None = None,
+        eager_connect: bool | None = None,
+        endpoints: EndpointSet | None = None,
     ) -> None:
         self._settings = settings
         self._account_factory = account_factory
         self._account = None
+        self._account_lock = threading.Lock()
+        self._pool: AccountPool | None = None
+        if settings.account_pool_size > 1:
+            self._pool = AccountPool(settings, account_factory, settings.account_pool_size)
+        self._limiter = limiter if limiter is not None else limiter_for(settings)
+        self._versions_recorded: set[str] = set()
+        if endpoints is None and settings.failover_servers:
+            endpoints = EndpointSet(settings.servers)
+        self._endpoints = endpoints
+        self._replica_accounts: dict[str, object] = {}
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self._flights = SingleFlight(ttl_seconds=settings.result_ttl_seconds)
+        self._search_cache: MemorySearchCache | None = search_cache_for(settings)
+        self._warm_thread: threading.Thread | None = None
+        if settings.eager_connect if eager_connect is None else eager_connect:
+            self._warm_thread = threading.Thread(target=self._warm_up, name="ews-warm-up", daemon=True)
+            self._warm_thread.start()
 
     @property
     def account(self) -> object:
         if self._account is None:
-            self._account = self._account_factory(self._settings)
+            with self._account_lock:
+                if self._account is None:
+                    with span("build_account"):
+                        self._account = self._account_factory(self._settings)
         return self._account
 
-    def health(self) -> HealthResult:
+    def warm_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.warm()
+
+    def wait_until_warm(self, timeout: float | None = None) -> bool:
+        """Block until the eager warm-up finished; True when there is none or it is done."""
+        if self._warm_thread is None:
+            return True
+        self._warm_thread.join(timeout)
+        return not self._warm_thread.is_alive()
+
+    def close(self) -> None:
+        """Stop the hedge worker threads; requests still in flight finish in the background."""
+        with self._account_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _warm_up(self) -> None:
+        # Build the account(s) and authenticate with one light GetFolder; the first real call
+        # surfaces any error, so failures here are only logged.
+        try:
+            self.warm_pool()
+            self._call(lambda account: _fresh_folder(account, "inbox"))
+        except Exception as exc:
+            logger.warning("eager warm-up failed: %s", type(exc).__name__)
+
+    def pool_stats(self) -> dict[str, int]:
+        if self._pool is None:
+            return {"size": 1, "built": int(self._account is not None), "idle": 0, "leased": 0, "waits": 0}
+        return self._pool.stats()
+
+    def throttle_stats(self) -> dict[str, dict[str, float]]:
+        return self._limiter.stats()
+
+    def coalesce_stats(self) -> dict[str, float]:
+        return self._flights.stats()
+
+    def search_cache_stats(self) -> dict[str, float]:
+        return self._search_cache.stats() if self._search_cache is not None else {}
+
+    def endpoint_stats(self) -> dict[str, object]:
+        """Per-host health, latency histograms and failover/hedge counts; empty with a single host."""
+        return self._endpoints.stats() if self._endpoints is not None else {}
+
+    def transport_stats(self) -> dict[str, object]:
+        """HTTP options in effect for this service's EWS endpoint; empty until the account is built."""
+        return transport_stats(self._account) if self._account is not None else {}
+
+    def _call(self, fn: Callable[[object], T], idempotent: bool = False) -> T:
+        # Every EWS round-trip goes through the shared mailbox/server limiter,
+        # then runs against a leased account.
+        endpoints = self._endpoints
+        label = _call_label(fn) if endpoints is not None or tracing_enabled() else ""
+        if endpoints is None:
+            return self._call_on(self._settings.server, fn, label)
+        hosts = endpoints.ranked()
+        if not idempotent:
+            return self._timed_call(hosts[0], fn, label)
+        if self._settings.hedge_requests:
+            delay = endpoints.hedge_delay(hosts[0], label)
+            if delay is not None:
+                return self._hedged_call(hosts, fn, label, delay)
+        for index, host in enumerate(hosts):
+            try:
+                return self._timed_call(host, fn, label)
+            except Exception as exc:
+                if index == len(hosts) - 1 or not is_failover_error(exc):
+                    raise
+                endpoints.record_failover()
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _timed_call(self, host: str, fn: Callable[[object], T], label: str) -> T:
+        # Success latency is recorded by _call_on around the request itself, excluding throttle waits.
+        try:
+            return self._call_on(host, fn, label)
+        except Exception as exc:
+            if is_failover_error(exc):
+                self._endpoints.record_failure(host)
+            raise
+
+    def _hedged_call(self, hosts: list[str], fn: Callable[[object], T], label: str, delay: float) -> T:
+        # The losing request cannot be cancelled mid-flight; it finishes in the background
+        # and still counts towards throttling and the endpoint's latency.
+        executor = self._hedge_pool()
+        first = executor.submit(contextvars.copy_context().run, self._timed_call, hosts[0], fn, label)
+        deadline = current_deadline()
+        wait([first], timeout=delay if deadline is None else min(delay, deadline.remaining()))
+        if first.done() and (first.exception() is None or not is_failover_error(first.exception())):
+            return first.result()
+        hedged = not first.done()
+        if hedged:
+            check_deadline()
+        else:
+            # The first host failed fast: the second request is a plain failover, not a hedge.
+            self._endpoints.record_failover()
+        second = executor.submit(contextvars.copy_context().run, self._timed_call, hosts[1], fn, label)
+        pending: set[Future[T]] = {first, second}
+        failure: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, timeout=None if deadline is None else deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                check_deadline()
+                continue
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    if hedged:
+                        self._endpoints.record_hedge(won=future is second)
+                    return future.result()
+                if not is_failover_error(exc):
+                    raise exc
+                failure = exc
+        assert failure is not None
+        raise failure
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        with self._account_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=2 * self._settings.throttling.mailbox_max_concurrency,
+                    thread_name_prefix="ews-hedge",
+                )
+            return self._hedge_executor
+
+    def _call_on(self, host: str, fn: Callable[[object], T], label: str) -> T:
+        settings = self._settings_for(host)
+        for attempt in (1, 2):
+            check_deadline()
+            with self._limiter.slot(), self._lease(host) as account, span(label, attempt=attempt, host=host):
+                # The throttle wait may have used up the budget.
+                check_deadline()
+                started = time.perf_counter()
+                try:
+                    result = fn(account)
+                except Exception as exc:
+                    if attempt == 2 or not is_version_error(exc):
+                        raise
+                    # A cached server version went stale: drop it and retry once with a fresh probe.
+                    forget_version(settings, account)
+                    self._versions_recorded.discard(host)
+                    continue
+            if self._endpoints is not None:
+                self._endpoints.record_success(host, label, time.perf_counter() - started)
+            if host not in self._versions_recorded and remember_version(settings, account):
+                self._versions_recorded.add(host)
+            return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _settings_for(self, host: str) -> Settings:
+        if host == self._settings.server:
+            return self._settings
+        return replace(self._settings, server=host, failover_servers=())
+
+    @contextmanager
+    def _lease(self, host: str | None = None) -> Iterator[object]:
+        if host is not None and host != self._settings.server:
+            yield self._replica_account(host)
+            return
+        if self._pool is None:
+            yield self.account
+            return
+        with self._pool.lease() as account:
+            yield account
+
+    def _replica_account(self, host: str) -> object:
+        # Failover hosts get one shared account each; its HTTP session pool is still
+        # sized to ``account_pool_size``.
+        account = self._replica_accounts.get(host)
+        if account is None:
+            with self._account_lock:
+                account = self._replica_accounts.get(host)
+                if account is None:
+                    with span("build_account", host=host):
+                        account = self._account_factory(self._settings_for(host))
+                    self._replica_accounts[host] = account
+        return account
+
+    def health(
+        self,
+        deep: bool = False,
+        connect_timings: bool = False,
+        deadline_seconds: float | None = None,
+    ) -> HealthResult:
+        """
+        Check mailbox reachability.
+
+        The default light mode issues a single GetFolder on the inbox (ids and
+        counts only). ``deep=True`` also fetches one inbox item, as the original
+        check did. ``connect_timings=True`` adds DNS/TCP/TLS timings from a
+        separate probe connection. A passed deadline raises ``DeadlineExceededError``.
+        """
         assert_read_only("health")
-        inbox_accessible = bool(list(self.account.inbox.all()[:1]))  # noqa: C401
+        with deadline_scope(deadline_seconds):
+            return self._health(deep, connect_timings)
+
+    def _health(self, deep: bool, connect_timings: bool) -> HealthResult:
+        started = time.perf_counter()
+        timings: dict[str, float] = {}
+        if connect_timings:
+            timings.update(
+                measure_connect(
+                    self._settings.server,
+                    timeout=self._settings.timeout_seconds,
+                    verify_tls=self._settings.verify_tls,
+                )
+            )
+
+        phase = time.perf_counter()
+        self._lease_ready()
+        timings["account_ms"] = _elapsed_ms(phase)
+
+        # The first EWS response on a cold session includes the authentication handshake.
+        phase = time.perf_counter()
+        inbox = self._call(lambda account: _fresh_folder(account, "inbox"))
+        timings["first_response_ms"] = _elapsed_ms(phase)
+
+        inbox_accessible = True
+        if deep:
+            phase = time.perf_counter()
+            inbox_accessible = bool(self._call(lambda account: list(account.inbox.all()[:1])))  # noqa: C401
+            timings["item_fetch_ms"] = _elapsed_ms(phase)
+        timings["total_ms"] = _elapsed_ms(started)
+
         return HealthResult(
             status="ok",
             server=self._settings.server,
             email=self._settings.email,
             inbox_accessible=inbox_accessible,
+            mode="deep" if deep else "light",
+            total_count=_optional_int(getattr(inbox, "total_count", None)),
+            unread_count=_optional_int(getattr(inbox, "unread_count", None)),
+            timings_ms=timings,
         )
 
-    def list_messages(self, limit: int | None = None, preview: int | None = None) -> list[MailSummary]:
+    def _with_deadline(self, seconds: float, fn: Callable[[ResultList[T]], ResultList[T]]) -> ResultList[T]:
+        # Deadline-bound calls skip coalescing: a truncated result must not be shared.
+        # ``fn`` adds results to ``partial`` as pages come in, so running out of time keeps them.
+        partial: ResultList[T] = ResultList()
+        with deadline_scope(seconds):
+            try:
+                return fn(partial)
+            except DeadlineExceededError:
+                partial.truncated = True
+                return partial
+
+    def _lease_ready(self) -> None:
+        if self._pool is None:
+            _ = self.account
+        else:
+            with self._pool.lease():
+                pass
+
+    def list_messages(
+        self,
+        limit: int | None = None,
+        preview: int | None = None,
+        deadline_seconds: float | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> ResultList[MailSummary]:
+        """
+        Return the newest inbox messages.
+
+        ``fields`` selects ``MailSummary`` fields (see ``SUMMARY_OUTPUT_FIELDS``);
+        only the EWS properties they need are fetched and the rest are left empty.
+        """
         assert_read_only("list")
+        selected = select_summary_fields(fields)
         list_limit = clamp_list_limit(limit, self._settings.limits.list_default, self._settings.limits.list_max)
         preview_size = clamp_preview_chars(
             preview,
             self._settings.limits.preview_default,
             self._settings.limits.preview_max,
         )
-        items = self.account.inbox.all().order_by("-datetime_received")[:list_limit]
-        return [self._to_summary(item, preview_size) for item in items]
+        if deadline_seconds is not None:
+            return self._with_deadline(
+                deadline_seconds,
+                lambda partial: self._list(list_limit, preview_size, selected, partial),
+            )
+        # Identical concurrent calls (same clamped arguments) share one EWS round-trip.
+        result = self._flights.do(
+            ("list", list_limit, preview_size, selected),
+            lambda: self._list(list_limit, preview_size, selected),
+        )
+        return ResultList(result)
+
+    def _list(
+        self,
+        list_limit: int,
+        preview_size: int,
+        selected: tuple[str, ...],
+        partial: ResultList[MailSummary] | None = None,
+    ) -> ResultList[MailSummary]:
+        source_fields = _summary_source_fields(selected)
+        results: ResultList[MailSummary] = ResultList() if partial is None else partial
+        for start, stop in _scan_windows(list_limit):
+            items = self._call(
+                lambda account, start=start, stop=stop: list(
+                    _project(account.inbox.all().order_by("-datetime_received"), source_fields)[start:stop]
+                ),
+                idempotent=True,
+            )
+            results.extend(self._to_summary(item, preview_size, selected) for item in items)
+            if len(items) < stop - start:
+                break
+        return results
 
-    def get_message(self, message_id: str, preview: int | None = None) -> MailDetail:
+    def get_message(
+        self,
+        message_id: str,
+        preview: int | None = None,
+        deadline_seconds: float | None = None,
+    ) -> MailDetail:
+        """Fetch one message; a passed deadline raises ``DeadlineExceededError`` since there is no partial result."""
         assert_read_only("get")
         preview_size = clamp_preview_chars(
             preview,
             self._settings.limits.preview_default,
             self._settings.limits.preview_max,
         )
+        if deadline_seconds is not None:
+            with deadline_scope(deadline_seconds):
+                return self._get(message_id, preview_size)
+        return self._flights.do(("get", message_id, preview_size), lambda: self._get(message_id, preview_size))
+
+    def _get(self, message_id: str, preview_size: int) -> MailDetail:
         try:
-            item = self.account.inbox.get(id=message_id)
+            item = self._call(lambda account: account.inbox.get(id=message_id), idempotent=True)
         except Exception as exc:  # pragma: no cover - depends on EWS backend types
+            if is_throttling_error(exc) or isinstance(exc, DeadlineExceededError):
+                raise
             raise MessageNotFoundError(f"Message not found: {message_id}") from exc
         return self._to_detail(item, preview_size)
 
@@ -66,8 +498,19 @@ class EwsReadonlyService:
         days: int | None = None,
         limit: int | None = None,
         preview: int | None = None,
-    ) -> list[MailSummary]:
+        regex: bool = False,
+        deadline_seconds: float | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> ResultList[MailSummary]:
+        """
+        Match recent inbox messages against ``query`` (see ``QueryMatcher``).
+
+        ``fields`` works as for ``list_messages``; the fetch still includes what
+        the query needs to match on, so a query without ``body`` terms and no
+        ``preview`` field never reads bodies.
+        """
         assert_read_only("search")
+        selected = select_summary_fields(fields)
         list_limit = clamp_list_limit(limit, self._settings.limits.list_default, self._settings.limits.list_max)
         days_limit = clamp_search_days(
             days,
@@ -79,32 +522,455 @@ class EwsReadonlyService:
             self._settings.limits.preview_default,
             self._settings.limits.preview_max,
         )
+        matcher = QueryMatcher(query, allow_regex=regex)
+        if deadline_seconds is not None:
+            return self._with_deadline(
+                deadline_seconds,
+                lambda partial: self._search(matcher, days_limit, list_limit, preview_size, selected, partial),
+            )
+        result = self._flights.do(
+            ("search", matcher.key, days_limit, list_limit, preview_size, selected),
+            lambda: self._search(matcher, days_limit, list_limit, preview_size, selected),
+        )
+        return ResultList(result)
 
+    def _search(
+        self,
+        matcher: QueryMatcher,
+        days_limit: int,
+        list_limit: int,
+        preview_size: int,
+        selected: tuple[str, ...] = SUMMARY_OUTPUT_FIELDS,
+        partial: ResultList[MailSummary] | None = None,
+    ) -> ResultList[MailSummary]:
         since = datetime.now(timezone.utc) - timedelta(days=days_limit)
-        prefetch_size = min(list_limit * 5, self._settings.limits.list_max)
-        items = self.account.inbox.filter(datetime_received__gte=since).order_by("-datetime_received")[:prefetch_size]
+        results: ResultList[MailSummary] = ResultList() if partial is None else partial
+        # The scan needs datetime_received for the cache watermark and whatever the matcher reads.
+        source_fields = _summary_source_fields(selected, matcher)
+        cache_key = ""
+        if self._search_cache is not None:
+            cache_key = search_cache_key(self._settings, "inbox", days_limit, list_limit, preview_size, matcher.key)
+            entry = self._search_cache.get(cache_key)
+            revalidated = (
+                self._revalidate_search(entry, matcher, since, list_limit, source_fields) if entry is not None else None
+            )
+            self._search_cache.record(hit=revalidated is not None, delta=revalidated[2] if revalidated else 0)
+            if revalidated is not None:
+                matched, newest, _ = revalidated
+                self._search_cache.put(cache_key, _cached_search(matched, newest, entry.saved_at))
+                results.extend(self._to_summary(item, preview_size, selected) for item in matched)
+                return results
 
-        needle = query.strip().lower()
+        prefetch_size = min(list_limit * 5, self._settings.limits.list_max)
         matched: list[object] = []
-        for item in items:
-            if not needle:
-                matched.append(item)
-            else:
-                sender = _mailbox_to_str(getattr(item, "sender", None))
-                haystack = " ".join(
-                    [
-                        (getattr(item, "subject", "") or ""),
-                        sender,
-                        _extract_body_text(item),
-                    ]
-                ).lower()
-                if needle in haystack:
-                    matched.append(item)
-
-            if len(matched) >= list_limit:
+        newest: datetime | None = None
+        truncated = False
+        for start, stop in _scan_windows(prefetch_size):
+            items = self._call(
+                lambda account, start=start, stop=stop: list(
+                    _project(
+                        account.inbox.filter(datetime_received__gte=since).order_by("-datetime_received"),
+                        source_fields,
+                    )[start:stop]
+                ),
+                idempotent=True,
+            )
+            # Newest first, so the first non-empty page holds the cache watermark.
+            newest = newest or _newest_received(items)
+            with span("search.match", scanned=len(items)):
+                page_matched, truncated = _match_items(matcher, items, list_limit - len(matched))
+            matched.extend(page_matched)
+            results.extend(self._to_summary(item, preview_size, selected) for item in page_matched)
+            if truncated or len(matched) >= list_limit or len(items) < stop - start:
+                break
+        if cache_key and not truncated:
+            self._search_cache.put(cache_key, _cached_search(matched, newest or since, time.time()))
+        results.truncated = truncated
+        return results
+
+    def _revalidate_search(
+        self,
+        entry: CachedSearch,
+        matcher: QueryMatcher,
+        since: datetime,
+        list_limit: int,
+        source_fields: tuple[str, ...] = _SUMMARY_FIELDS,
+    ) -> tuple[list[object], datetime, int] | None:
+        """
+        Bring a cached search up to date, or return None when only a full scan can.
+
+        One FindItem asks for items newer than the newest one the cached scan saw;
+        only that delta is matched. The cached ids still needed are re-read with
+        one bulk GetItem, which also drops deleted items and ones that left the
+        date window.
+        """
+        newest = _from_iso(entry.newest_received)
+        if newest is None:
+            return None
+        prefetch_size = min(list_limit * 5, self._settings.limits.list_max)
+        delta = self._call(
+            lambda account: list(
+                _project(
+                    account.inbox.filter(datetime_received__gt=newest).order_by("-datetime_received"),
+                    source_fields,
+                )[:prefetch_size]
+            ),
+            idempotent=True,
+        )
+        if len(delta) >= prefetch_size:
+            return None
+        fresh, truncated = _match_items(matcher, delta, list_limit)
+        if truncated:
+            return None
+        wanted = entry.ids[: list_limit - len(fresh)]
+        kept: list[object] = []
+        if wanted:
+            fetched = self._call(
+                lambda account: list(
+                    account.fetch(
+                        ids=[(item_id, None) for item_id in wanted],
+                        folder=account.inbox,
+                        only_fields=list(source_fields),
+                    )
+                ),
+                idempotent=True,
+            )
+            for item in fetched:
+                received = getattr(item, "datetime_received", None)
+                if not isinstance(item, Exception) and isinstance(received, datetime) and received >= since:
+                    kept.append(item)
+            if len(kept) < len(wanted):
+                # Something dropped out; the replacement is unknown without rescanning.
+                return None
+        return fresh + kept, _newest_received(delta) or newest, len(delta)
+
+    def list_conversations(
+        self,
+        limit: int | None = None,
+        days: int | None = None,
+        preview: int | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ResultList[ConversationSummary]:
+        """
+        Return the most recently active inbox threads with their message summaries.
+
+        One id-only FindItem over the date window groups messages by conversation,
+        then one bulk GetItem fetches bodies for the selected messages only.
+        """
+        assert_read_only("conversations")
+        limits = self._settings.limits
+        thread_limit = clamp_conversation_limit(limit, limits.conversations_default, limits.conversations_max)
+        days_limit = clamp_search_days(days, limits.search_days_default, limits.search_days_max)
+        preview_size = clamp_preview_chars(preview, limits.preview_default, limits.preview_max)
+        if deadline_seconds is not None:
+            return self._with_deadline(
+                deadline_seconds,
+                lambda partial: self._conversations(thread_limit, days_limit, preview_size, partial),
+            )
+        result = self._flights.do(
+            ("conversations", thread_limit, days_limit, preview_size),
+            lambda: self._conversations(thread_limit, days_limit, preview_size),
+        )
+        return ResultList(result)
+
+    def _conversations(
+        self,
+        thread_limit: int,
+        days_limit: int,
+        preview_size: int,
+        partial: ResultList[ConversationSummary] | None = None,
+    ) -> ResultList[ConversationSummary]:
+        since = datetime.now(timezone.utc) - timedelta(days=days_limit)
+        scan_size = self._settings.limits.conversation_scan_max
+        conversations: ResultList[ConversationSummary] = ResultList() if partial is None else partial
+        headers: list[object] = []
+        for start, stop in _scan_windows(scan_size):
+            try:
+                page = self._call(
+                    lambda account, start=start, stop=stop: list(
+                        account.inbox.filter(datetime_received__gte=since)
+                        .order_by("-datetime_received")
+                        .only(*_CONVERSATION_SCAN_FIELDS)[start:stop]
+                    )
+                )
+            except DeadlineExceededError:
+                if not headers:
+                    raise
+                # Group what the scan read so far; the body fetch below is skipped as well.
+                conversations.truncated = True
+                break
+            headers.extend(page)
+            if len(page) < stop - start:
                 break
 
-        return [self._to_summary(item, preview_size) for item in matched[:list_limit]]
+        threads: dict[str, list[object]] = {}
+        for header in headers:
+            key = _conversation_key(header)
+            if key not in threads:
+                if len(threads) >= thread_limit:
+                    continue
+                threads[key] = []
+            if len(threads[key]) < self._settings.limits.list_max:
+                threads[key].append(header)
+
+        selected = [header for members in threads.values() for header in members]
+        if not selected:
+            return conversations
+        truncated = conversations.truncated
+        try:
+            fetched = self._call(
+                lambda account: list(
+                    account.fetch(ids=selected, folder=account.inbox, only_fields=list(_SUMMARY_FIELDS))
+                )
+            )
+        except DeadlineExceededError:
+            # Out of time for bodies: return the threads with header-only summaries.
+            fetched, truncated = [], True
+        bodies = {_text_or_empty(getattr(item, "id", "")): item for item in fetched if not isinstance(item, Exception)}
+
+        conversations.truncated = truncated
+        for key, members in threads.items():
+            summaries = [
+                self._to_summary(bodies.get(_text_or_empty(getattr(member, "id", "")), member), preview_size)
+                for member in members
+            ]
+            conversations.append(
+                ConversationSummary(
+                    conversation_id=key,
+                    topic=_conversation_topic(members),
+                    message_count=len(summaries),
+                    last_received=summaries[0].datetime_received,
+                    messages=summaries,
+                )
+            )
+        return conversations
+
+    def calendar_view(
+        self,
+        start: datetime | None = None,
+        days: int | None = None,
+        limit: int | None = None,
+        deadline_seconds: float | None = None,
+    ) -> ResultList[CalendarEvent]:
+        """
+        Return calendar events overlapping ``days`` days from ``start`` (default: today, 00:00 UTC).
+
+        Uses an EWS CalendarView, so the server expands recurring series into
+        their occurrences inside the window; the master items are never
+        fetched. Naive ``start`` values are taken as UTC, aware ones are
+        converted to UTC (exchangelib cannot map fixed offsets to a zone).
+        """
+        assert_read_only("calendar")
+        limits = self._settings.limits
+        days_limit = clamp_calendar_days(days, limits.calendar_days_default, limits.calendar_days_max)
+        event_limit = clamp_calendar_limit(limit, limits.calendar_default, limits.calendar_max)
+        if start is None:
+            start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        elif start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        else:
+            start = start.astimezone(timezone.utc)
+        if deadline_seconds is not None:
+            return self._with_deadline(
+                deadline_seconds,
+                lambda partial: self._calendar(start, days_limit, event_limit, partial),
+            )
+        result = self._flights.do(
+            ("calendar", start, days_limit, event_limit),
+            lambda: self._calendar(start, days_limit, event_limit),
+        )
+        return ResultList(result)
+
+    def _calendar(
+        self,
+        start: datetime,
+        days_limit: int,
+        event_limit: int,
+        partial: ResultList[CalendarEvent] | None = None,
+    ) -> ResultList[CalendarEvent]:
+        end = start + timedelta(days=days_limit)
+        # The cap goes out as the view's MaxEntriesReturned, so the server stops expanding there.
+        # A view has no offset to page by: it is one call even under a deadline.
+        # Location and organizer are complex properties: exchangelib follows the view with one bulk GetItem.
+        items = self._call(
+            lambda account: list(
+                account.calendar.view(start=start, end=end, max_items=event_limit).only(*_CALENDAR_FIELDS)
+            ),
+            idempotent=True,
+        )
+        results: ResultList[CalendarEvent] = ResultList() if partial is None else partial
+        results.extend(_to_event(item) for item in items)
+        return results
+
+    def mailbox_stats(
+        self,
+        days: int | None = None,
+        folders: list[str] | None = None,
+        top: int | None = None,
+        deadline_seconds: float | None = None,
+    ) -> MailboxStats:
+        """
+        Aggregate message counts per folder, per day and per sender over a date window.
+
+        Folder totals come from GetFolder counts. Window counts stream a paged
+        FindItem projection of sender, received time and read flag, folded into
+        running aggregates, so memory stays flat however many items match.
+        Each page is its own throttled call, so a long scan does not hold a
+        limiter slot throughout.
+        """
+        assert_read_only("stats")
+        limits = self._settings.limits
+        days_limit = clamp_search_days(days, limits.search_days_default, limits.search_days_max)
+        top_limit = clamp_stats_top(top, limits.stats_top_default, limits.stats_top_max)
+        folder_names = _normalize_stats_folders(folders)
+        since = datetime.now(timezone.utc) - timedelta(days=days_limit)
+
+        aggregator = StatsAggregator()
+        folder_stats: dict[str, dict[str, int | None]] = {}
+        truncated = False
+        with deadline_scope(deadline_seconds):
+            for name in folder_names:
+                try:
+                    folder = self._call(lambda account: _fresh_folder(account, name))
+                    folder_stats[name] = {
+                        "total_count": _optional_int(getattr(folder, "total_count", None)),
+                        "unread_count": _optional_int(getattr(folder, "unread_count", None)),
+                    }
+                    self._scan_stats(name, since, aggregator)
+                except DeadlineExceededError:
+                    truncated = True
+                if name in folder_stats:
+                    folder_stats[name].update(aggregator.folders.get(name, {"window_count": 0, "window_unread": 0}))
+                if truncated:
+                    break
+
+        return MailboxStats(
+            days=days_limit,
+            since=since.isoformat(),
+            scanned=aggregator.scanned,
+            folders=folder_stats,
+            per_day=dict(sorted(aggregator.per_day.items())),
+            top_senders=aggregator.top_senders(top_limit),
+            senders_exact=aggregator.senders_exact,
+            truncated=truncated,
+        )
+
+    def _scan_stats(self, name: str, since: datetime, aggregator: StatsAggregator) -> None:
+        # Rows are folded in only once their page call returned, so a page retried after
+        # a version error is never counted twice. A passed deadline raises between pages.
+        offset = 0
+        while True:
+            rows = self._call(lambda account: _stats_page(account, name, since, offset))
+            for sender, received, is_read in rows:
+                aggregator.add(name, _mailbox_to_str(sender), received, is_read)
+            if len(rows) < _STATS_PAGE_SIZE:
+                return
+            offset += _STATS_PAGE_SIZE
+
+    def watch_messages(
+        self,
+        preview: int | None = None,
+        poll_seconds: int | None = None,
+        state_path: str = "",
+        max_events: int | None = None,
+    ) -> Iterator[MailEvent]:
+        """
+        Yield new-mail and modified events for the inbox as they arrive.
+
+        Uses an EWS pull subscription resumed from the last watermark (kept in
+        ``state_path`` when given) after drops, so events are neither lost nor
+        repeated. Runs until ``max_events`` events were yielded, or forever.
+        """
+        assert_read_only("watch")
+        limits = self._settings.limits
+        preview_size = clamp_preview_chars(preview, limits.preview_default, limits.preview_max)
+        poll = clamp_watch_poll_seconds(poll_seconds, limits.watch_poll_seconds_default, limits.watch_poll_seconds_max)
+        if max_events is not None and max_events <= 0:
+            raise ValueError("max events must be > 0")
+        watcher = MailWatcher(
+            call=self._call,
+            fetch_summaries=lambda account, ids: self._fetch_summaries(account, ids, preview_size),
+            poll_seconds=poll,
+            store=WatermarkStore(state_path),
+        )
+        return _take(watcher.events(), max_events)
+
+    def _fetch_summaries(self, account: object, ids: list[object], preview_size: int) -> list[MailSummary | None]:
+        items = account.fetch(ids=ids, folder=account.inbox, only_fields=list(_SUMMARY_FIELDS))
+        return [None if isinstance(item, Exception) else self._to_summary(item, preview_size) for item in items]
+
+    def export_messages(
+        self,
+        output_path: str,
+        folder: str = "inbox",
+        days: int | None = None,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        preview: int | None = None,
+    ) -> ExportResult:
+        """
+        Export a folder, oldest first, to gzip-compressed NDJSON of ``get`` records.
+
+        A producer pages id-only FindItem results, a bounded worker pool bulk
+        fetches ``batch_size`` items per GetItem, and one writer appends records
+        in order. Progress is checkpointed next to ``output_path``; re-running the
+        same export resumes after the last checkpoint instead of starting over,
+        and resuming it with another ``folder`` or ``days`` raises ``ValueError``.
+        """
+        assert_read_only("export")
+        limits = self._settings.limits
+        batch = clamp_export_batch(batch_size, limits.export_batch_default, limits.export_batch_max)
+        worker_count = clamp_export_workers(workers, limits.export_workers_default, limits.export_workers_max)
+        preview_size = clamp_preview_chars(preview, limits.preview_default, limits.preview_max)
+        name = _normalize_folder(folder, "export folder")
+        if days is not None and days <= 0:
+            raise ValueError("export days must be > 0")
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days is not None else None
+
+        exporter = MailboxExporter(
+            id_pages=lambda checkpoint: self._export_id_pages(name, since, checkpoint),
+            fetch_batch=lambda ids: self._call(lambda account: self._export_batch(account, name, ids, preview_size)),
+            batch_size=batch,
+            workers=worker_count,
+            folder=name,
+            days=days,
+        )
+        return exporter.run(output_path)
+
+    def _export_id_pages(
+        self,
+        name: str,
+        since: datetime | None,
+        checkpoint: ExportCheckpoint,
+    ) -> Iterator[list[tuple[str, str]]]:
+        resume_from = _from_iso(checkpoint.last_received)
+        if resume_from is not None and (since is None or resume_from > since):
+            since = resume_from
+        offset = 0
+        while True:
+            # One id-only FindItem page per limiter slot, so fetch workers interleave with paging.
+            page = self._call(
+                lambda account: list(
+                    _export_query(getattr(account, name), since)[offset : offset + _EXPORT_ID_PAGE_SIZE]
+                )
+            )
+            if not page:
+                return
+            yield [(_text_or_empty(item_id), _text_or_empty(changekey)) for item_id, changekey in page]
+            if len(page) < _EXPORT_ID_PAGE_SIZE:
+                return
+            offset += len(page)
+
+    def _export_batch(
+        self,
+        account: object,
+        name: str,
+        ids: list[tuple[str, str]],
+        preview_size: int,
+    ) -> list[dict[str, object]]:
+        items = account.fetch(ids=ids, folder=getattr(account, name), only_fields=list(_DETAIL_FIELDS))
+        # Items deleted since the id page was read come back as exceptions and are skipped.
+        return [self._to_detail(item, preview_size).to_dict() for item in items if not isinstance(item, Exception)]
 
     # Backward-compatible aliases for earlier CLI/service usage.
     def list(self, limit: int | None = None, preview: int | None = None) -> list[MailSummary]:
@@ -121,37 +987,225 @@ class EwsReadonlyService:
         days: int | None = None,
         limit: int | None = None,
         preview: int | None = None,
+        regex: bool = False,
     ) -> list[MailSummary]:
         assert_read_only("search")
-        return self.search_messages(query=query, days=days, limit=limit, preview=preview)
+        return self.search_messages(query=query, days=days, limit=limit, preview=preview, regex=regex)
 
-    def _to_summary(self, item: object, preview_size: int) -> MailSummary:
-        return MailSummary(
-            id=_text_or_empty(getattr(item, "id", "")),
-            subject=(getattr(item, "subject", "") or ""),
-            sender=_mailbox_to_str(getattr(item, "sender", None)),
-            datetime_received=_to_iso(getattr(item, "datetime_received", None)),
-            preview=_trim_text(_extract_body_text(item), preview_size),
-        )
+    def _to_summary(
+        self,
+        item: object,
+        preview_size: int,
+        selected: tuple[str, ...] = SUMMARY_OUTPUT_FIELDS,
+    ) -> MailSummary:
+        with span("to_summary"):
+            if selected != SUMMARY_OUTPUT_FIELDS:
+                # Unselected fields were not fetched; leave them empty rather than reading stale attributes.
+                return MailSummary(
+                    id=_text_or_empty(getattr(item, "id", "")) if "id" in selected else "",
+                    subject=(getattr(item, "subject", "") or "") if "subject" in selected else "",
+                    sender=_mailbox_to_str(getattr(item, "sender", None)) if "sender" in selected else "",
+                    datetime_received=(
+                        _to_iso(getattr(item, "datetime_received", None)) if "datetime_received" in selected else ""
+                    ),
+                    preview=_trim_text(_extract_body_text(item), preview_size) if "preview" in selected else "",
+                )
+            return MailSummary(
+                id=_text_or_empty(getattr(item, "id", "")),
+                subject=(getattr(item, "subject", "") or ""),
+                sender=_mailbox_to_str(getattr(item, "sender", None)),
+                datetime_received=_to_iso(getattr(item, "datetime_received", None)),
+                preview=_trim_text(_extract_body_text(item), preview_size),
+            )
 
     def _to_detail(self, item: object, preview_size: int) -> MailDetail:
-        return MailDetail(
-            id=_text_or_empty(getattr(item, "id", "")),
-            subject=(getattr(item, "subject", "") or ""),
+        with span("to_detail"):
+            return MailDetail(
+                id=_text_or_empty(getattr(item, "id", "")),
+                subject=(getattr(item, "subject", "") or ""),
+                sender=_mailbox_to_str(getattr(item, "sender", None)),
+                to_recipients=_recipient_list(getattr(item, "to_recipients", []) or []),
+                cc_recipients=_recipient_list(getattr(item, "cc_recipients", []) or []),
+                datetime_received=_to_iso(getattr(item, "datetime_received", None)),
+                body_preview=_trim_text(_extract_body_text(item), preview_size),
+            )
+
+
+def _stats_page(account: object, name: str, since: datetime, offset: int) -> list[tuple[object, object, object]]:
+    # Oldest first: mail arriving during the scan lands after the cursor instead of shifting it.
+    query = (
+        getattr(account, name)
+        .filter(datetime_received__gte=since)
+        .order_by("datetime_received")
+        .values_list("sender", "datetime_received", "is_read")
+    )
+    query.page_size = _STATS_PAGE_SIZE
+    return list(query[offset : offset + _STATS_PAGE_SIZE])
+
+
+def _summary_source_fields(selected: tuple[str, ...], matcher: QueryMatcher | None = None) -> tuple[str, ...]:
+    if selected == SUMMARY_OUTPUT_FIELDS:
+        return _SUMMARY_FIELDS
+    wanted = {name for field in selected for name in _SUMMARY_SOURCE_FIELDS[field]}
+    if matcher is not None:
+        wanted.add("datetime_received")
+        wanted.update(name for field in matcher.fields for name in _MATCH_SOURCE_FIELDS[field])
+    return tuple(name for name in _SUMMARY_FIELDS if name in wanted)
+
+
+def _scan_windows(count: int) -> list[tuple[int, int]]:
+    # Under a deadline a scan reads one page per call, so pages already read survive it
+    # running out; otherwise it stays a single call.
+    size = _DEADLINE_PAGE_SIZE if current_deadline() is not None else max(count, 1)
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def _project(query: Any, source_fields: tuple[str, ...]) -> Any:
+    # The full summary keeps exchangelib's default projection; a narrower one is pushed into the request.
+    if source_fields == _SUMMARY_FIELDS:
+        return query
+    return query.only("id", "changekey", *source_fields)
+
+
+def _call_label(fn: Callable[..., object]) -> str:
+    # "EwsReadonlyService._search.<locals>.<lambda>" -> "ews:search"
+    owner = getattr(fn, "__qualname__", "").split(".<locals>")[0].rsplit(".", 1)[-1]
+    return f"ews:{owner.lstrip('_') or 'call'}"
+
+
+def _match_items(matcher: QueryMatcher, items: list[object], list_limit: int) -> tuple[list[object], bool]:
+    matched: list[object] = []
+    for item in items:
+        if deadline_expired():
+            return matched, True
+        if matcher.matches(
+            subject=getattr(item, "subject", "") or "",
             sender=_mailbox_to_str(getattr(item, "sender", None)),
-            to_recipients=_recipient_list(getattr(item, "to_recipients", []) or []),
-            cc_recipients=_recipient_list(getattr(item, "cc_recipients", []) or []),
-            datetime_received=_to_iso(getattr(item, "datetime_received", None)),
-            body_preview=_trim_text(_extract_body_text(item), preview_size),
-        )
+            body=lambda item=item: _extract_body_text(item),
+        ):
+            matched.append(item)
+
+        if len(matched) >= list_limit:
+            break
+    return matched, False
+
+
+def _newest_received(items: list[object]) -> datetime | None:
+    received = [getattr(item, "datetime_received", None) for item in items]
+    dated = [value for value in received if isinstance(value, datetime)]
+    return max(dated) if dated else None
+
+
+def _cached_search(items: list[object], newest: datetime, saved_at: float) -> CachedSearch:
+    return CachedSearch(
+        ids=[_text_or_empty(getattr(item, "id", "")) for item in items],
+        newest_received=newest.isoformat(),
+        saved_at=saved_at,
+    )
+
+
+def _take(events: Iterator[T], limit: int | None) -> Iterator[T]:
+    # Close the source as soon as the limit is hit so its cleanup (watermark, unsubscribe) runs now.
+    try:
+        for count, event in enumerate(events, start=1):
+            yield event
+            if limit is not None and count >= limit:
+                return
+    finally:
+        close = getattr(events, "close", None)
+        if close is not None:
+            close()
+
+
+def _conversation_key(item: object) -> str:
+    conversation_id = getattr(item, "conversation_id", None)
+    value = getattr(conversation_id, "id", None) or conversation_id
+    if value:
+        return str(value)
+    # Items without a conversation id form their own single-message thread.
+    return f"item:{_text_or_empty(getattr(item, 'id', ''))}"
+
+
+def _conversation_topic(members: list[object]) -> str:
+    # Members are newest first; the oldest subject is the one without Re:/Fw: prefixes.
+    for member in reversed(members):
+        topic = getattr(member, "conversation_topic", None) or getattr(member, "subject", None)
+        if topic:
+            return str(topic)
+    return ""
+
+
+def _fresh_folder(account: object, name: str) -> object:
+    # Accessing a distinguished folder the first time is itself a GetFolder; afterwards
+    # the folder is cached, so refresh it to get current counts.
+    if name in getattr(account, "__dict__", {}):
+        folder = getattr(account, name)
+        refresh = getattr(folder, "refresh", None)
+        if callable(refresh):
+            refresh()
+        return folder
+    return getattr(account, name)
+
+
+def _export_query(folder: object, since: datetime | None) -> object:
+    query = folder.all() if since is None else folder.filter(datetime_received__gte=since)
+    return query.order_by("datetime_received").values_list("id", "changekey")
+
+
+def _normalize_stats_folders(folders: list[str] | None) -> list[str]:
+    if not folders:
+        return ["inbox"]
+    names: list[str] = []
+    for folder in folders:
+        name = _normalize_folder(folder, "stats folder")
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _normalize_folder(folder: str, label: str) -> str:
+    name = folder.strip().lower()
+    if name not in MAIL_FOLDERS:
+        raise ValueError(f"{label} must be one of: {', '.join(MAIL_FOLDERS)}")
+    return name
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _optional_int(value: object) -> int | None:
+    return value if isinstance(value, int) else None
 
 
 def _to_iso(value: object) -> str:
-    if isinstance(value, datetime):
+    # All-day calendar events start and end on dates rather than datetimes.
+    if isinstance(value, (datetime, date)):
         return value.isoformat()
     return ""
 
 
+def _to_event(item: object) -> CalendarEvent:
+    return CalendarEvent(
+        id=_text_or_empty(getattr(item, "id", "")),
+        subject=getattr(item, "subject", "") or "",
+        start=_to_iso(getattr(item, "start", None)),
+        end=_to_iso(getattr(item, "end", None)),
+        is_all_day=bool(getattr(item, "is_all_day", False)),
+        location=getattr(item, "location", "") or "",
+        organizer=_mailbox_to_str(getattr(item, "organizer", None)),
+        is_recurring=bool(getattr(item, "is_recurring", False)),
+        is_cancelled=bool(getattr(item, "is_cancelled", False)),
+    )
+
+
+def _from_iso(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
 def _recipient_list(items: list[object]) -> list[str]:
     result: list[str] = []
     for item in items:
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import bisect
+import math
+import random
+import threading
+import time
+from array import array
+from statistics import NormalDist
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Iterator
+from xml.sax.saxutils import escape
+
+# exchangelib returns these from FindItem; anything else in a projection costs a GetItem per chunk.
+FIND_ITEM_FIELDS = frozenset(
+    {"id", "changekey", "subject", "sender", "datetime_received", "is_read", "conversation_id", "conversation_topic"}
+)
+ALL_FIELDS = (
+    "id",
+    "changekey",
+    "subject",
+    "sender",
+    "to_recipients",
+    "cc_recipients",
+    "datetime_received",
+    "is_read",
+    "conversation_id",
+    "conversation_topic",
+    "text_body",
+    "body",
+)
+
+FIND_PAGE_SIZE = 100
+GET_CHUNK_SIZE = 100
+
+_REQUEST_BYTES = 400
+_ITEM_ENVELOPE_BYTES = 350
+_ID_BYTES = 160
+
+_SUBJECTS = (
+    "Invoice {n} due",
+    "RE: Budget review Q{q}",
+    "Weekly status report",
+    "FW: Contract draft v{n}",
+    "Meeting notes {n}",
+    "Reminder: timesheet",
+    "Lunch on Friday?",
+    "RE: Server maintenance window",
+    "Order confirmation {n}",
+    "Project kickoff",
+)
+_WORDS = (
+    "the quarterly invoice attached please review budget meeting schedule project server team customer "
+    "contract payment update report deadline thanks regards call notes agenda release build deploy "
+    "ticket incident follow up action items travel approval lorem ipsum dolor sit amet consectetur"
+).split()
+
+
+class DoesNotExist(Exception):
+    pass
+
+
+class SimulatedMailbox:
+    """
+    In-process stand-in for the exchangelib surface ``EwsReadonlyService`` uses.
+
+    Pass it as the account: ``EwsReadonlyService(settings, account_factory=lambda _: mailbox)``.
+    Folders support ``all``/``filter`` on ``datetime_received``, ``order_by``,
+    slicing, iteration, ``only``, ``values_list``, ``get`` and ``refresh``;
+    the mailbox supports bulk ``fetch``. Items are generated from a seed and
+    stored as compact columns, so 1M items fit in tens of MB; message objects
+    and bodies are built on access. ``stats`` counts simulated round-trips per
+    EWS operation and approximate response bytes.
+
+    ``slow_fraction`` of round-trips take ``slow_seconds`` instead of
+    ``latency_seconds`` to model a tail; setting ``unavailable`` makes every
+    round-trip raise ``ConnectionError`` like a down CAS node.
+    """
+
+    def __init__(
+        self,
+        items: int = 10_000,
+        days: int = 30,
+        senders: int = 500,
+        body_median_chars: int = 2000,
+        seed: int = 0,
+        latency_seconds: float = 0.0,
+        now: datetime | None = None,
+        extra_folders: dict[str, int] | None = None,
+        slow_fraction: float = 0.0,
+        slow_seconds: float = 0.0,
+    ) -> None:
+        self.stats = SimulatorStats()
+        self.latency_seconds = latency_seconds
+        self.slow_fraction = slow_fraction
+        self.slow_seconds = slow_seconds
+        self.unavailable = False
+        self._latency_rng = random.Random(seed)
+        self._corpus = _build_corpus(seed)
+        now = now or datetime.now(timezone.utc)
+        folders = {"inbox": items}
+        folders.update(extra_folders if extra_folders is not None else {"sent": 0, "junk": 0})
+        self._folders: dict[str, SimulatedFolder] = {}
+        for offset, (name, count) in enumerate(folders.items()):
+            self._folders[name] = SimulatedFolder(
+                mailbox=self,
+                name=name,
+                prefix=offset,
+                count=count,
+                days=days,
+                senders=senders,
+                body_median_chars=body_median_chars,
+                seed=seed + offset,
+                now=now,
+            )
+
+    def __getattr__(self, name: str) -> SimulatedFolder:
+        folders = self.__dict__.get("_folders", {})
+        if name not in folders:
+            raise AttributeError(name)
+        # exchangelib resolves a distinguished folder with GetFolder on first access, then caches it.
+        self._round_trip("GetFolder", 0, [])
+        self.__dict__[name] = folders[name]
+        return folders[name]
+
+    def fetch(self, ids: list[object], folder: object = None, only_fields: list[str] | None = None) -> Iterator[object]:
+        keys = [_item_key(item_id) for item_id in ids]
+        fields = tuple(only_fields) if only_fields else ALL_FIELDS
+        results: list[object] = []
+        for start in range(0, len(keys), GET_CHUNK_SIZE):
+            chunk = keys[start : start + GET_CHUNK_SIZE]
+            chunk_results: list[object] = []
+            for key in chunk:
+                target = self._resolve(key)
+                chunk_results.append(DoesNotExist(key) if target is None else target[0].message(target[1], fields))
+            self._round_trip("GetItem", len(chunk), chunk_results, request_ids=len(chunk))
+            results.extend(chunk_results)
+        return iter(results)
+
+    def _resolve(self, key: str) -> tuple[SimulatedFolder, int] | None:
+        try:
+            prefix, index = key.split("-", 2)[1:]
+            folder = list(self._folders.values())[int(prefix)]
+            position = int(index)
+        except (ValueError, IndexError):
+            return None
+        if 0 <= position < folder.total_count:
+            return folder, position
+        return None
+
+    def _round_trip(self, operation: str, items: int, messages: list[object], request_ids: int = 0) -> None:
+        if self.unavailable:
+            raise ConnectionError("simulated endpoint unavailable")
+        size = _REQUEST_BYTES + request_ids * _ID_BYTES + sum(_message_bytes(message) for message in messages)
+        self.stats.record(operation, items, size)
+        latency = self.latency_seconds
+        if self.slow_fraction and self._latency_rng.random() < self.slow_fraction:
+            latency = self.slow_seconds
+        if latency:
+            time.sleep(latency)
+
+
+class SimulatedFolder:
+    def __init__(
+        self,
+        mailbox: SimulatedMailbox,
+        name: str,
+        prefix: int,
+        count: int,
+        days: int,
+        senders: int,
+        body_median_chars: int,
+        seed: int,
+        now: datetime,
+    ) -> None:
+        rng = random.Random(seed)
+        self.name = name
+        self.total_count = count
+        self._mailbox = mailbox
+        self._prefix = prefix
+        self._epoch = now - timedelta(days=days)
+        step = days * 86400.0 / max(count, 1)
+        # Columns indexed by position, oldest first. Each column maps uniform 16-bit draws
+        # through a quantile table, which keeps generating 1M items to about a second.
+        jitter = _uniform16(rng, count)
+        self._received = array("d", [(n + u / 65536.0) * step for n, u in enumerate(jitter)])
+        self._body_sizes = array("I", map(_lognormal_table(body_median_chars).__getitem__, _uniform16(rng, count)))
+        self._senders = array("I", map(_pareto_table(senders).__getitem__, _uniform16(rng, count)))
+        self._subjects = bytes(u % len(_SUBJECTS) for u in _uniform16(rng, count))
+        self._unread = bytes(u < 6554 for u in _uniform16(rng, count))
+        self.unread_count = sum(self._unread)
+
+    def all(self) -> SimulatedQuerySet:
+        return SimulatedQuerySet(self, 0, self.total_count)
+
+    def filter(self, **kwargs: Any) -> SimulatedQuerySet:
+        return self.all().filter(**kwargs)
+
+    def get(self, id: str) -> object:  # noqa: A002 - mirrors exchangelib
+        target = self._mailbox._resolve(_item_key(id))
+        message = target[0].message(target[1], ALL_FIELDS) if target is not None and target[0] is self else None
+        self._mailbox._round_trip("GetItem", 1, [message] if message else [], request_ids=1)
+        if message is None:
+            raise DoesNotExist(id)
+        return message
+
+    def refresh(self) -> SimulatedFolder:
+        self._mailbox._round_trip("GetFolder", 0, [])
+        return self
+
+    def position_of(self, moment: datetime, right: bool = False) -> int:
+        offset = (moment - self._epoch).total_seconds()
+        return (bisect.bisect_right if right else bisect.bisect_left)(self._received, offset)
+
+    def message(self, position: int, fields: tuple[str, ...]) -> SimulatedMessage:
+        values: dict[str, Any] = {}
+        for field in fields:
+            values[field] = self._value(position, field)
+        if "id" not in values:
+            values["id"] = self._value(position, "id")
+        return SimulatedMessage(values)
+
+    def _value(self, position: int, field: str) -> Any:
+        if field == "id":
+            return f"SIM-{self._prefix}-{position:07d}"
+        if field == "changekey":
+            return f"CK{position % 997}"
+        if field == "subject" or field == "conversation_topic":
+            return _SUBJECTS[self._subjects[position]].format(n=position % 5000, q=position % 4 + 1)
+        if field == "sender":
+            return SimulatedAddress(f"sender{self._senders[position]}@example.local")
+        if field == "to_recipients":
+            return [SimulatedAddress("user@example.local")]
+        if field == "cc_recipients":
+            return []
+        if field == "datetime_received":
+            return self._epoch + timedelta(seconds=self._received[position])
+        if field == "is_read":
+            return not self._unread[position]
+        if field == "conversation_id":
+            return SimulatedAddress(None, id=f"CONV-{self._prefix}-{position // 3}")
+        if field in {"text_body", "body"}:
+            corpus = self._mailbox._corpus
+            size = self._body_sizes[position]
+            start = (position * 7919) % (len(corpus) - size) if size < len(corpus) else 0
+            return corpus[start : start + size]
+        return None
+
+
+class SimulatedQuerySet:
+    def __init__(
+        self,
+        folder: SimulatedFolder,
+        low: int,
+        high: int,
+        descending: bool = False,
+        fields: tuple[str, ...] = ALL_FIELDS,
+        flat: bool = False,
+    ) -> None:
+        self._folder = folder
+        self._low = low
+        self._high = high
+        self._descending = descending
+        self._fields = fields
+        self._flat = flat
+        self.page_size: int | None = None
+
+    def _copy(self, **changes: Any) -> SimulatedQuerySet:
+        values = {
+            "low": self._low,
+            "high": self._high,
+            "descending": self._descending,
+            "fields": self._fields,
+            "flat": self._flat,
+        }
+        values.update(changes)
+        clone = SimulatedQuerySet(self._folder, **values)
+        clone.page_size = self.page_size
+        return clone
+
+    def all(self) -> SimulatedQuerySet:
+        return self._copy()
+
+    def filter(self, **kwargs: Any) -> SimulatedQuerySet:
+        low, high = self._low, self._high
+        for key, moment in kwargs.items():
+            if key == "datetime_received__gte":
+                low = max(low, self._folder.position_of(moment))
+            elif key == "datetime_received__gt":
+                low = max(low, self._folder.position_of(moment, right=True))
+            elif key == "datetime_received__lt":
+                high = min(high, self._folder.position_of(moment))
+            elif key == "datetime_received__lte":
+                high = min(high, self._folder.position_of(moment, right=True))
+            else:
+                raise ValueError(f"simulator does not support filter {key!r}")
+        return self._copy(low=low, high=max(low, high))
+
+    def order_by(self, field: str) -> SimulatedQuerySet:
+        if field.lstrip("-") != "datetime_received":
+            raise ValueError(f"simulator does not support ordering by {field!r}")
+        return self._copy(descending=field.startswith("-"))
+
+    def only(self, *fields: str) -> SimulatedQuerySet:
+        return self._copy(fields=tuple(fields))
+
+    def values_list(self, *fields: str) -> SimulatedQuerySet:
+        return self._copy(fields=tuple(fields), flat=True)
+
+    def count(self) -> int:
+        self._folder._mailbox._round_trip("FindItem", 0, [])
+        return self._high - self._low
+
+    def __getitem__(self, window: slice) -> list[Any]:
+        positions = self._positions()[window]
+        return self._load(positions, self.page_size or FIND_PAGE_SIZE)
+
+    def __iter__(self) -> Iterator[Any]:
+        positions = self._positions()
+        page = self.page_size or FIND_PAGE_SIZE
+        for start in range(0, len(positions), page):
+            yield from self._load(positions[start : start + page], page)
+
+    def _positions(self) -> range:
+        if self._descending:
+            return range(self._high - 1, self._low - 1, -1)
+        return range(self._low, self._high)
+
+    def _load(self, positions: range, page: int) -> list[Any]:
+        mailbox = self._folder._mailbox
+        needs_get = any(field not in FIND_ITEM_FIELDS for field in self._fields)
+        find_fields = tuple(field for field in self._fields if field in FIND_ITEM_FIELDS)
+        messages = [self._folder.message(position, self._fields) for position in positions]
+        for start in range(0, max(len(positions), 1), page):
+            chunk = messages[start : start + page]
+            mailbox._round_trip("FindItem", len(chunk), [message.project(find_fields) for message in chunk])
+        if needs_get and messages:
+            # Like exchangelib, fields FindItem cannot return are read with GetItem in chunks.
+            for start in range(0, len(messages), GET_CHUNK_SIZE):
+                chunk = messages[start : start + GET_CHUNK_SIZE]
+                mailbox._round_trip("GetItem", len(chunk), chunk, request_ids=len(chunk))
+        if self._flat:
+            return [tuple(getattr(message, field) for field in self._fields) for message in messages]
+        return messages
+
+
+class SimulatedMessage:
+    def __init__(self, values: dict[str, Any]) -> None:
+        self.__dict__.update({field: None for field in ALL_FIELDS})
+        self.__dict__.update(values)
+
+    def project(self, fields: tuple[str, ...]) -> SimulatedMessage:
+        return SimulatedMessage({field: getattr(self, field) for field in fields})
+
+
+class SimulatedAddress:
+    def __init__(self, email_address: str | None, id: str | None = None) -> None:  # noqa: A002
+        self.email_address = email_address
+        self.id = id
+
+    def __str__(self) -> str:
+        return self.email_address or self.id or ""
+
+
+class SimulatorStats:
+    """Thread-safe round-trip, item and byte counters per simulated EWS operation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: dict[str, dict[str, int]] = {}
+
+    def record(self, operation: str, items: int, size: int) -> None:
+        with self._lock:
+            counters = self._operations.setdefault(operation, {"round_trips": 0, "items": 0, "bytes": 0})
+            counters["round_trips"] += 1
+            counters["items"] += items
+            counters["bytes"] += size
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    @property
+    def round_trips(self) -> int:
+        with self._lock:
+            return sum(counters["round_trips"] for counters in self._operations.values())
+
+    @property
+    def bytes(self) -> int:
+        with self._lock:
+            return sum(counters["bytes"] for counters in self._operations.values())
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {operation: dict(counters) for operation, counters in self._operations.items()}
+
+
+def soap_response(operation: str, messages: list[object]) -> bytes:
+    """
+    Render ``messages`` as an EWS-style SOAP response for ``operation``.
+
+    Serves simulated items over real HTTP (transport tests and benchmarks);
+    every string field becomes a ``t:`` element of its ``t:Message``.
+    """
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+        'xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" '
+        'xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">'
+        f"<s:Body><m:{operation}Response><m:ResponseMessages>"
+        f'<m:{operation}ResponseMessage ResponseClass="Success"><m:Items>'
+    ]
+    for message in messages:
+        parts.append("<t:Message>")
+        for field, value in vars(message).items():
+            if isinstance(value, str):
+                parts.append(f"<t:{field}>{escape(value)}</t:{field}>")
+        parts.append("</t:Message>")
+    parts.append(f"</m:Items></m:{operation}ResponseMessage></m:ResponseMessages></m:{operation}Response></s:Body></s:Envelope>")
+    return "".join(parts).encode("utf-8")
+
+
+def _item_key(item_id: object) -> str:
+    if isinstance(item_id, str):
+        return item_id
+    if isinstance(item_id, (tuple, list)):
+        return str(item_id[0])
+    return str(getattr(item_id, "id", item_id))
+
+
+def _message_bytes(message: object) -> int:
+    if message is None or isinstance(message, Exception):
+        return _ITEM_ENVELOPE_BYTES
+    size = _ITEM_ENVELOPE_BYTES
+    for value in vars(message).values():
+        if isinstance(value, str):
+            size += len(value)
+    return size
+
+
+def _uniform16(rng: random.Random, count: int) -> array:
+    return array("H", rng.randbytes(count * 2))
+
+
+@lru_cache(maxsize=8)
+def _lognormal_table(median: int) -> list[int]:
+    # Mail bodies: most are a few KB, a long tail reaches hundreds of KB.
+    normal = NormalDist(math.log(median), 1.0)
+    quantiles = [min(int(math.exp(normal.inv_cdf((q + 0.5) / 4096))), 200_000) for q in range(4096)]
+    return [quantiles[u >> 4] for u in range(65536)]
+
+
+@lru_cache(maxsize=8)
+def _pareto_table(senders: int) -> list[int]:
+    # A few heavy senders and a long tail.
+    return [min(int((1 - (u + 0.5) / 65536) ** (-1 / 1.1)) - 1, senders - 1) for u in range(65536)]
+
+
+def _build_corpus(seed: int) -> str:
+    rng = random.Random(seed)
+    # Bodies are windows into one shared corpus, so generating them costs a slice, not a join.
+    return " ".join(rng.choice(_WORDS) for _ in range(60_000))
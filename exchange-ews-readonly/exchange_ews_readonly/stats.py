@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from datetime import datetime
+
+
+class TopCounter:
+    """
+    Space-saving heavy-hitter counter with a fixed number of slots.
+
+    Exact while fewer than ``capacity`` distinct keys are seen. Past that, the
+    least frequent key is evicted and its count inherited, so reported counts
+    can overestimate by at most ``error`` for keys that entered late.
+
+    The least frequent key is found through a min-heap with one ``(count,
+    order, key)`` entry per slot. Increments leave the entry alone (counts
+    only grow, so it can only be low); an eviction that pops an outdated
+    entry pushes it back with the current count and tries again. Increments
+    stay O(1) and evictions amortised O(log capacity) instead of a scan of
+    every slot.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._capacity = capacity
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self._order = itertools.count()
+
+    @property
+    def exact(self) -> bool:
+        return not any(self._errors.values())
+
+    def add(self, key: str, amount: int = 1) -> None:
+        if key in self._counts:
+            self._counts[key] += amount
+            return
+        if len(self._counts) < self._capacity:
+            self._counts[key] = amount
+            self._errors[key] = 0
+            self._push(key)
+            return
+        victim = self._pop_min()
+        floor = self._counts.pop(victim)
+        self._errors.pop(victim)
+        self._counts[key] = floor + amount
+        self._errors[key] = floor
+        self._push(key)
+
+    def _push(self, key: str) -> None:
+        heapq.heappush(self._heap, (self._counts[key], next(self._order), key))
+
+    def _pop_min(self) -> str:
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            if self._counts[key] == count:
+                return key
+            self._push(key)
+
+    def get(self, key: str) -> int:
+        return self._counts.get(key, 0)
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        return sorted(self._counts.items(), key=lambda pair: (-pair[1], pair[0]))[:n]
+
+
+class StatsAggregator:
+    """Running per-folder, per-day and per-sender counts; memory does not grow with item count."""
+
+    def __init__(self, sender_capacity: int = 1000) -> None:
+        self.scanned = 0
+        self.folders: dict[str, dict[str, int]] = {}
+        self.per_day: dict[str, dict[str, int]] = {}
+        self._senders = TopCounter(sender_capacity)
+        self._unread_senders = TopCounter(sender_capacity)
+
+    def add(self, folder: str, sender: str, received: object, is_read: object) -> None:
+        self.scanned += 1
+        unread = is_read is False
+        folder_counts = self.folders.setdefault(folder, {"window_count": 0, "window_unread": 0})
+        folder_counts["window_count"] += 1
+        day = received.date().isoformat() if isinstance(received, datetime) else "unknown"
+        day_counts = self.per_day.setdefault(day, {"count": 0, "unread": 0})
+        day_counts["count"] += 1
+        self._senders.add(sender)
+        if unread:
+            folder_counts["window_unread"] += 1
+            day_counts["unread"] += 1
+            self._unread_senders.add(sender)
+
+    @property
+    def senders_exact(self) -> bool:
+        return self._senders.exact and self._unread_senders.exact
+
+    def top_senders(self, n: int) -> list[dict[str, object]]:
+        return [
+            {"sender": sender, "count": count, "unread": self._unread_senders.get(sender)}
+            for sender, count in self._senders.top(n)
+        ]
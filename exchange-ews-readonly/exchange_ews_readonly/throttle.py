@@ -0,0 +1,490 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from .config import Settings, Throttling
+from .deadline import wait_within_deadline
+from .errors import ConfigError
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - platform dependent
+    fcntl = None  # type: ignore[assignment]
+
+# exchangelib exception class names that signal a throttling budget was exceeded.
+_THROTTLING_ERROR_NAMES = frozenset(
+    {
+        "ErrorServerBusy",
+        "ErrorTooManyObjectsOpened",
+        "ErrorExceededConnectionCount",
+        "ErrorExceededSubscriptionCount",
+        "RateLimitError",
+    }
+)
+
+_DEFAULT_BACK_OFF_SECONDS = 5.0
+_INCREASE_STEP_FRACTION = 0.05
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    return any(klass.__name__ in _THROTTLING_ERROR_NAMES for klass in type(exc).__mro__)
+
+
+def requested_back_off(exc: BaseException) -> float:
+    for attr in ("back_off", "wait"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, (int, float)) and value > 0:
+            return float(value)
+    return _DEFAULT_BACK_OFF_SECONDS
+
+
+@dataclass
+class _BucketState:
+    tokens: float
+    rate: float
+    updated_at: float
+    paused_until: float = 0.0
+
+
+class _LocalBucket:
+    """Token bucket with AIMD rate adaptation, shared by threads of one process."""
+
+    def __init__(self, rate: float, burst: int, min_rate: float, clock: Callable[[], float]) -> None:
+        self._max_rate = rate
+        self._burst = burst
+        self._min_rate = min_rate
+        self._clock = clock
+        self._state = _BucketState(tokens=float(burst), rate=rate, updated_at=clock())
+
+    @property
+    def rate(self) -> float:
+        return self._state.rate
+
+    def try_take(self) -> float:
+        """Take one token and return 0, or return the seconds to wait before retrying."""
+        return _take(self._state, self._burst, self._clock())
+
+    def throttled(self, back_off: float) -> None:
+        _decrease(self._state, self._min_rate, back_off, self._clock())
+
+    def succeeded(self) -> None:
+        _increase(self._state, self._max_rate)
+
+
+class _FileBucket:
+    """Token bucket persisted in a flock-protected file so processes on one host share it."""
+
+    def __init__(self, path: str, rate: float, burst: int, min_rate: float, clock: Callable[[], float]) -> None:
+        self._path = path
+        self._max_rate = rate
+        self._burst = burst
+        self._min_rate = min_rate
+        self._clock = clock
+
+    @property
+    def rate(self) -> float:
+        with self._locked_state() as state:
+            return state.rate
+
+    def try_take(self) -> float:
+        with self._locked_state() as state:
+            return _take(state, self._burst, self._clock())
+
+    def throttled(self, back_off: float) -> None:
+        with self._locked_state() as state:
+            _decrease(state, self._min_rate, back_off, self._clock())
+
+    def succeeded(self) -> None:
+        with self._locked_state() as state:
+            _increase(state, self._max_rate)
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[_BucketState]:
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 4096)
+            state = self._decode(raw)
+            yield state
+            payload = json.dumps(
+                {
+                    "tokens": state.tokens,
+                    "rate": state.rate,
+                    "updated_at": state.updated_at,
+                    "paused_until": state.paused_until,
+                }
+            ).encode("utf-8")
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+    def _decode(self, raw: bytes) -> _BucketState:
+        try:
+            data = json.loads(raw.decode("utf-8"))
+            return _BucketState(
+                tokens=float(data["tokens"]),
+                rate=min(float(data["rate"]), self._max_rate),
+                updated_at=float(data["updated_at"]),
+                paused_until=float(data.get("paused_until", 0.0)),
+            )
+        except Exception:
+            return _BucketState(tokens=float(self._burst), rate=self._max_rate, updated_at=self._clock())
+
+
+def _take(state: _BucketState, burst: int, now: float) -> float:
+    if now < state.paused_until:
+        return state.paused_until - now
+    elapsed = max(0.0, now - state.updated_at)
+    state.tokens = min(float(burst), state.tokens + elapsed * state.rate)
+    state.updated_at = now
+    if state.tokens >= 1.0:
+        state.tokens -= 1.0
+        return 0.0
+    return (1.0 - state.tokens) / state.rate
+
+
+def _decrease(state: _BucketState, min_rate: float, back_off: float, now: float) -> None:
+    # Multiplicative decrease: halve the rate and drain the bucket so the next call
+    # honours the back-off requested by the server instead of bursting.
+    state.rate = max(min_rate, state.rate / 2.0)
+    state.tokens = 0.0
+    state.updated_at = now
+    state.paused_until = max(state.paused_until, now + back_off)
+
+
+def _increase(state: _BucketState, max_rate: float) -> None:
+    # Additive increase: creep back towards the configured rate after each success.
+    if state.rate < max_rate:
+        state.rate = min(max_rate, state.rate + max_rate * _INCREASE_STEP_FRACTION)
+
+
+class _FileSlots:
+    """Cross-process concurrency slots: one flock-ed file per slot, released on process exit."""
+
+    def __init__(self, prefix: str, count: int) -> None:
+        self._paths = [f"{prefix}.slot{index}" for index in range(count)]
+
+    def try_acquire(self) -> int | None:
+        for path in self._paths:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def release(self, fd: int) -> None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class _TicketQueue:
+    """Arrival-order tickets; a ticket given up while waiting is skipped instead of blocking the queue."""
+
+    _cond: threading.Condition
+    _serving: int
+    _abandoned: set[int]
+
+    def _advance(self) -> None:
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+
+    def _abandon(self, ticket: int) -> None:
+        if ticket == self._serving:
+            self._advance()
+        else:
+            self._abandoned.add(ticket)
+        self._cond.notify_all()
+
+
+class RateLimiter(_TicketQueue):
+    """
+    Token-bucket plus concurrency limiter for EWS calls.
+
+    Waiting callers are served strictly in arrival order, so one busy agent cannot
+    starve the others sharing the same service account. Throttling responses halve
+    the rate (down to a floor) and pause for the server-requested back-off; each
+    successful call raises the rate again by a small step.
+    """
+
+    _SLOT_POLL_SECONDS = 0.05
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int,
+        max_concurrency: int,
+        min_rate_per_sec: float,
+        lock_path: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._active = 0
+        self._calls = 0
+        self._throttled = 0
+        self._waited_seconds = 0.0
+        self._abandoned: set[int] = set()
+        self._file_slots: _FileSlots | None = None
+        if lock_path:
+            if fcntl is None:
+                raise ConfigError("EXCHANGE_EWS_THROTTLE_LOCK_DIR requires a platform with fcntl file locks")
+            # Wall-clock time is shared between processes, monotonic time is not.
+            self._bucket: _LocalBucket | _FileBucket = _FileBucket(
+                f"{lock_path}.bucket", rate_per_sec, burst, min_rate_per_sec, time.time
+            )
+            self._file_slots = _FileSlots(lock_path, max_concurrency)
+        else:
+            self._bucket = _LocalBucket(rate_per_sec, burst, min_rate_per_sec, clock)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        slot_fd = self._acquire()
+        try:
+            yield
+        except Exception as exc:
+            if is_throttling_error(exc):
+                # Bucket state is only touched under the condition, like in _acquire.
+                with self._cond:
+                    self._bucket.throttled(requested_back_off(exc))
+                    self._throttled += 1
+                    self._cond.notify_all()
+            raise
+        else:
+            with self._cond:
+                self._bucket.succeeded()
+        finally:
+            self._release(slot_fd)
+
+    def stats(self) -> dict[str, float]:
+        with self._cond:
+            return {
+                "calls": self._calls,
+                "throttled": self._throttled,
+                "active": self._active,
+                "waiting": self._next_ticket - self._serving - len(self._abandoned),
+                "waited_seconds": round(self._waited_seconds, 3),
+                "rate_per_sec": round(self._bucket.rate, 3),
+            }
+
+    def _acquire(self) -> int | None:
+        started = time.monotonic()
+        slot_fd: int | None = None
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            try:
+                while True:
+                    if ticket != self._serving or self._active >= self._max_concurrency:
+                        wait_within_deadline(self._cond)
+                        continue
+                    if self._file_slots is not None and slot_fd is None:
+                        slot_fd = self._file_slots.try_acquire()
+                        if slot_fd is None:
+                            wait_within_deadline(self._cond, self._SLOT_POLL_SECONDS)
+                            continue
+                    delay = self._bucket.try_take()
+                    if delay <= 0:
+                        break
+                    wait_within_deadline(self._cond, delay)
+            except BaseException:
+                # The deadline ran out while queued: give the ticket up so later callers are not stuck behind it.
+                if slot_fd is not None and self._file_slots is not None:
+                    self._file_slots.release(slot_fd)
+                self._abandon(ticket)
+                raise
+            self._advance()
+            self._active += 1
+            self._calls += 1
+            self._waited_seconds += time.monotonic() - started
+            self._cond.notify_all()
+        return slot_fd
+
+    def _release(self, slot_fd: int | None) -> None:
+        if slot_fd is not None and self._file_slots is not None:
+            self._file_slots.release(slot_fd)
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+
+class ConnectionBudget(_TicketQueue):
+    """
+    Process-wide cap on in-flight EWS requests across all tenants, served in arrival order.
+
+    Unlike ``RateLimiter`` it never backs off: one tenant being throttled must
+    not slow down the others.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._max_concurrency = max_concurrency
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._active = 0
+        self._peak = 0
+        self._calls = 0
+        self._waited_seconds = 0.0
+        self._abandoned: set[int] = set()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            try:
+                while ticket != self._serving or self._active >= self._max_concurrency:
+                    wait_within_deadline(self._cond)
+            except BaseException:
+                self._abandon(ticket)
+                raise
+            self._advance()
+            self._active += 1
+            self._calls += 1
+            self._peak = max(self._peak, self._active)
+            self._waited_seconds += time.monotonic() - started
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> dict[str, float]:
+        with self._cond:
+            return {
+                "max_concurrency": self._max_concurrency,
+                "calls": self._calls,
+                "active": self._active,
+                "peak": self._peak,
+                "waiting": self._next_ticket - self._serving - len(self._abandoned),
+                "waited_seconds": round(self._waited_seconds, 3),
+            }
+
+
+class CompositeLimiter:
+    """
+    Acquires the per-mailbox limiter, then the per-server limiter shared by all
+    mailboxes, then the optional process-wide connection budget.
+    """
+
+    def __init__(self, mailbox: RateLimiter, server: RateLimiter, process: ConnectionBudget | None = None) -> None:
+        self.mailbox = mailbox
+        self.server = server
+        self.process = process
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self.mailbox.slot(), self.server.slot():
+            if self.process is None:
+                yield
+                return
+            with self.process.slot():
+                yield
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        stats = {"mailbox": self.mailbox.stats(), "server": self.server.stats()}
+        if self.process is not None:
+            stats["process"] = self.process.stats()
+        return stats
+
+
+# Keyed by (server or server|mailbox, limiter config): a service configured differently gets its own limiter.
+_REGISTRY: dict[tuple[str, tuple[object, ...]], RateLimiter] = {}
+_REGISTRY_LOCK = threading.Lock()
+_BUDGET: ConnectionBudget | None = None
+
+
+def limiter_for(settings: Settings) -> CompositeLimiter:
+    """Return the process-wide limiters for this mailbox and server, creating them on first use."""
+    throttling = settings.throttling
+    server_key = settings.server.lower()
+    mailbox_key = f"{server_key}|{settings.email.lower()}"
+    return CompositeLimiter(
+        mailbox=_shared_limiter(
+            mailbox_key,
+            throttling,
+            throttling.mailbox_rate_per_sec,
+            throttling.mailbox_burst,
+            throttling.mailbox_max_concurrency,
+        ),
+        server=_shared_limiter(
+            server_key,
+            throttling,
+            throttling.server_rate_per_sec,
+            throttling.server_burst,
+            throttling.server_max_concurrency,
+        ),
+        process=_connection_budget(throttling.process_max_concurrency),
+    )
+
+
+def tenant_usage() -> dict[str, dict[str, float]]:
+    """
+    Per-mailbox limiter stats for every tenant this process has served, keyed by ``server|email``.
+
+    A mailbox served with several throttling configs has one limiter per
+    config; the later ones are listed as ``server|email#2``, ``#3`` and so on.
+    """
+    with _REGISTRY_LOCK:
+        limiters = [(name, limiter) for (name, _config), limiter in _REGISTRY.items() if "|" in name]
+    usage: dict[str, dict[str, float]] = {}
+    for name, limiter in limiters:
+        key, copy = name, 1
+        while key in usage:
+            copy += 1
+            key = f"{name}#{copy}"
+        usage[key] = limiter.stats()
+    return dict(sorted(usage.items()))
+
+
+def _connection_budget(max_concurrency: int) -> ConnectionBudget | None:
+    # One budget per process; the first tenant that asks for one sizes it.
+    global _BUDGET
+    if max_concurrency <= 0:
+        return None
+    with _REGISTRY_LOCK:
+        if _BUDGET is None:
+            _BUDGET = ConnectionBudget(max_concurrency)
+        return _BUDGET
+
+
+def _shared_limiter(name: str, throttling: Throttling, rate: float, burst: int, max_concurrency: int) -> RateLimiter:
+    key = (name, (rate, burst, max_concurrency, throttling.min_rate_per_sec, throttling.lock_dir))
+    with _REGISTRY_LOCK:
+        limiter = _REGISTRY.get(key)
+        if limiter is None:
+            lock_path = ""
+            if throttling.lock_dir:
+                os.makedirs(throttling.lock_dir, exist_ok=True)
+                # Processes with different configs still share the file bucket: it is the server's budget.
+                digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+                lock_path = os.path.join(throttling.lock_dir, f"ews-throttle-{digest}")
+            limiter = RateLimiter(
+                rate_per_sec=rate,
+                burst=burst,
+                max_concurrency=max_concurrency,
+                min_rate_per_sec=throttling.min_rate_per_sec,
+                lock_path=lock_path,
+            )
+            _REGISTRY[key] = limiter
+        return limiter
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_attributes", "_start_ns", "_otel")
+
+    def __init__(self, tracer: Tracer, name: str, attributes: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._start_ns = 0
+        self._otel: ContextManager[Any] | None = None
+
+    def __enter__(self) -> _Span:
+        if self._tracer.otel_tracer is not None:
+            self._otel = self._tracer.otel_tracer.start_as_current_span(self._name, attributes=self._attributes)
+            self._otel.__enter__()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: object) -> None:
+        duration_ns = time.perf_counter_ns() - self._start_ns
+        if exc_type is not None:
+            self._attributes["error"] = exc_type.__name__
+        if self._otel is not None:
+            self._otel.__exit__(exc_type, exc, tb)
+        self._tracer.record(
+            SpanRecord(
+                name=self._name,
+                start_ns=self._start_ns,
+                duration_ns=duration_ns,
+                thread_id=threading.get_ident(),
+                attributes=self._attributes,
+            )
+        )
+
+    def set(self, key: str, value: Any) -> None:
+        self._attributes[key] = value
+
+
+class Tracer:
+    """
+    Collects finished spans in memory and forwards them to optional listeners.
+
+    ``otel_tracer`` may be any OpenTelemetry API tracer (anything with
+    ``start_as_current_span(name, attributes=...)``); each span is mirrored
+    there, so the usual OpenTelemetry exporters apply. ``listeners`` receive
+    every ``SpanRecord`` as it finishes.
+    """
+
+    def __init__(
+        self,
+        otel_tracer: Any = None,
+        listeners: list[Callable[[SpanRecord], None]] | None = None,
+        max_spans: int = 1_000_000,
+    ) -> None:
+        self.otel_tracer = otel_tracer
+        self._listeners = list(listeners or [])
+        self._max_spans = max_spans
+        self._lock = threading.Lock()
+        self._spans: list[SpanRecord] = []
+        self.dropped = 0
+
+    def record(self, record: SpanRecord) -> None:
+        with self._lock:
+            if len(self._spans) < self._max_spans:
+                self._spans.append(record)
+            else:
+                self.dropped += 1
+        for listener in self._listeners:
+            listener(record)
+
+    @property
+    def spans(self) -> list[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        totals: dict[str, dict[str, float]] = {}
+        for record in self.spans:
+            entry = totals.setdefault(record.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += record.duration_ns / 1e6
+        return {name: {"count": entry["count"], "total_ms": round(entry["total_ms"], 3)} for name, entry in totals.items()}
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        events = [
+            {
+                "name": record.name,
+                "ph": "X",
+                "ts": record.start_ns / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": {key: _jsonable(value) for key, value in record.attributes.items()},
+            }
+            for record in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(os.path.expanduser(path), "w", encoding="utf-8") as handle:
+            json.dump(self.to_chrome_trace(), handle)
+
+
+_TRACER: Tracer | None = None
+
+
+def span(name: str, **attributes: Any) -> _Span | _NoopSpan:
+    # Disabled tracing costs one global read and returns a shared no-op context manager.
+    tracer = _TRACER
+    if tracer is None:
+        return _NOOP_SPAN
+    return _Span(tracer, name, attributes)
+
+
+def enable_tracing(tracer: Tracer | None = None) -> Tracer:
+    global _TRACER
+    _TRACER = tracer if tracer is not None else Tracer()
+    return _TRACER
+
+
+def disable_tracing() -> Tracer | None:
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    return tracer
+
+
+def tracing_enabled() -> bool:
+    return _TRACER is not None
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
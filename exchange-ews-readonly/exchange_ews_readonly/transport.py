@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Callable
+
+from .config import Settings
+
+ACCEPT_ENCODING = "gzip, deflate"
+
+# Decoded bytes handed to the XML parser per read; also the chunk urllib3 decompresses in.
+_DECODE_CHUNK_BYTES = 64 * 1024
+
+# First element inside the SOAP body names the EWS operation: <m:FindItem ...>.
+_OPERATION_PATTERN = re.compile(rb"<(?:[\w.-]+:)?Body\b[^>]*>\s*<(?:[\w.-]+:)?(\w+)")
+
+
+class TransportCounters:
+    """Thread-safe response counters per EWS operation: requests, bytes on the wire and bytes after decoding."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: dict[str, dict[str, int]] = {}
+
+    def record(self, operation: str, wire_bytes: int, decoded_bytes: int) -> None:
+        with self._lock:
+            counters = self._operations.setdefault(
+                operation,
+                {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0},
+            )
+            counters["requests"] += 1
+            counters["wire_bytes"] += wire_bytes
+            counters["decoded_bytes"] += decoded_bytes
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {operation: dict(counters) for operation, counters in sorted(self._operations.items())}
+
+
+def scope_transport(protocol: Any, settings: Settings, adapter_cls: type) -> None:
+    """
+    Apply ``settings``' HTTP options to one exchangelib protocol instead of the class.
+
+    exchangelib reads ``TIMEOUT`` through the instance and builds sessions via
+    ``self.raw_session``, so instance attributes override the class-wide
+    defaults for this endpoint and credentials only. Protocols are shared per
+    endpoint and credentials, so two services that share both also share
+    these options and the byte counters (kept when the protocol is rescoped).
+
+    Sessions ask for gzip/deflate responses, read each response body through
+    urllib3's incremental decoder in 64 KiB chunks and count wire and decoded
+    bytes per EWS operation.
+    """
+    counters = getattr(getattr(protocol, "raw_session", None), "counters", None) or TransportCounters()
+    protocol.TIMEOUT = settings.timeout_seconds
+    protocol.raw_session = _raw_session_with(type(protocol), adapter_cls, counters)
+
+
+def transport_stats(account: object) -> dict[str, object]:
+    protocol = getattr(account, "protocol", None)
+    if protocol is None:
+        return {}
+    raw_session = getattr(protocol, "raw_session", None)
+    adapter = getattr(raw_session, "adapter_cls", None)
+    counters = getattr(raw_session, "counters", None)
+    return {
+        "service_endpoint": str(getattr(protocol, "service_endpoint", "") or ""),
+        "timeout_seconds": getattr(protocol, "TIMEOUT", None),
+        "verify_tls": adapter is None or adapter.__name__ != "NoVerifyHTTPAdapter",
+        "max_connections": getattr(getattr(protocol, "config", None), "max_connections", None),
+        "open_sessions": getattr(protocol, "session_pool_size", None),
+        "operations": counters.snapshot() if counters is not None else {},
+    }
+
+
+class _CompressedTransportMixin:
+    """
+    Adapter mixin: negotiates compression and reads non-streamed bodies itself.
+
+    requests would decode in 10 KiB chunks and exchangelib then re-reads the
+    body through ``iter_content()``, whose default is one byte per chunk; the
+    returned response yields 64 KiB chunks instead. Streamed responses
+    (GetStreamingEvents, which this skill does not use) are left untouched and
+    uncounted.
+    """
+
+    counters: TransportCounters
+
+    def send(self, request: Any, stream: bool = False, **kwargs: Any) -> Any:
+        request.headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        response = super().send(request, stream=stream, **kwargs)  # type: ignore[misc]
+        if stream:
+            return response
+        content = b"".join(response.iter_content(_DECODE_CHUNK_BYTES))
+        response._content = content
+        tell = getattr(response.raw, "tell", None)
+        self.counters.record(_operation(request.body), tell() if tell is not None else len(content), len(content))
+        iter_content = response.iter_content
+
+        def iter_decoded(chunk_size: int | None = _DECODE_CHUNK_BYTES, decode_unicode: bool = False) -> Any:
+            return iter_content(chunk_size, decode_unicode)
+
+        response.iter_content = iter_decoded
+        return response
+
+
+def _operation(body: object) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8", errors="replace")
+    if not isinstance(body, bytes):
+        return "unknown"
+    match = _OPERATION_PATTERN.search(body)
+    return match.group(1).decode("ascii") if match else "unknown"
+
+
+def _raw_session_with(protocol_cls: Any, adapter_cls: type, counters: TransportCounters) -> Callable[..., Any]:
+    mounted_cls = type(
+        f"Compressed{adapter_cls.__name__}",
+        (_CompressedTransportMixin, adapter_cls),
+        {"counters": counters},
+    )
+
+    def raw_session(prefix: str, *args: Any, **kwargs: Any) -> Any:
+        session = protocol_cls.raw_session(prefix, *args, **kwargs)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        # Same pooling as exchangelib's get_adapter: one connection per session, no adapter retries.
+        session.mount(
+            prefix,
+            mounted_cls(
+                pool_block=True,
+                pool_connections=protocol_cls.CONNECTIONS_PER_SESSION,
+                pool_maxsize=protocol_cls.CONNECTIONS_PER_SESSION,
+                max_retries=0,
+            ),
+        )
+        return session
+
+    raw_session.adapter_cls = adapter_cls  # type: ignore[attr-defined]
+    raw_session.counters = counters  # type: ignore[attr-defined]
+    return raw_session
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from .config import Settings
+
+_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CachedVersion:
+    build: tuple[int, int, int, int]
+    api_version: str
+    service_endpoint: str
+    saved_at: float
+
+
+class VersionCache:
+    """
+    Small JSON file remembering the negotiated Exchange build and EWS endpoint.
+
+    Entries are keyed by server and auth type, so a cold process can configure
+    exchangelib with a known version and skip the version-probing round-trip.
+    Unreadable or malformed cache files are treated as empty.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = os.path.expanduser(path)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def load(self, settings: Settings) -> CachedVersion | None:
+        entry = self._read().get(cache_key(settings))
+        if not isinstance(entry, dict):
+            return None
+        try:
+            build = tuple(int(part) for part in entry["build"])
+            if len(build) != 4:
+                return None
+            return CachedVersion(
+                build=build,  # type: ignore[arg-type]
+                api_version=str(entry["api_version"]),
+                service_endpoint=str(entry["service_endpoint"]),
+                saved_at=float(entry.get("saved_at", 0.0)),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def store(
+        self,
+        settings: Settings,
+        build: tuple[int, int, int, int],
+        api_version: str,
+        service_endpoint: str,
+    ) -> None:
+        entry = CachedVersion(
+            build=build,
+            api_version=api_version,
+            service_endpoint=service_endpoint,
+            saved_at=time.time(),
+        )
+        with _LOCK:
+            data = self._read()
+            data[cache_key(settings)] = asdict(entry)
+            self._write(data)
+
+    def invalidate(self, settings: Settings) -> None:
+        with _LOCK:
+            data = self._read()
+            if data.pop(cache_key(settings), None) is not None:
+                self._write(data)
+
+    def _read(self) -> dict[str, object]:
+        try:
+            with open(self._path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, object]) -> None:
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write-then-rename so concurrent CLI processes never read a torn file.
+        fd, tmp_path = tempfile.mkstemp(prefix=".versions-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, indent=2, sort_keys=True)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def cache_key(settings: Settings) -> str:
+    return f"{settings.server.lower()}|{settings.auth_type.value}"
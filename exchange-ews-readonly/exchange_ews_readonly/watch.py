@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, TypeVar
+
+from .models import MailEvent, MailSummary
+from .throttle import is_throttling_error, requested_back_off
+
+T = TypeVar("T")
+
+WATCH_EVENT_TYPES = ("NewMailEvent", "ModifiedEvent")
+
+_EVENT_NAMES = {"NewMailEvent": "new_mail", "ModifiedEvent": "modified"}
+_SUBSCRIPTION_TIMEOUT_MINUTES = 10
+_SEEN_CAPACITY = 10_000
+_MAX_RECONNECT_DELAY_SECONDS = 60.0
+
+# The stored watermark can no longer be resumed from; the only way on is a fresh subscription.
+_WATERMARK_ERROR_NAMES = frozenset({"ErrorInvalidWatermark", "ErrorExpiredSubscription"})
+# EWS response errors worth a reconnect. Every exchangelib response error derives from
+# TransportError, so connection-level failures are recognised by the exact class instead.
+_TRANSIENT_RESPONSE_ERROR_NAMES = frozenset(
+    {
+        "ErrorTimeoutExpired",
+        "ErrorInternalServerTransientError",
+        "ErrorMailboxStoreUnavailable",
+        "ErrorSubscriptionNotFound",
+        "ErrorInvalidSubscription",
+        "ErrorConnectionFailed",
+    }
+)
+_CONNECTION_ERROR_NAMES = frozenset({"TransportError", "RedirectError"})
+
+logger = logging.getLogger("exchange_ews_readonly")
+
+
+class WatermarkStore:
+    """Persists the last processed watermark so a restarted watch resumes without gaps."""
+
+    def __init__(self, path: str) -> None:
+        self._path = os.path.expanduser(path) if path else ""
+
+    def load(self) -> str | None:
+        if not self._path:
+            return None
+        try:
+            with open(self._path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        watermark = data.get("watermark") if isinstance(data, dict) else None
+        return watermark if isinstance(watermark, str) and watermark else None
+
+    def save(self, watermark: str) -> None:
+        if not self._path:
+            return
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".watch-", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"watermark": watermark}, handle)
+        os.replace(tmp_path, self._path)
+
+    def clear(self) -> None:
+        if not self._path:
+            return
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+class MailWatcher:
+    """
+    Pull-subscription loop over the inbox that yields ``MailEvent`` objects.
+
+    Each poll drains GetEvents, then fetches the referenced items in one bulk
+    GetItem with the ``list`` projection. After a dropped connection or lost
+    subscription it re-subscribes from the last processed watermark, and a
+    bounded (id, changekey) memory drops events replayed by that resume. A
+    watermark the server rejects as invalid or expired is dropped and the
+    watch starts over from now; other non-transient errors are raised.
+
+    The watermark is persisted after every emitted event, including the last
+    one before the consumer stops, so a restart does not replay it. The
+    subscription is removed when the generator is closed.
+    """
+
+    def __init__(
+        self,
+        call: Callable[[Callable[[object], T]], T],
+        fetch_summaries: Callable[[object, list[object]], list[MailSummary | None]],
+        poll_seconds: float,
+        store: WatermarkStore,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._call = call
+        self._fetch_summaries = fetch_summaries
+        self._poll_seconds = poll_seconds
+        self._store = store
+        self._sleep = sleep
+        self._seen: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self.reconnects = 0
+
+    def events(self, watermark: str | None = None) -> Iterator[MailEvent]:
+        watermark = watermark or self._store.load()
+        subscription_id: str | None = None
+        failures = 0
+        try:
+            while True:
+                try:
+                    if subscription_id is None:
+                        subscription_id, fresh_watermark = self._call(
+                            lambda account: account.inbox.subscribe_to_pull(
+                                event_types=list(WATCH_EVENT_TYPES),
+                                watermark=watermark,
+                                timeout=_SUBSCRIPTION_TIMEOUT_MINUTES,
+                            )
+                        )
+                        watermark = watermark or fresh_watermark
+                    # Each emitted event saves its own watermark; the batch watermark covers
+                    # events that were deduplicated or deleted before the fetch.
+                    pending, next_watermark = self._drain(subscription_id, watermark)
+                    if pending:
+                        yield from self._emit(pending)
+                    watermark = next_watermark
+                    self._store.save(watermark)
+                    failures = 0
+                except Exception as exc:
+                    if _is_watermark_error(exc):
+                        logger.warning("watch: watermark rejected (%s), starting from now", type(exc).__name__)
+                        self._unsubscribe(subscription_id)
+                        subscription_id, watermark = None, None
+                        self._store.clear()
+                        self.reconnects += 1
+                        continue
+                    if not _is_transient(exc):
+                        raise
+                    failures += 1
+                    self.reconnects += 1
+                    subscription_id = None
+                    delay = requested_back_off(exc) if is_throttling_error(exc) else self._reconnect_delay(failures)
+                    logger.warning("watch: subscription lost (%s), resuming in %.1fs", type(exc).__name__, delay)
+                    self._sleep(delay)
+                    continue
+                self._sleep(self._poll_seconds)
+        finally:
+            self._unsubscribe(subscription_id)
+
+    def _unsubscribe(self, subscription_id: str | None) -> None:
+        if subscription_id is None:
+            return
+        try:
+            self._call(lambda account: account.inbox.unsubscribe(subscription_id))
+        except Exception as exc:
+            # The server drops it after the subscription timeout anyway.
+            logger.debug("watch: unsubscribe failed (%s)", type(exc).__name__)
+
+    def _drain(self, subscription_id: str, watermark: str) -> tuple[list[tuple[str, object, str]], str]:
+        notifications = self._call(lambda account: list(account.inbox.get_events(subscription_id, watermark)))
+        pending: list[tuple[str, object, str]] = []
+        for notification in notifications:
+            for event in getattr(notification, "events", None) or []:
+                event_watermark = getattr(event, "watermark", None) or watermark
+                name = _EVENT_NAMES.get(type(event).__name__)
+                item_id = getattr(event, "item_id", None)
+                if name is not None and item_id is not None:
+                    pending.append((name, item_id, event_watermark))
+                watermark = event_watermark
+        return pending, watermark
+
+    def _emit(self, pending: list[tuple[str, object, str]]) -> Iterator[MailEvent]:
+        fresh = []
+        keys: set[tuple[str, str]] = set()
+        for name, item_id, event_watermark in pending:
+            key = (str(getattr(item_id, "id", "")), str(getattr(item_id, "changekey", "")))
+            if key in self._seen or key in keys:
+                continue
+            keys.add(key)
+            fresh.append((key, name, item_id, event_watermark))
+        if not fresh:
+            return
+        summaries = self._call(lambda account: self._fetch_summaries(account, [entry[2] for entry in fresh]))
+        for (key, name, _, event_watermark), summary in zip(fresh, summaries):
+            self._remember(key)
+            # Items deleted between the event and the fetch come back empty.
+            if summary is not None:
+                try:
+                    yield MailEvent(event=name, watermark=event_watermark, message=summary)
+                finally:
+                    # Also runs when the consumer closes the generator right after this event.
+                    self._store.save(event_watermark)
+
+    def _remember(self, key: tuple[str, str]) -> None:
+        self._seen[key] = None
+        if len(self._seen) > _SEEN_CAPACITY:
+            self._seen.popitem(last=False)
+
+    def _reconnect_delay(self, failures: int) -> float:
+        return min(_MAX_RECONNECT_DELAY_SECONDS, self._poll_seconds * (2 ** min(failures - 1, 6)))
+
+
+def _is_watermark_error(exc: BaseException) -> bool:
+    return any(klass.__name__ in _WATERMARK_ERROR_NAMES for klass in type(exc).__mro__)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if is_throttling_error(exc) or isinstance(exc, OSError):
+        return True
+    names = {klass.__name__ for klass in type(exc).__mro__}
+    if "ResponseMessageError" in names:
+        return bool(names & _TRANSIENT_RESPONSE_ERROR_NAMES)
+    return bool(names & (_CONNECTION_ERROR_NAMES | _TRANSIENT_RESPONSE_ERROR_NAMES))
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
 import json
 import sys
+from datetime import datetime
 
 from dotenv import load_dotenv
 
@@ -15,8 +17,21 @@ from exchange_ews_readonly import (
     Settings,
 )
 from exchange_ews_readonly.client import EwsConnectionError
-from exchange_ews_readonly.guards import assert_read_only
+from exchange_ews_readonly.errors import DeadlineExceededError
+from exchange_ews_readonly.guards import assert_read_only, select_summary_fields
+from exchange_ews_readonly.handles import HandleMap
 from exchange_ews_readonly.logging_utils import configure_logging
+from exchange_ews_readonly.models import ResultList
+from exchange_ews_readonly.throttle import is_throttling_error
+from exchange_ews_readonly.tracing import disable_tracing, enable_tracing, span
+
+
+_NO_DEADLINE_COMMANDS = ("watch", "export")
+
+_FIELDS_HELP = (
+    "Comma-separated output fields: id, subject, sender, datetime_received, preview (default all); "
+    "unselected fields are not fetched"
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -25,23 +40,97 @@ def build_parser() -> argparse.ArgumentParser:
         description="Read-only EWS CLI for on-prem Exchange (NTLM/BASIC)",
     )
     parser.add_argument("--json", action="store_true", help="Print JSON output (default behavior)")
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Time budget for all EWS requests of list, get, search, conversations, calendar, stats and health "
+            "(not watch or export); list output becomes {items, truncated}"
+        ),
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Replace mail item ids with short handles that `get --id` accepts (map kept in "
+            "EXCHANGE_EWS_HANDLE_MAP); calendar ids are left as they are"
+        ),
+    )
+    parser.add_argument("--minify", action="store_true", help="Print JSON without indentation or spaces")
+    parser.add_argument("--profile", default="", metavar="PATH", help="Write cProfile stats for the run to PATH")
+    parser.add_argument(
+        "--trace",
+        default="",
+        metavar="PATH",
+        help="Write Chrome trace JSON (account build, EWS calls, conversion, output) to PATH",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    subparsers.add_parser("health", help="Check EWS connectivity and inbox read access")
+    p_health = subparsers.add_parser("health", help="Check EWS connectivity and inbox read access")
+    p_health.add_argument("--deep", action="store_true", help="Also fetch one inbox item (slower)")
+    p_health.add_argument("--timings", action="store_true", help="Add DNS/TCP/TLS connect timings")
 
     p_list = subparsers.add_parser("list", help="List latest messages from Inbox")
     p_list.add_argument("--limit", type=int, default=None, help="Message count (default 10, max 50)")
     p_list.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
+    p_list.add_argument("--fields", type=_field_list, default=None, help=_FIELDS_HELP)
 
     p_get = subparsers.add_parser("get", help="Get message by EWS item id")
-    p_get.add_argument("--id", required=True, help="EWS message id")
+    p_get.add_argument("--id", required=True, help="EWS message id or a --compact handle")
     p_get.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
 
     p_search = subparsers.add_parser("search", help="Search recent messages in Inbox")
-    p_search.add_argument("--query", default="", help="Search substring")
+    p_search.add_argument(
+        "--query",
+        default="",
+        help='Search terms: AND by default, OR, -term/NOT term, "phrase", from:/subject:/body: scopes',
+    )
+    p_search.add_argument("--regex", action="store_true", help="Allow /pattern/ regex terms in --query")
     p_search.add_argument("--days", type=int, default=None, help="Lookback days (default 7, max 30)")
     p_search.add_argument("--limit", type=int, default=None, help="Result count (default 10, max 50)")
     p_search.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
+    p_search.add_argument("--fields", type=_field_list, default=None, help=_FIELDS_HELP)
+
+    p_conv = subparsers.add_parser("conversations", help="List recent Inbox threads with message summaries")
+    p_conv.add_argument("--limit", type=int, default=None, help="Thread count (default 5, max 20)")
+    p_conv.add_argument("--days", type=int, default=None, help="Lookback days (default 7, max 30)")
+    p_conv.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
+
+    p_cal = subparsers.add_parser("calendar", help="List calendar events in a window, recurring series expanded")
+    p_cal.add_argument(
+        "--start",
+        type=_start_time,
+        default=None,
+        help="Window start as ISO date or datetime (default today 00:00 UTC; no offset means UTC)",
+    )
+    p_cal.add_argument("--days", type=int, default=None, help="Window length in days (default 7, max 31)")
+    p_cal.add_argument("--limit", type=int, default=None, help="Event count (default 50, max 200)")
+
+    p_stats = subparsers.add_parser("stats", help="Count messages per folder, day and sender over a date window")
+    p_stats.add_argument("--days", type=int, default=None, help="Lookback days (default 7, max 30)")
+    p_stats.add_argument(
+        "--folder",
+        action="append",
+        default=None,
+        help="Folder to aggregate: inbox (default), sent, junk; repeatable",
+    )
+    p_stats.add_argument("--top", type=int, default=None, help="Top senders to report (default 10, max 100)")
+
+    p_watch = subparsers.add_parser("watch", help="Stream new/modified Inbox messages as NDJSON")
+    p_watch.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
+    p_watch.add_argument("--poll", type=int, default=None, help="Poll interval seconds (default 5, max 60)")
+    p_watch.add_argument("--state", default="", help="File to persist the watermark for resume across restarts")
+    p_watch.add_argument("--max-events", type=int, default=None, help="Exit after this many events")
+
+    p_export = subparsers.add_parser("export", help="Export a folder to gzip NDJSON, resumable after interruption")
+    p_export.add_argument("--output", required=True, help="Target .ndjson.gz file; a .checkpoint.json sits next to it")
+    p_export.add_argument("--folder", default="inbox", help="Folder to export: inbox (default), sent, junk")
+    p_export.add_argument("--days", type=int, default=None, help="Only messages from the last N days (default all)")
+    p_export.add_argument("--batch", type=int, default=None, help="Items per bulk fetch (default 100, max 500)")
+    p_export.add_argument("--workers", type=int, default=None, help="Parallel bulk fetches (default 4, max 8)")
+    p_export.add_argument("--preview", type=int, default=None, help="Body preview length (default 500, max 1000)")
     return parser
 
 
@@ -49,7 +138,27 @@ def main(argv: list[str] | None = None) -> int:
     load_dotenv()
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.deadline is not None and args.command in _NO_DEADLINE_COMMANDS:
+        # Long-running streams: a silently ignored budget would be worse than none.
+        parser.error(f"--deadline is not supported by {args.command}")
+
+    profiler = cProfile.Profile() if args.profile else None
+    tracer = enable_tracing() if args.trace else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        with span(f"command:{args.command}"):
+            return _run(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if tracer is not None:
+            disable_tracing()
+            tracer.write_chrome_trace(args.trace)
+
 
+def _run(args: argparse.Namespace) -> int:
     try:
         settings = Settings.from_env()
     except ConfigError as exc:
@@ -57,30 +166,112 @@ def main(argv: list[str] | None = None) -> int:
 
     logger = configure_logging(secrets=[settings.password])
     service = EwsReadonlyService(settings=settings)
+    handles = HandleMap(settings.handle_map_path) if args.compact or args.command == "get" else None
 
     try:
         command = args.command
         assert_read_only(command)
 
         if command == "health":
-            result = service.health().to_dict()
+            result = service.health(
+                deep=args.deep,
+                connect_timings=args.timings,
+                deadline_seconds=args.deadline,
+            ).to_dict()
         elif command == "list":
-            result = [item.to_dict() for item in service.list_messages(limit=args.limit, preview=args.preview)]
+            result = _list_output(
+                service.list_messages(
+                    limit=args.limit,
+                    preview=args.preview,
+                    deadline_seconds=args.deadline,
+                    fields=args.fields,
+                ),
+                args.deadline,
+                fields=args.fields,
+                handles=handles if args.compact else None,
+            )
         elif command == "get":
-            result = service.get_message(message_id=args.id, preview=args.preview).to_dict()
+            result = service.get_message(
+                message_id=handles.resolve(args.id) if handles is not None else args.id,
+                preview=args.preview,
+                deadline_seconds=args.deadline,
+            ).to_dict()
+            if args.compact:
+                result["id"] = handles.shorten(result["id"])
         elif command == "search":
-            result = [
-                item.to_dict()
-                for item in service.search_messages(
+            result = _list_output(
+                service.search_messages(
                     query=args.query,
                     days=args.days,
                     limit=args.limit,
                     preview=args.preview,
-                )
-            ]
+                    regex=args.regex,
+                    deadline_seconds=args.deadline,
+                    fields=args.fields,
+                ),
+                args.deadline,
+                fields=args.fields,
+                handles=handles if args.compact else None,
+            )
+        elif command == "conversations":
+            result = _list_output(
+                service.list_conversations(
+                    limit=args.limit,
+                    days=args.days,
+                    preview=args.preview,
+                    deadline_seconds=args.deadline,
+                ),
+                args.deadline,
+                handles=handles if args.compact else None,
+            )
+        elif command == "calendar":
+            # No handles: `get` reads mail, so a calendar handle would resolve to nothing useful.
+            result = _list_output(
+                service.calendar_view(
+                    start=args.start,
+                    days=args.days,
+                    limit=args.limit,
+                    deadline_seconds=args.deadline,
+                ),
+                args.deadline,
+            )
+        elif command == "watch":
+            # Streams NDJSON itself; one line per event, flushed as it arrives.
+            events = service.watch_messages(
+                preview=args.preview,
+                poll_seconds=args.poll,
+                state_path=args.state,
+                max_events=args.max_events,
+            )
+            try:
+                for event in events:
+                    with span("serialise"):
+                        line = json.dumps(event.to_dict(), ensure_ascii=False)
+                    print(line, flush=True)
+            except KeyboardInterrupt:
+                pass
+            return 0
+        elif command == "stats":
+            result = service.mailbox_stats(
+                days=args.days,
+                folders=args.folder,
+                top=args.top,
+                deadline_seconds=args.deadline,
+            ).to_dict()
+        elif command == "export":
+            result = service.export_messages(
+                output_path=args.output,
+                folder=args.folder,
+                days=args.days,
+                batch_size=args.batch,
+                workers=args.workers,
+                preview=args.preview,
+            ).to_dict()
         else:
             # Defensive fallback: unknown action is always denied.
             raise ReadOnlyViolationError()
+        if handles is not None:
+            handles.save()
     except ReadOnlyViolationError as exc:
         return _fail(str(exc), code=3)
     except ValueError as exc:
@@ -89,14 +280,58 @@ def main(argv: list[str] | None = None) -> int:
         return _fail(str(exc), code=4)
     except EwsConnectionError as exc:
         return _fail(str(exc), code=5)
+    except DeadlineExceededError:
+        return _fail("DEADLINE_EXCEEDED: operation did not finish within --deadline", code=7)
     except Exception as exc:  # pragma: no cover - defensive runtime handling
+        if is_throttling_error(exc):
+            return _fail("EWS_THROTTLED: server requested back-off, retry later", code=6)
         logger.error("Unexpected runtime error: %s", exc)
         return _fail("EWS_RUNTIME_ERROR", code=1)
+    finally:
+        service.close()
 
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    with span("serialise"):
+        if args.minify:
+            output = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        else:
+            output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
     return 0
 
 
+def _field_list(value: str) -> list[str]:
+    return [field for field in value.split(",") if field.strip()]
+
+
+def _start_time(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date or datetime: {value!r}") from None
+
+
+def _list_output(
+    items: ResultList,
+    deadline: float | None,
+    fields: list[str] | None = None,
+    handles: HandleMap | None = None,
+) -> object:
+    rows = [item.to_dict(fields=select_summary_fields(fields)) if fields else item.to_dict() for item in items]
+    if handles is not None:
+        for row in rows:
+            _shorten_ids(row, handles)
+    if deadline is None:
+        return rows
+    return {"items": rows, "truncated": items.truncated}
+
+
+def _shorten_ids(row: dict, handles: HandleMap) -> None:
+    if "id" in row:
+        row["id"] = handles.shorten(row["id"])
+    for message in row.get("messages", ()):
+        _shorten_ids(message, handles)
+
+
 def _fail(message: str, code: int) -> int:
     print(json.dumps({"error": message}, ensure_ascii=False), file=sys.stderr)
     return code
@@ -0,0 +1,158 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from exchange_ews_readonly.config import Limits, Settings, Throttling
+from exchange_ews_readonly.guards import clamp_calendar_days, clamp_calendar_limit
+from exchange_ews_readonly.service import EwsReadonlyService
+
+
+class _FakeMailbox:
+    def __init__(self, email_address: str) -> None:
+        self.email_address = email_address
+
+
+class _FakeOccurrence:
+    def __init__(self, item_id: str, subject: str, start: object, end: object, **extra: object) -> None:
+        self.id = item_id
+        self.subject = subject
+        self.start = start
+        self.end = end
+        self.is_all_day = extra.get("is_all_day", False)
+        self.location = extra.get("location")
+        self.organizer = _FakeMailbox("boss@example.local")
+        self.is_recurring = extra.get("is_recurring", False)
+        self.is_cancelled = extra.get("is_cancelled", False)
+
+
+class _FakeView:
+    def __init__(self, calendar: "_FakeCalendar", items: list[_FakeOccurrence]) -> None:
+        self._calendar = calendar
+        self._items = items
+
+    def only(self, *fields: str) -> "_FakeView":
+        self._calendar.only_fields = fields
+        return self
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class _FakeCalendar:
+    """Expands a weekly series into occurrences, like the server does for CalendarView."""
+
+    def __init__(self, series_start: datetime) -> None:
+        self.series_start = series_start
+        self.views: list[tuple[datetime, datetime, int | None]] = []
+        self.only_fields: tuple[str, ...] = ()
+
+    def view(self, start: datetime, end: datetime, max_items: int | None = None) -> _FakeView:
+        self.views.append((start, end, max_items))
+        occurrences = []
+        when = self.series_start
+        while when < end and (max_items is None or len(occurrences) < max_items):
+            if when >= start:
+                occurrences.append(
+                    _FakeOccurrence(
+                        f"occ-{when:%Y%m%d}",
+                        "Weekly sync",
+                        when,
+                        when + timedelta(minutes=30),
+                        is_recurring=True,
+                        location="Room 1",
+                    )
+                )
+            when += timedelta(days=7)
+        return _FakeView(self, occurrences)
+
+    def filter(self, **_kwargs: object) -> None:  # pragma: no cover - must never be called
+        raise AssertionError("calendar reads must go through a CalendarView")
+
+
+class _FakeAccount:
+    def __init__(self, calendar: _FakeCalendar) -> None:
+        self.calendar = calendar
+
+
+def _service(calendar: _FakeCalendar, limits: Limits | None = None) -> EwsReadonlyService:
+    settings = Settings(
+        server="mail.example.local",
+        email="user@example.local",
+        username="EXAMPLE\\user",
+        password="secret",
+        limits=limits or Limits(),
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    return EwsReadonlyService(settings=settings, account_factory=lambda _: _FakeAccount(calendar))
+
+
+def test_calendar_view_returns_server_expanded_occurrences() -> None:
+    calendar = _FakeCalendar(datetime(2026, 1, 5, 9, tzinfo=timezone.utc))
+    service = _service(calendar)
+
+    events = service.calendar_view(start=datetime(2026, 3, 1, tzinfo=timezone.utc), days=14)
+
+    start, end, max_items = calendar.views[0]
+    assert (start, end, max_items) == (
+        datetime(2026, 3, 1, tzinfo=timezone.utc),
+        datetime(2026, 3, 15, tzinfo=timezone.utc),
+        50,
+    )
+    assert [event.start for event in events] == ["2026-03-02T09:00:00+00:00", "2026-03-09T09:00:00+00:00"]
+    assert all(event.is_recurring and event.location == "Room 1" for event in events)
+    assert events[0].organizer == "boss@example.local"
+    assert "organizer" in calendar.only_fields and "body" not in calendar.only_fields
+    assert events.truncated is False
+
+
+def test_calendar_view_clamps_window_and_count() -> None:
+    calendar = _FakeCalendar(datetime(2026, 1, 1, tzinfo=timezone.utc))
+    service = _service(calendar, Limits(calendar_days_max=14, calendar_default=3, calendar_max=5))
+
+    events = service.calendar_view(start=datetime(2026, 1, 1), days=365, limit=999)
+
+    start, end, max_items = calendar.views[0]
+    assert start.tzinfo is timezone.utc
+    assert end - start == timedelta(days=14)
+    assert max_items == 5
+    assert len(events) == 2
+
+    with pytest.raises(ValueError):
+        service.calendar_view(days=0)
+
+
+def test_calendar_view_converts_offset_start_to_utc() -> None:
+    calendar = _FakeCalendar(datetime(2026, 1, 5, 9, tzinfo=timezone.utc))
+
+    _service(calendar).calendar_view(start=datetime.fromisoformat("2026-03-02T09:00:00+02:00"), days=1)
+
+    start, end, _ = calendar.views[0]
+    assert start.tzinfo is timezone.utc
+    assert start == datetime(2026, 3, 2, 7, tzinfo=timezone.utc)
+    assert end == datetime(2026, 3, 3, 7, tzinfo=timezone.utc)
+
+
+def test_calendar_view_keeps_all_day_dates() -> None:
+    class _AllDayCalendar(_FakeCalendar):
+        def view(self, start: datetime, end: datetime, max_items: int | None = None) -> _FakeView:
+            self.views.append((start, end, max_items))
+            item = _FakeOccurrence("holiday", "Holiday", date(2026, 5, 1), date(2026, 5, 2), is_all_day=True)
+            return _FakeView(self, [item])
+
+    calendar = _AllDayCalendar(datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    (event,) = _service(calendar).calendar_view()
+
+    assert (event.start, event.end, event.is_all_day, event.location) == ("2026-05-01", "2026-05-02", True, "")
+    start, end, _ = calendar.views[0]
+    assert (start.hour, start.minute, start.tzinfo) == (0, 0, timezone.utc)
+    assert end - start == timedelta(days=7)
+
+
+def test_calendar_clamps() -> None:
+    assert clamp_calendar_days(None) == 7
+    assert clamp_calendar_days(90) == 31
+    assert clamp_calendar_limit(None) == 50
+    assert clamp_calendar_limit(1000) == 200
+    with pytest.raises(ValueError):
+        clamp_calendar_limit(-1)
@@ -0,0 +1,115 @@
+import threading
+from dataclasses import replace
+
+import pytest
+
+from exchange_ews_readonly.coalesce import SingleFlight
+from exchange_ews_readonly.config import Limits, Settings
+from exchange_ews_readonly.service import EwsReadonlyService
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_identical_calls_share_one_execution() -> None:
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = 0
+    results: list[int] = []
+
+    def _slow() -> int:
+        nonlocal executions
+        executions += 1
+        started.set()
+        release.wait(5)
+        return 42
+
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", _slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", _slow))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flights.stats()["shared"] < 4:
+        pass
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert executions == 1
+    assert results == [42] * 5
+    assert flights.stats()["hit_rate"] == 0.8
+
+
+def test_errors_are_fanned_out_and_not_cached() -> None:
+    flights = SingleFlight(ttl_seconds=10)
+
+    def _fail() -> int:
+        raise LookupError("boom")
+
+    with pytest.raises(LookupError):
+        flights.do("key", _fail)
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_ttl_reuses_result_until_expiry() -> None:
+    clock = _Clock()
+    flights = SingleFlight(ttl_seconds=1.0, clock=clock)
+    counter = iter(range(100))
+
+    assert flights.do("key", lambda: next(counter)) == 0
+    assert flights.do("key", lambda: next(counter)) == 0
+    clock.now += 2
+    assert flights.do("key", lambda: next(counter)) == 1
+    assert flights.stats()["cached"] == 1
+
+
+def test_expired_and_excess_results_are_swept_on_insert() -> None:
+    clock = _Clock()
+    flights = SingleFlight(ttl_seconds=1.0, clock=clock, max_results=3)
+
+    for index in range(5):
+        flights.do(("get", index), lambda index=index: index)
+    assert flights.stats()["results"] == 3
+
+    clock.now += 2
+    flights.do(("get", "fresh"), lambda: "fresh")
+    assert flights.stats()["results"] == 1
+    assert flights.do(("get", "fresh"), lambda: "recomputed") == "fresh"
+
+
+def test_service_coalesces_by_clamped_arguments() -> None:
+    fetches: list[int] = []
+
+    class _Inbox:
+        def all(self) -> "_Inbox":
+            return self
+
+        def order_by(self, _field: str) -> "_Inbox":
+            return self
+
+        def __getitem__(self, slc: slice) -> list[object]:
+            fetches.append(slc.stop)
+            return []
+
+    class _Account:
+        inbox = _Inbox()
+
+    settings = replace(
+        Settings(server="coalesce.example.local", email="u@example.local", username="u", password="x", limits=Limits()),
+        result_ttl_seconds=30.0,
+    )
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: _Account())
+
+    service.list_messages(limit=500)
+    service.list_messages(limit=50)
+    service.list_messages(limit=10)
+
+    assert fetches == [50, 10]
+    assert service.coalesce_stats()["cached"] == 1
@@ -48,6 +48,17 @@ def test_username_is_optional(monkeypatch: pytest.MonkeyPatch) -> None:
     assert settings.username == "user@example.local"
 
 
+def test_server_list_sets_failover_hosts(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_required_env(monkeypatch)
+    monkeypatch.setenv("EXCHANGE_EWS_SERVER", "cas1.example.local, cas2.example.local")
+    monkeypatch.setenv("EXCHANGE_EWS_HEDGE", "true")
+
+    settings = Settings.from_env()
+    assert settings.server == "cas1.example.local"
+    assert settings.servers == ("cas1.example.local", "cas2.example.local")
+    assert settings.hedge_requests is True
+
+
 def test_plaintext_password_fallback_requires_flag(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("EXCHANGE_EWS_SERVER", "mail.example.local")
     monkeypatch.setenv("EXCHANGE_EWS_EMAIL", "user@example.local")
@@ -66,10 +77,16 @@ def test_plaintext_password_fallback_requires_flag(monkeypatch: pytest.MonkeyPat
         ("EXCHANGE_EWS_SERVER", "", "Missing required environment variable"),
         ("EXCHANGE_EWS_EMAIL", "invalid-email", "must be a valid email address"),
         ("EXCHANGE_EWS_SERVER", "https://mail.example.local", "must be a host name only"),
+        ("EXCHANGE_EWS_SERVER", "cas1.example.local,,cas2.example.local", "must not contain empty host names"),
+        ("EXCHANGE_EWS_SERVER", "cas1.example.local,CAS1.example.local", "must not repeat a host name"),
         ("EXCHANGE_EWS_AUTH_TYPE", "KERBEROS", "must be one of"),
         ("EXCHANGE_EWS_VERIFY_TLS", "maybe", "must be boolean"),
         ("EXCHANGE_EWS_TIMEOUT_SEC", "abc", "must be an integer"),
         ("EXCHANGE_EWS_TIMEOUT_SEC", "0", "must be between 1 and 300"),
+        ("EXCHANGE_EWS_RATE_PER_SEC", "fast", "must be a number"),
+        ("EXCHANGE_EWS_RESULT_TTL_SEC", "120", "must be between 0 and 60"),
+        ("EXCHANGE_EWS_SEARCH_CACHE_SIZE", "0", "must be between 1 and 10000"),
+        ("EXCHANGE_EWS_PROCESS_MAX_CONNECTIONS", "-1", "must be between 0 and 10000"),
     ],
 )
 def test_invalid_env_values_raise_clear_errors(
@@ -105,3 +122,24 @@ def test_invalid_crypto_key_raises(monkeypatch: pytest.MonkeyPatch) -> None:
 
     with pytest.raises(ConfigError, match="EXCHANGE_EWS_CRYPTO_KEY is invalid"):
         Settings.from_env()
+
+
+def test_version_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_required_env(monkeypatch)
+    monkeypatch.delenv("EXCHANGE_EWS_VERSION_CACHE", raising=False)
+    assert Settings.from_env().version_cache_path.endswith("versions.json")
+
+    monkeypatch.setenv("EXCHANGE_EWS_VERSION_CACHE", "off")
+    assert Settings.from_env().version_cache_path == ""
+
+
+def test_search_cache_backends(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_required_env(monkeypatch)
+    monkeypatch.delenv("EXCHANGE_EWS_SEARCH_CACHE", raising=False)
+    assert Settings.from_env().search_cache == ""
+
+    monkeypatch.setenv("EXCHANGE_EWS_SEARCH_CACHE", "memory")
+    assert Settings.from_env().search_cache == "memory"
+
+    monkeypatch.setenv("EXCHANGE_EWS_SEARCH_CACHE", "disk")
+    assert Settings.from_env().search_cache.endswith("search.json")
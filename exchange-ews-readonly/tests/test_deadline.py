@@ -0,0 +1,145 @@
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+from exchange_ews_readonly.config import Limits, Settings, Throttling
+from exchange_ews_readonly.deadline import Deadline, current_deadline, deadline_scope
+from exchange_ews_readonly.errors import DeadlineExceededError
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+
+
+def _settings() -> Settings:
+    return Settings(
+        server="sim.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+
+
+def _service(mailbox: SimulatedMailbox, **kwargs: object) -> EwsReadonlyService:
+    return EwsReadonlyService(settings=_settings(), account_factory=lambda _: mailbox, **kwargs)
+
+
+def test_deadline_counts_down_and_rejects_non_positive_budgets() -> None:
+    now = [100.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+    assert deadline.remaining() == 2.0
+    now[0] = 102.5
+    assert deadline.expired and deadline.remaining() == 0.0
+    with pytest.raises(DeadlineExceededError):
+        deadline.check()
+    with pytest.raises(ValueError, match="deadline must be > 0"):
+        Deadline(0)
+
+
+def test_nested_scope_never_extends_outer_deadline() -> None:
+    with deadline_scope(0.5) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+        with deadline_scope(None) as same:
+            assert same is outer
+    assert current_deadline() is None
+
+
+def test_search_returns_truncated_partial_result_when_deadline_hits() -> None:
+    service = _service(SimulatedMailbox(items=2000, seed=1, latency_seconds=0.05))
+
+    result = service.search_messages("invoice", days=30, limit=10, deadline_seconds=0.02)
+
+    assert result.truncated
+    assert len(result) < 10
+
+
+def test_list_keeps_pages_read_before_the_deadline() -> None:
+    mailbox = SimulatedMailbox(items=500, seed=5, latency_seconds=0.05)
+    settings = replace(_settings(), limits=Limits(list_default=50, list_max=300))
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+
+    result = service.list_messages(limit=300, deadline_seconds=0.03)
+
+    assert result.truncated
+    assert len(result) == 100
+    assert mailbox.stats.snapshot()["FindItem"]["round_trips"] == 1
+    assert [message.id for message in result] == [message.id for message in service.list_messages(limit=100)]
+
+
+def test_search_without_deadline_is_not_truncated() -> None:
+    result = _service(SimulatedMailbox(items=2000, seed=1)).search_messages("invoice", days=30, limit=5)
+
+    assert not result.truncated
+    assert len(result) == 5
+
+
+def test_conversations_fall_back_to_headers_when_out_of_time() -> None:
+    mailbox = SimulatedMailbox(items=300, seed=2, latency_seconds=0.05)
+    service = _service(mailbox)
+
+    threads = service.list_conversations(limit=3, days=30, deadline_seconds=0.08)
+
+    assert threads.truncated
+    assert threads and all(message.preview == "" for thread in threads for message in thread.messages)
+    assert "GetItem" not in mailbox.stats.snapshot()
+    # The 300-item header scan stopped between pages instead of reading all three.
+    assert mailbox.stats.snapshot()["FindItem"]["round_trips"] < 3
+
+
+def test_stats_stop_between_folders_when_deadline_hits() -> None:
+    mailbox = SimulatedMailbox(items=500, seed=3, latency_seconds=0.03, extra_folders={"sent": 200, "junk": 50})
+    service = _service(mailbox)
+
+    stats = service.mailbox_stats(days=30, folders=["inbox", "sent", "junk"], deadline_seconds=0.05)
+
+    assert stats.truncated
+    assert "junk" not in stats.folders
+
+
+def test_get_raises_when_outer_deadline_already_passed() -> None:
+    mailbox = SimulatedMailbox(items=10, seed=4)
+    service = _service(mailbox)
+    message_id = service.list_messages(limit=1)[0].id
+
+    with deadline_scope(0.001):
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceededError):
+            service.get_message(message_id, deadline_seconds=30)
+
+
+def test_health_raises_when_deadline_runs_out_between_requests() -> None:
+    mailbox = SimulatedMailbox(items=10, seed=4, latency_seconds=0.05)
+    service = _service(mailbox)
+
+    assert service.health(deep=True, deadline_seconds=30).status == "ok"
+    with pytest.raises(DeadlineExceededError):
+        service.health(deep=True, deadline_seconds=0.03)
+
+
+def test_eager_connect_builds_and_authenticates_in_background() -> None:
+    mailbox = SimulatedMailbox(items=10, seed=5)
+    built_on: list[str] = []
+
+    def factory(_settings: Settings) -> SimulatedMailbox:
+        built_on.append(threading.current_thread().name)
+        return mailbox
+
+    service = EwsReadonlyService(settings=_settings(), account_factory=factory, eager_connect=True)
+
+    assert service.wait_until_warm(timeout=5)
+    assert built_on == ["ews-warm-up"]
+    assert mailbox.stats.snapshot()["GetFolder"]["round_trips"] == 1
+    service.list_messages(limit=1)
+    assert built_on == ["ews-warm-up"]
+
+
+def test_failed_warm_up_is_only_logged(caplog: pytest.LogCaptureFixture) -> None:
+    def factory(_settings: Settings) -> object:
+        raise ConnectionError("unreachable")
+
+    service = EwsReadonlyService(settings=_settings(), account_factory=factory, eager_connect=True)
+
+    assert service.wait_until_warm(timeout=5)
+    assert "eager warm-up failed: ConnectionError" in caplog.text
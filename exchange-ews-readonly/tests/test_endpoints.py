@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.endpoints import EndpointSet, LatencyHistogram, is_failover_error
+from exchange_ews_readonly.errors import DeadlineExceededError
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+
+
+class ErrorServerBusy(Exception):
+    pass
+
+
+class TransportError(Exception):
+    pass
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _service(
+    mailboxes: dict[str, SimulatedMailbox],
+    hedge: bool = False,
+    endpoints: EndpointSet | None = None,
+) -> EwsReadonlyService:
+    primary, *others = mailboxes
+    settings = Settings(
+        server=primary,
+        failover_servers=tuple(others),
+        hedge_requests=hedge,
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(
+            mailbox_rate_per_sec=1000, mailbox_burst=1000, server_rate_per_sec=1000, server_burst=1000
+        ),
+    )
+    return EwsReadonlyService(settings=settings, account_factory=lambda s: mailboxes[s.server], endpoints=endpoints)
+
+
+def test_histogram_percentiles_are_bucket_bounds() -> None:
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(0.010)
+    histogram.record(0.500)
+    histogram.record(0.900)
+
+    assert histogram.percentile(0.5) == pytest.approx(0.010, rel=0.25)
+    assert histogram.percentile(0.99) == pytest.approx(0.5, rel=0.25)
+    assert histogram.snapshot()["max_ms"] == 900.0
+
+
+def test_failed_endpoint_is_ranked_last_until_cooldown_expires() -> None:
+    clock = _Clock()
+    endpoints = EndpointSet(["cas1", "cas2", "cas3"], cooldown_seconds=5, clock=clock)
+    endpoints.record_success("cas2", "ews:get", 0.01)
+    endpoints.record_success("cas3", "ews:get", 0.05)
+
+    endpoints.record_failure("cas2")
+    assert endpoints.ranked() == ["cas1", "cas3", "cas2"]
+
+    clock.now += 5
+    assert endpoints.ranked()[0] == "cas1"
+    endpoints.record_success("cas1", "ews:get", 0.1)
+    assert endpoints.ranked() == ["cas2", "cas3", "cas1"]
+
+
+def test_failover_errors_exclude_throttling_and_deadlines() -> None:
+    assert is_failover_error(ConnectionError("refused"))
+    assert is_failover_error(TransportError("bad gateway"))
+    assert not is_failover_error(ErrorServerBusy())
+    assert not is_failover_error(DeadlineExceededError("late"))
+    assert not is_failover_error(KeyError("not found"))
+
+
+def test_reads_fail_over_to_the_next_host() -> None:
+    down = SimulatedMailbox(items=50, seed=1)
+    up = SimulatedMailbox(items=50, seed=1)
+    down.unavailable = True
+    service = _service({"cas1.example.local": down, "cas2.example.local": up})
+
+    listed = service.list_messages(limit=3)
+    detail = service.get_message(listed[0].id)
+
+    stats = service.endpoint_stats()
+    assert detail.id == listed[0].id
+    assert stats["failovers"] == 1
+    assert not stats["endpoints"]["cas1.example.local"]["healthy"]
+    # The failed host is now ranked last, so the second read goes straight to cas2.
+    assert stats["endpoints"]["cas1.example.local"]["requests"] == 1
+    assert stats["endpoints"]["cas2.example.local"]["operations"]["ews:get"]["count"] == 1
+
+
+def test_non_idempotent_calls_use_the_healthiest_host_without_retry() -> None:
+    down = SimulatedMailbox(items=50, seed=1)
+    up = SimulatedMailbox(items=50, seed=1)
+    down.unavailable = True
+    service = _service({"cas1.example.local": down, "cas2.example.local": up})
+
+    with pytest.raises(ConnectionError):
+        service.mailbox_stats(days=30, folders=["inbox"])
+    assert service.mailbox_stats(days=30, folders=["inbox"]).scanned == 50
+
+
+def test_hedged_read_takes_the_first_answer() -> None:
+    endpoints = EndpointSet(["cas1", "cas2"])
+    for _ in range(20):
+        endpoints.record_success("cas1", "ews:get", 0.002)
+        endpoints.record_success("cas2", "ews:get", 0.003)
+    stalled = SimulatedMailbox(items=50, seed=1)
+    healthy = SimulatedMailbox(items=50, seed=1, latency_seconds=0.002)
+    service = _service({"cas1": stalled, "cas2": healthy}, hedge=True, endpoints=endpoints)
+    message_id = healthy.inbox.all()[:1][0].id
+    stalled.latency_seconds = 0.5
+    before = set(threading.enumerate())
+
+    started = time.perf_counter()
+    detail = service.get_message(message_id)
+
+    assert detail.id == message_id
+    assert time.perf_counter() - started < 0.4
+    stats = service.endpoint_stats()
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+    service.close()
+    # The losing request finishes in the background; after that the hedge workers exit.
+    for thread in set(threading.enumerate()) - before:
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+    # Closed services still serve; a later hedge starts a fresh executor.
+    assert service.get_message(message_id).id == message_id
+
+
+def test_fast_failure_before_the_hedge_delay_counts_as_failover_not_hedge() -> None:
+    endpoints = EndpointSet(["cas1", "cas2"])
+    for _ in range(20):
+        endpoints.record_success("cas1", "ews:get", 0.5)
+        endpoints.record_success("cas2", "ews:get", 0.5)
+    down = SimulatedMailbox(items=50, seed=1)
+    up = SimulatedMailbox(items=50, seed=1)
+    service = _service({"cas1": down, "cas2": up}, hedge=True, endpoints=endpoints)
+    message_id = up.inbox.all()[:1][0].id
+    down.unavailable = True
+
+    assert service.get_message(message_id).id == message_id
+
+    stats = service.endpoint_stats()
+    assert (stats["hedges"], stats["hedge_wins"], stats["failovers"]) == (0, 0, 1)
+    service.close()
+
+
+def test_no_hedge_before_enough_samples() -> None:
+    mailboxes = {"cas1": SimulatedMailbox(items=50, seed=1), "cas2": SimulatedMailbox(items=50, seed=1)}
+    service = _service(mailboxes, hedge=True)
+
+    for _ in range(5):
+        service.list_messages(limit=1)
+
+    assert service.endpoint_stats()["hedges"] == 0
@@ -0,0 +1,178 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.export import ExportCheckpoint, MailboxExporter, checkpoint_path
+from exchange_ews_readonly.service import EwsReadonlyService
+
+_BASE = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _rows(ids: list[tuple[str, str]]) -> list[dict[str, object]]:
+    return [{"id": item_id, "datetime_received": f"t{int(item_id[1:]):04d}"} for item_id, _ in ids]
+
+
+def _pages(count: int, page_size: int = 7):
+    def id_pages(checkpoint: ExportCheckpoint):
+        start = int(checkpoint.last_received[1:]) if checkpoint.last_received else 0
+        ids = [(f"m{index}", "ck") for index in range(start, count)]
+        for offset in range(0, len(ids), page_size):
+            yield ids[offset : offset + page_size]
+
+    return id_pages
+
+
+def _read(path) -> list[dict[str, object]]:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_exporter_writes_all_items_in_order(tmp_path) -> None:
+    output = tmp_path / "inbox.ndjson.gz"
+    exporter = MailboxExporter(_pages(53), _rows, batch_size=5, workers=3, checkpoint_every=2)
+
+    result = exporter.run(str(output))
+
+    assert [row["id"] for row in _read(output)] == [f"m{index}" for index in range(53)]
+    assert result.items == 53
+    assert result.written == 53
+    assert result.resumed_from == 0
+    assert result.output_bytes == output.stat().st_size
+    checkpoint = ExportCheckpoint.load(checkpoint_path(str(output)))
+    assert checkpoint is not None and checkpoint.items == 53
+
+
+def test_exporter_resumes_after_interruption_without_duplicates(tmp_path) -> None:
+    output = tmp_path / "inbox.ndjson.gz"
+    fetched: list[str] = []
+
+    def failing_fetch(ids: list[tuple[str, str]]) -> list[dict[str, object]]:
+        if ids[0][0] == "m30":
+            raise ConnectionError("dropped")
+        fetched.extend(item_id for item_id, _ in ids)
+        return _rows(ids)
+
+    with pytest.raises(ConnectionError):
+        MailboxExporter(_pages(53), failing_fetch, batch_size=5, workers=1, checkpoint_every=2).run(str(output))
+    interrupted = ExportCheckpoint.load(checkpoint_path(str(output)))
+    assert interrupted is not None and 0 < interrupted.items < 53
+
+    result = MailboxExporter(_pages(53), _rows, batch_size=5, workers=2, checkpoint_every=2).run(str(output))
+
+    assert [row["id"] for row in _read(output)] == [f"m{index}" for index in range(53)]
+    assert result.resumed_from == interrupted.items
+    assert result.written == 53 - interrupted.items
+
+
+def test_exporter_skips_ids_already_written_at_checkpoint_timestamp(tmp_path) -> None:
+    output = tmp_path / "inbox.ndjson.gz"
+    same_time = lambda ids: [{"id": item_id, "datetime_received": "t"} for item_id, _ in ids]  # noqa: E731
+    first = MailboxExporter(lambda _: iter([[("a", "1"), ("b", "1")]]), same_time, batch_size=10, workers=1)
+    first.run(str(output))
+
+    # The resumed FindItem starts at the checkpoint timestamp inclusive, so it sees a and b again.
+    second = MailboxExporter(lambda _: iter([[("a", "1"), ("b", "1"), ("c", "1")]]), same_time, batch_size=10, workers=1)
+    result = second.run(str(output))
+
+    assert [row["id"] for row in _read(output)] == ["a", "b", "c"]
+    assert result.written == 1
+
+
+class _ExportQuery:
+    def __init__(self, items: list[SimpleNamespace]) -> None:
+        self._items = items
+
+    def filter(self, datetime_received__gte: datetime) -> "_ExportQuery":
+        return _ExportQuery([item for item in self._items if item.datetime_received >= datetime_received__gte])
+
+    def all(self) -> "_ExportQuery":
+        return self
+
+    def order_by(self, field: str) -> "_ExportQuery":
+        assert field == "datetime_received"
+        return _ExportQuery(sorted(self._items, key=lambda item: item.datetime_received))
+
+    def values_list(self, *fields: str) -> list[tuple[str, str]]:
+        assert fields == ("id", "changekey")
+        return [(item.id, item.changekey) for item in self._items]
+
+
+class _ExportAccount:
+    def __init__(self, count: int) -> None:
+        self.items = {
+            f"m{index}": SimpleNamespace(
+                id=f"m{index}",
+                changekey="ck",
+                subject=f"subject {index}",
+                sender=SimpleNamespace(email_address="a@example.local"),
+                to_recipients=[],
+                cc_recipients=[],
+                datetime_received=_BASE + timedelta(minutes=index),
+                text_body="x" * 50,
+            )
+            for index in range(count)
+        }
+        self.inbox = _ExportQuery(list(self.items.values()))
+        self.fetch_sizes: list[int] = []
+
+    def fetch(self, ids: list[tuple[str, str]], folder: object, only_fields: list[str]) -> list[object]:
+        self.fetch_sizes.append(len(ids))
+        return [self.items.get(item_id, LookupError(item_id)) for item_id, _ in ids]
+
+
+def test_service_export_streams_detail_records(tmp_path) -> None:
+    settings = Settings(
+        server="mail.example.local",
+        email="user@example.local",
+        username="EXAMPLE\\user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    account = _ExportAccount(250)
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+    output = tmp_path / "export.ndjson.gz"
+
+    result = service.export_messages(str(output), batch_size=40, workers=2, preview=10)
+
+    rows = _read(output)
+    assert result.items == 250
+    assert [row["id"] for row in rows] == [f"m{index}" for index in range(250)]
+    assert rows[0]["body_preview"] == "xxxxxxx..."
+    assert max(account.fetch_sizes) == 40
+
+
+def test_service_export_refuses_to_resume_another_folder_or_window(tmp_path) -> None:
+    settings = Settings(
+        server="mail.example.local",
+        email="user@example.local",
+        username="EXAMPLE\\user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    account = _ExportAccount(30)
+    account.sent = _ExportQuery(list(account.items.values()))
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+    output = tmp_path / "export.ndjson.gz"
+    service.export_messages(str(output), batch_size=10, workers=1)
+    exported = output.read_bytes()
+
+    with pytest.raises(ValueError, match="export of folder 'inbox' with days=None"):
+        service.export_messages(str(output), folder="sent", batch_size=10, workers=1)
+    with pytest.raises(ValueError, match="not folder 'inbox' with days=7"):
+        service.export_messages(str(output), days=7, batch_size=10, workers=1)
+
+    assert output.read_bytes() == exported
+    checkpoint = ExportCheckpoint.load(checkpoint_path(str(output)))
+    assert checkpoint is not None and (checkpoint.folder, checkpoint.days, checkpoint.items) == ("inbox", None, 30)
+
+
+def test_service_export_rejects_unknown_folder(tmp_path) -> None:
+    settings = Settings(server="mail.example.local", email="user@example.local", username="u", password="p")
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: _ExportAccount(1))
+
+    with pytest.raises(ValueError, match="export folder must be one of"):
+        service.export_messages(str(tmp_path / "out.gz"), folder="drafts")
@@ -6,7 +6,7 @@ from exchange_ews_readonly.guards import ALLOWED_ACTIONS, assert_read_only, ensu
 
 @pytest.mark.parametrize(
     "action",
-    ["health", "list", "get", "search"],
+    ["health", "list", "get", "search", "conversations", "stats", "watch", "calendar", "export"],
 )
 def test_allowed_actions_are_whitelisted(action: str) -> None:
     assert action in ALLOWED_ACTIONS
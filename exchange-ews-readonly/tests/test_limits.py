@@ -2,7 +2,12 @@ import pytest
 
 from exchange_ews_readonly.config import Limits
 from exchange_ews_readonly.errors import ConfigError
-from exchange_ews_readonly.guards import clamp_list_limit, clamp_preview_chars, clamp_search_days
+from exchange_ews_readonly.guards import (
+    clamp_conversation_limit,
+    clamp_list_limit,
+    clamp_preview_chars,
+    clamp_search_days,
+)
 
 
 def test_default_limits_are_valid() -> None:
@@ -33,6 +38,12 @@ def test_preview_defaults_and_caps() -> None:
     assert clamp_preview_chars(5000) == 1000
 
 
+def test_conversation_limit_defaults_and_caps() -> None:
+    assert clamp_conversation_limit(None) == 5
+    assert clamp_conversation_limit(3) == 3
+    assert clamp_conversation_limit(100) == 20
+
+
 @pytest.mark.parametrize("value", [0, -1])
 def test_non_positive_values_rejected(value: int) -> None:
     with pytest.raises(ValueError, match="must be > 0"):
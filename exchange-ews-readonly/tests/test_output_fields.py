@@ -0,0 +1,86 @@
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.guards import select_summary_fields
+from exchange_ews_readonly.handles import HandleMap
+from exchange_ews_readonly.models import SUMMARY_OUTPUT_FIELDS
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+
+
+def _service(mailbox: SimulatedMailbox) -> EwsReadonlyService:
+    settings = Settings(
+        server="sim.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    return EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+
+
+def test_field_selection_is_validated_and_ordered() -> None:
+    assert select_summary_fields(None) == SUMMARY_OUTPUT_FIELDS
+    assert select_summary_fields([" Subject", "id"]) == ("id", "subject")
+    with pytest.raises(ValueError, match="unknown fields: body"):
+        select_summary_fields(["id", "body"])
+    with pytest.raises(ValueError, match="at least one field"):
+        select_summary_fields([" "])
+
+
+def test_list_without_preview_skips_the_body_fetch() -> None:
+    mailbox = SimulatedMailbox(items=200, seed=1)
+    service = _service(mailbox)
+    full = service.list_messages(limit=20)
+    mailbox.stats.reset()
+
+    narrow = service.list_messages(limit=20, fields=["id", "subject", "sender"])
+
+    assert "GetItem" not in mailbox.stats.snapshot()
+    assert [item.id for item in narrow] == [item.id for item in full]
+    assert narrow[0].subject == full[0].subject and narrow[0].preview == ""
+    assert list(narrow[0].to_dict(fields=("id", "subject"))) == ["id", "subject"]
+
+
+def test_search_fetches_only_what_output_and_query_need() -> None:
+    mailbox = SimulatedMailbox(items=500, seed=2)
+    service = _service(mailbox)
+    expected = service.search_messages("subject:invoice", days=30, limit=5)
+    mailbox.stats.reset()
+
+    found = service.search_messages("subject:invoice", days=30, limit=5, fields=["id"])
+    assert [item.id for item in found] == [item.id for item in expected]
+    assert "GetItem" not in mailbox.stats.snapshot()
+
+    # A body term still needs bodies, whatever the output shows.
+    service.search_messages("body:invoice", days=30, limit=5, fields=["id"])
+    assert mailbox.stats.snapshot()["GetItem"]["round_trips"] >= 1
+
+
+def test_handles_are_stable_and_resolve_across_processes(tmp_path) -> None:
+    path = str(tmp_path / "handles.json")
+    long_id = "AAMkADk" + "x" * 140 + "AAA="
+    writer = HandleMap(path)
+    handle = writer.shorten(long_id)
+    writer.save()
+
+    assert len(handle) == 8 and handle == HandleMap(path).shorten(long_id)
+    assert HandleMap(path).resolve(handle) == long_id
+    assert HandleMap(path).resolve(long_id) == long_id
+    assert HandleMap(path).resolve("unknown1") == "unknown1"
+
+
+def test_handle_map_merges_concurrent_writers_and_caps_entries(tmp_path) -> None:
+    path = str(tmp_path / "handles.json")
+    first, second = HandleMap(path, capacity=3), HandleMap(path, capacity=3)
+    a = first.shorten("id-a")
+    b = second.shorten("id-b")
+    first.save()
+    second.save()
+    assert HandleMap(path).resolve(a) == "id-a" and HandleMap(path).resolve(b) == "id-b"
+
+    third = HandleMap(path, capacity=3)
+    for item_id in ("id-c", "id-d"):
+        third.shorten(item_id)
+    third.save()
+    assert HandleMap(path).resolve(a) == a
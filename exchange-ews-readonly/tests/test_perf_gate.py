@@ -0,0 +1,91 @@
+import os
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from exchange_ews_readonly.loadtest import (
+    LoadConfig,
+    LoadReport,
+    OperationReport,
+    Tolerances,
+    compare_to_baseline,
+    load_baseline,
+    median_report,
+    run_load,
+)
+
+BASELINE = Path(__file__).resolve().parents[1] / "benchmarks" / "perf_baseline.json"
+
+
+def _operation(**overrides: float) -> OperationReport:
+    values = {
+        "requests": 100,
+        "errors": 0,
+        "seconds": 1.0,
+        "throughput_per_sec": 100.0,
+        "p50_ms": 10.0,
+        "p95_ms": 20.0,
+        "p99_ms": 30.0,
+        "round_trips_per_op": 2.0,
+        "bytes_per_op": 1000.0,
+    }
+    values.update(overrides)
+    return OperationReport(**values)  # type: ignore[arg-type]
+
+
+def _report(operation: OperationReport, rss_growth_kb: int = 100) -> LoadReport:
+    return LoadReport(config=LoadConfig(), operations={"search": operation}, peak_rss_kb=50_000, rss_growth_kb=rss_growth_kb)
+
+
+def test_compare_flags_each_kind_of_regression() -> None:
+    baseline = _report(_operation()).to_dict()
+
+    assert compare_to_baseline(_report(_operation(p50_ms=20.0)), baseline) == []
+    problems = compare_to_baseline(
+        _report(_operation(round_trips_per_op=3.0, p95_ms=80.0, throughput_per_sec=10.0, errors=2), rss_growth_kb=10**6),
+        baseline,
+    )
+
+    assert any("round_trips_per_op 3.0 > 2.000" in line for line in problems)
+    assert any("p95_ms" in line for line in problems)
+    assert any("throughput_per_sec" in line for line in problems)
+    assert any("2 failed requests" in line for line in problems)
+    assert any(line.startswith("rss_growth_kb") for line in problems)
+    counts_only = compare_to_baseline(_report(_operation(p95_ms=80.0)), baseline, Tolerances(timings=False))
+    assert counts_only == []
+
+
+def test_median_report_takes_per_metric_median() -> None:
+    reports = [_report(_operation(p50_ms=value)) for value in (5.0, 50.0, 10.0)]
+
+    assert median_report(reports).operations["search"].p50_ms == 10.0
+
+
+# Default "counts": timing baselines come from one machine, so only the deterministic
+# counters gate a plain ``pytest -q``. Timing checks are opt-in with "full".
+PERF_GATE = os.getenv("EXCHANGE_EWS_PERF_GATE", "counts")
+
+
+@pytest.mark.skipif(PERF_GATE == "off", reason="perf gate disabled")
+def test_load_run_stays_within_committed_baseline() -> None:
+    """
+    Fails when a change adds round-trips or bytes per operation, or with
+    EXCHANGE_EWS_PERF_GATE=full, clearly slows it down.
+
+    The default ``counts`` checks only the deterministic counters; ``off``
+    skips the gate. Refresh the baseline with
+    ``python benchmarks/bench_load.py --runs 5 --write-baseline`` after an intended change.
+    """
+    baseline = load_baseline(str(BASELINE))
+    tolerances = Tolerances(**baseline["tolerances"])
+    if PERF_GATE != "full":
+        tolerances = replace(tolerances, timings=False)
+    config = LoadConfig(**baseline["config"])
+
+    regressions = compare_to_baseline(run_load(config), baseline, tolerances)
+    if regressions:
+        # Timing noise rarely repeats; counter regressions always do.
+        regressions = compare_to_baseline(run_load(config), baseline, tolerances)
+
+    assert regressions == []
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.deadline import deadline_scope
+from exchange_ews_readonly.errors import DeadlineExceededError
+from exchange_ews_readonly.pool import AccountPool
+from exchange_ews_readonly.service import EwsReadonlyService
+
+
+class _Inbox:
+    def all(self) -> "_Inbox":
+        return self
+
+    def order_by(self, _field: str) -> "_Inbox":
+        return self
+
+    def __getitem__(self, slc: slice) -> list[object]:
+        time.sleep(0.005)
+        return []
+
+
+class _Account:
+    def __init__(self) -> None:
+        self.inbox = _Inbox()
+
+
+def _settings(pool_size: int) -> Settings:
+    return Settings(
+        server=f"pool{pool_size}.example.local",
+        email="user@example.local",
+        username="user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000, mailbox_max_concurrency=64),
+        account_pool_size=pool_size,
+    )
+
+
+def _counting_factory() -> tuple[list[int], object]:
+    built: list[int] = []
+    lock = threading.Lock()
+
+    def _factory(_settings: Settings) -> _Account:
+        time.sleep(0.01)
+        with lock:
+            built.append(1)
+        return _Account()
+
+    return built, _factory
+
+
+def _hammer(service: EwsReadonlyService, workers: int = 32) -> None:
+    barrier = threading.Barrier(workers)
+
+    def _work(index: int) -> None:
+        barrier.wait()
+        service.list_messages(limit=index % 10 + 1)
+
+    threads = [threading.Thread(target=_work, args=(index,)) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_cold_shared_service_builds_account_once() -> None:
+    built, factory = _counting_factory()
+    service = EwsReadonlyService(settings=_settings(1), account_factory=factory)
+
+    _hammer(service)
+
+    assert len(built) == 1
+
+
+def test_pool_never_builds_more_than_size() -> None:
+    built, factory = _counting_factory()
+    service = EwsReadonlyService(settings=_settings(4), account_factory=factory)
+
+    _hammer(service)
+
+    stats = service.pool_stats()
+    assert len(built) <= 4
+    assert stats["built"] == len(built)
+    assert stats["leased"] == 0
+    assert stats["idle"] == len(built)
+
+
+def test_warm_builds_every_account_up_front() -> None:
+    built, factory = _counting_factory()
+    pool = AccountPool(_settings(3), factory, size=3)
+
+    pool.warm()
+    pool.warm()
+
+    assert len(built) == 3
+    with pool.lease():
+        assert pool.stats()["leased"] == 1
+
+
+def test_failed_build_releases_reserved_slot() -> None:
+    attempts: list[int] = []
+
+    def _flaky(_settings: Settings) -> _Account:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("auth failed")
+        return _Account()
+
+    pool = AccountPool(_settings(1), _flaky, size=1)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+    with pool.lease() as account:
+        assert isinstance(account, _Account)
+
+
+def test_checkout_gives_up_at_the_deadline() -> None:
+    _built, factory = _counting_factory()
+    pool = AccountPool(_settings(1), factory, size=1)
+
+    with pool.lease():
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            with deadline_scope(0.05), pool.lease():
+                pass
+        assert time.monotonic() - started < 1.0
+
+    with pool.lease():
+        assert pool.stats()["leased"] == 1
@@ -0,0 +1,71 @@
+import pytest
+
+from exchange_ews_readonly.query import QueryMatcher
+
+
+def _match(query: str, subject: str = "", sender: str = "", body: str = "", allow_regex: bool = False) -> bool:
+    return QueryMatcher(query, allow_regex=allow_regex).matches(subject=subject, sender=sender, body=lambda: body)
+
+
+def test_empty_query_matches_everything() -> None:
+    assert QueryMatcher("  ").matches_everything
+    assert _match("", subject="anything")
+
+
+def test_single_term_is_case_insensitive_substring() -> None:
+    assert _match("INVOICE", subject="Your invoice 4821")
+    assert not _match("invoice", subject="Reminder")
+
+
+def test_terms_are_anded_and_or_separates_alternatives() -> None:
+    assert _match("invoice 4821", subject="Invoice", body="ref 4821")
+    assert not _match("invoice 4821", subject="Invoice")
+    assert _match("invoice OR reminder", subject="Reminder")
+
+
+def test_negation_and_phrase() -> None:
+    assert _match("invoice -overdue", subject="Invoice")
+    assert not _match("invoice NOT overdue", subject="Invoice", body="overdue")
+    assert _match('"invoice 4821"', body="see invoice 4821")
+    assert not _match('"invoice 4821"', body="invoice 9 and 4821")
+    assert _match("-spam", subject="hello")
+
+
+def test_field_scopes() -> None:
+    assert _match("from:ap@example", sender="ap@example.local", subject="x")
+    assert not _match("from:ap@example", subject="ap@example")
+    assert _match("subject:invoice", subject="Invoice")
+    assert not _match("subject:invoice", body="invoice")
+
+
+def test_unknown_prefix_is_plain_text() -> None:
+    assert _match("re:", subject="RE: hello")
+    assert _match("http://x.example", body="go to http://x.example now")
+
+
+def test_overlapping_terms_are_all_found() -> None:
+    assert _match("inv invoice voice", body="invoice")
+    assert not _match("inv invoice voices", body="invoice")
+
+
+def test_regex_terms_require_opt_in() -> None:
+    assert _match(r"/inv\d+/", body="INV4821", allow_regex=True)
+    assert not _match(r"/inv\d+/", body="INV4821")
+    with pytest.raises(ValueError, match="invalid search regex"):
+        QueryMatcher("/(/", allow_regex=True)
+
+
+def test_body_is_not_read_when_subject_decides() -> None:
+    calls: list[int] = []
+
+    def _body() -> str:
+        calls.append(1)
+        return "invoice"
+
+    assert QueryMatcher("invoice").matches(subject="invoice", sender="", body=_body)
+    assert calls == []
+
+
+def test_equivalent_queries_share_key() -> None:
+    assert QueryMatcher("Invoice  4821").key == QueryMatcher("4821 invoice").key
+    assert QueryMatcher("invoice").key != QueryMatcher("-invoice").key
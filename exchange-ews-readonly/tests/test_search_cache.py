@@ -0,0 +1,156 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.search_cache import CachedSearch, DiskSearchCache, MemorySearchCache
+from exchange_ews_readonly.service import EwsReadonlyService
+
+
+def _entry(ids: list[str], saved_at: float = 0.0) -> CachedSearch:
+    return CachedSearch(ids=ids, newest_received="2026-02-16T00:00:00+00:00", saved_at=saved_at)
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemorySearchCache(capacity=2, ttl_seconds=60, clock=lambda: 0.0)
+    cache.put("a", _entry(["1"]))
+    cache.put("b", _entry(["2"]))
+    assert cache.get("a") is not None
+    cache.put("c", _entry(["3"]))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_entries_expire_after_ttl() -> None:
+    now = [0.0]
+    cache = MemorySearchCache(capacity=4, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", _entry(["1"], saved_at=0.0))
+    now[0] = 11.0
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_cache_is_shared_between_instances_and_tolerates_garbage(tmp_path) -> None:
+    path = tmp_path / "search.json"
+    DiskSearchCache(str(path), capacity=2, ttl_seconds=60, clock=lambda: 0.0).put("a", _entry(["1", "2"]))
+
+    reopened = DiskSearchCache(str(path), capacity=2, ttl_seconds=60, clock=lambda: 0.0)
+    assert reopened.get("a") == _entry(["1", "2"])
+
+    path.write_text("{not json", encoding="utf-8")
+    assert reopened.get("a") is None
+
+
+def test_disk_cache_writers_do_not_lose_each_others_entries(tmp_path) -> None:
+    path = str(tmp_path / "search.json")
+
+    def writer(worker: int) -> None:
+        # A separate instance per writer stands in for a separate CLI process.
+        cache = DiskSearchCache(path, capacity=1000, ttl_seconds=60, clock=lambda: 0.0)
+        for n in range(25):
+            cache.put(f"w{worker}-{n}", _entry([str(n)]))
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert DiskSearchCache(path, capacity=1000, ttl_seconds=60).stats()["entries"] == 100
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".search-")]
+
+
+_NOW = datetime.now(timezone.utc)
+
+
+def _item(item_id: str, minutes_ago: int, subject: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=item_id,
+        subject=subject,
+        sender=SimpleNamespace(email_address="billing@example.local"),
+        datetime_received=_NOW - timedelta(minutes=minutes_ago),
+        text_body=f"body of {item_id}",
+    )
+
+
+class _Query:
+    def __init__(self, inbox: "_Inbox", items: list[SimpleNamespace]) -> None:
+        self._inbox = inbox
+        self._items = items
+
+    def order_by(self, _field: str) -> "_Query":
+        return _Query(self._inbox, sorted(self._items, key=lambda item: item.datetime_received, reverse=True))
+
+    def __getitem__(self, page: slice) -> list[SimpleNamespace]:
+        self._inbox.finds += 1
+        selected = self._items[page]
+        self._inbox.items_returned += len(selected)
+        return selected
+
+
+class _Inbox:
+    def __init__(self, items: list[SimpleNamespace]) -> None:
+        self.items = items
+        self.finds = 0
+        self.items_returned = 0
+
+    def filter(self, datetime_received__gte: datetime | None = None, datetime_received__gt: datetime | None = None):
+        if datetime_received__gt is not None:
+            return _Query(self, [item for item in self.items if item.datetime_received > datetime_received__gt])
+        return _Query(self, [item for item in self.items if item.datetime_received >= datetime_received__gte])
+
+
+class _Account:
+    def __init__(self, items: list[SimpleNamespace]) -> None:
+        self.inbox = _Inbox(items)
+        self.fetched: list[list[str]] = []
+
+    def fetch(self, ids: list[tuple[str, None]], folder: object, only_fields: list[str]) -> list[object]:
+        self.fetched.append([item_id for item_id, _ in ids])
+        by_id = {item.id: item for item in self.inbox.items}
+        return [by_id.get(item_id, LookupError(item_id)) for item_id, _ in ids]
+
+
+def _service(account: _Account) -> EwsReadonlyService:
+    settings = Settings(
+        server="mail.example.local",
+        email="user@example.local",
+        username="EXAMPLE\\user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+        search_cache="memory",
+    )
+    return EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+
+def test_repeated_search_fetches_only_the_delta() -> None:
+    account = _Account([_item(f"m{n}", 60 + n, "Invoice" if n % 2 else "Lunch") for n in range(40)])
+    service = _service(account)
+
+    first = service.search_messages("invoice", limit=5)
+    scanned = account.inbox.items_returned
+    account.inbox.items.append(_item("new-invoice", 1, "Invoice 42"))
+    account.inbox.items.append(_item("new-lunch", 2, "Lunch"))
+    second = service.search_messages("invoice", limit=5)
+
+    assert [summary.id for summary in second] == ["new-invoice"] + [summary.id for summary in first[:4]]
+    assert account.inbox.items_returned - scanned == 2
+    assert account.fetched == [[summary.id for summary in first[:4]]]
+    stats = service.search_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["delta_items"] == 2
+
+
+def test_deleted_cached_result_forces_full_rescan() -> None:
+    account = _Account([_item(f"m{n}", 60 + n, "Invoice") for n in range(10)])
+    service = _service(account)
+
+    first = service.search_messages("invoice", limit=3)
+    account.inbox.items = [item for item in account.inbox.items if item.id != first[1].id]
+    second = service.search_messages("invoice", limit=3)
+
+    assert [summary.id for summary in second] == ["m0", "m2", "m3"]
+    assert service.search_cache_stats()["hits"] == 0
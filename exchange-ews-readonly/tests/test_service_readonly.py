@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 
 import pytest
 
-from exchange_ews_readonly.config import Limits, Settings
+from exchange_ews_readonly.config import Limits, Settings, Throttling
 from exchange_ews_readonly.errors import MessageNotFoundError, ReadOnlyViolationError
 from exchange_ews_readonly.service import EwsReadonlyService
 
@@ -81,6 +81,7 @@ def _settings() -> Settings:
         username="EXAMPLE\\user",
         password="secret",
         limits=Limits(),
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
     )
 
 
@@ -198,3 +199,124 @@ def test_service_blocks_unknown_action_via_guard(monkeypatch: pytest.MonkeyPatch
 
     with pytest.raises(ReadOnlyViolationError):
         service.health()
+
+
+class _CountingInbox(_FakeInbox):
+    def __init__(self, items: list[_FakeItem]) -> None:
+        super().__init__(items)
+        self.total_count = len(items)
+        self.unread_count = 1
+        self.refreshes = 0
+        self.item_reads = 0
+
+    def refresh(self) -> "_CountingInbox":
+        self.refreshes += 1
+        return self
+
+    def __getitem__(self, slc: slice) -> list[_FakeItem]:
+        self.item_reads += 1
+        return super().__getitem__(slc)
+
+
+def test_health_light_mode_uses_folder_counts_only() -> None:
+    account = _FakeAccount()
+    account.inbox = _CountingInbox(account.inbox._items)
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: account)
+
+    result = service.health()
+
+    assert result.mode == "light"
+    assert result.total_count == 2
+    assert result.unread_count == 1
+    assert account.inbox.refreshes == 1
+    assert account.inbox.item_reads == 0
+    assert {"account_ms", "first_response_ms", "total_ms"} <= set(result.timings_ms)
+
+
+def test_health_deep_mode_fetches_one_item() -> None:
+    account = _FakeAccount()
+    account.inbox = _CountingInbox(account.inbox._items)
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: account)
+
+    result = service.health(deep=True)
+
+    assert result.mode == "deep"
+    assert result.inbox_accessible is True
+    assert account.inbox.item_reads == 1
+    assert "item_fetch_ms" in result.timings_ms
+
+
+def test_health_connect_timings_come_from_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "exchange_ews_readonly.service.measure_connect",
+        lambda host, timeout, verify_tls: {"dns_ms": 1.0, "tcp_ms": 2.0, "tls_ms": 3.0},
+    )
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: _FakeAccount())
+
+    result = service.health(connect_timings=True)
+
+    assert result.timings_ms["tls_ms"] == 3.0
+
+
+class _ConversationId:
+    def __init__(self, value: str) -> None:
+        self.id = value
+
+
+class _ThreadInbox(_FakeInbox):
+    def __init__(self, items: list[_FakeItem]) -> None:
+        super().__init__(items)
+        self.only_fields: tuple[str, ...] = ()
+
+    def only(self, *fields: str) -> "_ThreadInbox":
+        self.only_fields = fields
+        return self
+
+
+class _ThreadAccount:
+    def __init__(self) -> None:
+        items = []
+        for item_id, conversation, subject in [
+            ("m4", "c1", "RE: Budget"),
+            ("m3", "c2", "Offsite"),
+            ("m2", "c1", "Budget"),
+            ("m1", "c3", "Old thread"),
+        ]:
+            item = _FakeItem(item_id, subject, "sender@example.local", f"body of {item_id}")
+            item.conversation_id = _ConversationId(conversation)
+            if conversation == "c1":
+                item.conversation_topic = "Budget planning"
+            items.append(item)
+        self.inbox = _ThreadInbox(items)
+        self.fetch_calls: list[list[str]] = []
+
+    def fetch(self, ids: list[_FakeItem], folder: object, only_fields: list[str]) -> list[_FakeItem]:
+        self.fetch_calls.append([item.id for item in ids])
+        return list(ids)
+
+
+def test_list_conversations_groups_threads_with_two_bulk_calls() -> None:
+    account = _ThreadAccount()
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: account)
+
+    threads = service.list_conversations(limit=2, preview=7)
+
+    assert [thread.conversation_id for thread in threads] == ["c1", "c2"]
+    assert threads[0].topic == "Budget planning"
+    assert threads[1].topic == "Offsite"
+    assert threads[0].message_count == 2
+    assert [message.id for message in threads[0].messages] == ["m4", "m2"]
+    assert threads[0].messages[0].preview == "body..."
+    assert "text_body" not in account.inbox.only_fields
+    assert "conversation_topic" in account.inbox.only_fields
+    assert account.fetch_calls == [["m4", "m2", "m3"]]
+
+
+def test_list_conversations_calls_read_only_guard_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    called: list[str] = []
+    monkeypatch.setattr("exchange_ews_readonly.service.assert_read_only", called.append)
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: _ThreadAccount())
+
+    service.list_conversations()
+
+    assert called == ["conversations"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import DoesNotExist, SimulatedMailbox
+
+_NOW = datetime(2026, 2, 16, tzinfo=timezone.utc)
+
+
+def _mailbox(items: int = 2000) -> SimulatedMailbox:
+    return SimulatedMailbox(items=items, days=20, seed=7, now=_NOW)
+
+
+def test_generation_is_deterministic_and_sorted() -> None:
+    first = [item.subject for item in _mailbox().inbox.all()[:50]]
+    second = [item.subject for item in _mailbox().inbox.all()[:50]]
+    received = [item.datetime_received for item in _mailbox().inbox.all()[:200]]
+
+    assert first == second
+    assert received == sorted(received)
+    assert all(_NOW - timedelta(days=20) <= moment <= _NOW for moment in received)
+
+
+def test_filter_order_and_slice_follow_queryset_semantics() -> None:
+    inbox = _mailbox().inbox
+    since = _NOW - timedelta(days=5)
+
+    newest = inbox.filter(datetime_received__gte=since).order_by("-datetime_received")[:30]
+
+    assert len(newest) == 30
+    assert all(item.datetime_received >= since for item in newest)
+    assert [item.datetime_received for item in newest] == sorted(
+        (item.datetime_received for item in newest), reverse=True
+    )
+    assert newest[0].datetime_received == max(item.datetime_received for item in inbox.all())
+
+
+def test_projection_counts_find_and_get_round_trips() -> None:
+    mailbox = _mailbox()
+    inbox = mailbox.inbox
+    mailbox.stats.reset()
+
+    headers = inbox.all().only("id", "subject")[:250]
+    assert headers[0].text_body is None
+    assert mailbox.stats.snapshot()["FindItem"]["round_trips"] == 3
+    assert "GetItem" not in mailbox.stats.snapshot()
+
+    mailbox.stats.reset()
+    bodies = inbox.all().only("subject", "text_body")[:250]
+    assert all(item.text_body for item in bodies)
+    assert mailbox.stats.snapshot()["GetItem"]["round_trips"] == 3
+    assert mailbox.stats.bytes > sum(len(item.text_body) for item in bodies)
+
+
+def test_values_list_streams_in_pages() -> None:
+    mailbox = _mailbox()
+    query = mailbox.inbox.all().values_list("sender", "is_read")
+    query.page_size = 500
+    mailbox.stats.reset()
+
+    rows = list(query)
+
+    assert len(rows) == 2000
+    assert mailbox.stats.snapshot()["FindItem"]["round_trips"] == 4
+
+
+def test_fetch_and_get_resolve_ids() -> None:
+    mailbox = _mailbox()
+    ids = [item.id for item in mailbox.inbox.all()[:3]]
+
+    fetched = list(mailbox.fetch(ids=[(ids[0], "ck"), ids[1], "SIM-0-9999999"], only_fields=["subject"]))
+
+    assert fetched[0].id == ids[0] and fetched[1].id == ids[1]
+    assert isinstance(fetched[2], DoesNotExist)
+    assert mailbox.inbox.get(id=ids[2]).id == ids[2]
+    with pytest.raises(DoesNotExist):
+        mailbox.inbox.get(id="SIM-0-9999999")
+
+
+def test_service_runs_against_simulator() -> None:
+    mailbox = SimulatedMailbox(items=5000, days=20, seed=7)
+    settings = Settings(
+        server="sim.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+
+    listed = service.list_messages(limit=5)
+    found = service.search_messages("invoice", days=30, limit=5)
+    detail = service.get_message(listed[0].id)
+
+    assert [item.datetime_received for item in listed] == sorted((item.datetime_received for item in listed), reverse=True)
+    assert found and all("invoice" in (item.subject + item.preview).lower() for item in found)
+    assert detail.to_recipients == ["user@example.local"]
+    assert mailbox.stats.round_trips > 0
@@ -0,0 +1,158 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.stats import StatsAggregator, TopCounter
+
+
+def test_top_counter_is_exact_below_capacity() -> None:
+    counter = TopCounter(capacity=3)
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        counter.add(key)
+
+    assert counter.top(2) == [("a", 3), ("b", 2)]
+    assert counter.exact
+
+
+def test_top_counter_keeps_heavy_hitters_with_bounded_slots() -> None:
+    counter = TopCounter(capacity=5)
+    for index in range(10_000):
+        counter.add("heavy" if index % 3 == 0 else f"noise{index}")
+
+    assert counter.top(1)[0][0] == "heavy"
+    assert len(counter.top(100)) == 5
+    assert not counter.exact
+
+
+def test_aggregator_counts_per_folder_day_and_unread() -> None:
+    aggregator = StatsAggregator()
+    day1 = datetime(2026, 2, 16, 9, tzinfo=timezone.utc)
+    day2 = datetime(2026, 2, 17, 9, tzinfo=timezone.utc)
+
+    aggregator.add("inbox", "a@example.local", day1, False)
+    aggregator.add("inbox", "a@example.local", day2, True)
+    aggregator.add("sent", "me@example.local", day2, True)
+
+    assert aggregator.scanned == 3
+    assert aggregator.folders["inbox"] == {"window_count": 2, "window_unread": 1}
+    assert aggregator.per_day["2026-02-17"] == {"count": 2, "unread": 0}
+    assert aggregator.top_senders(1) == [{"sender": "a@example.local", "count": 2, "unread": 1}]
+
+
+class _Mailbox:
+    def __init__(self, address: str) -> None:
+        self.email_address = address
+
+
+class _StatsQuery:
+    def __init__(self, rows: list[tuple[object, datetime, bool]]) -> None:
+        self._rows = rows
+        self.page_size: int | None = None
+        self.fields: tuple[str, ...] = ()
+        self.order: str = ""
+        self.pages: list[slice] = []
+
+    def filter(self, **_kwargs: object) -> "_StatsQuery":
+        return self
+
+    def order_by(self, field: str) -> "_StatsQuery":
+        self.order = field
+        return self
+
+    def values_list(self, *fields: str) -> "_StatsQuery":
+        self.fields = fields
+        return self
+
+    def __getitem__(self, window: slice) -> list[tuple[object, datetime, bool]]:
+        self.pages.append(window)
+        return self._rows[window]
+
+
+class _StatsFolder(_StatsQuery):
+    total_count = 1234
+    unread_count = 5
+
+
+class _StatsAccount:
+    def __init__(self) -> None:
+        received = datetime(2026, 2, 16, tzinfo=timezone.utc)
+        self.inbox = _StatsFolder([(_Mailbox("ap@example.local"), received, False)] * 3)
+        self.sent = _StatsFolder([(_Mailbox("me@example.local"), received, True)])
+
+
+def _settings() -> Settings:
+    return Settings(
+        server="stats.example.local",
+        email="user@example.local",
+        username="user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+
+
+def test_mailbox_stats_streams_projection_per_folder() -> None:
+    account = _StatsAccount()
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: account)
+
+    stats = service.mailbox_stats(days=7, folders=["Inbox", "sent", "inbox"], top=1)
+
+    assert list(stats.folders) == ["inbox", "sent"]
+    assert stats.folders["inbox"] == {"total_count": 1234, "unread_count": 5, "window_count": 3, "window_unread": 3}
+    assert stats.scanned == 4
+    assert stats.top_senders == [{"sender": "ap@example.local", "count": 3, "unread": 3}]
+    assert account.inbox.fields == ("sender", "datetime_received", "is_read")
+    assert account.inbox.page_size == 1000
+    assert account.inbox.order == "datetime_received"
+
+
+class ErrorInvalidServerVersion(Exception):
+    pass
+
+
+def test_mailbox_stats_takes_a_slot_per_page_and_never_double_counts_a_retried_page() -> None:
+    received = datetime(2026, 2, 16, tzinfo=timezone.utc)
+    rows = [(_Mailbox(f"s{index % 7}@example.local"), received, True) for index in range(2500)]
+    failed: list[slice] = []
+
+    class _FlakyFolder(_StatsFolder):
+        def __getitem__(self, window: slice) -> list[tuple[object, datetime, bool]]:
+            if window.start == 1000 and not failed:
+                # Server rejects the cached version halfway through the scan.
+                failed.append(window)
+                raise ErrorInvalidServerVersion("stale")
+            return super().__getitem__(window)
+
+    account = _StatsAccount()
+    account.inbox = _FlakyFolder(rows)
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: account)
+    calls_before = service.throttle_stats()["mailbox"]["calls"]
+
+    stats = service.mailbox_stats(days=7, folders=["inbox"], top=1)
+
+    assert stats.scanned == 2500
+    assert stats.folders["inbox"]["window_count"] == 2500
+    assert [(page.start, page.stop) for page in account.inbox.pages] == [(0, 1000), (1000, 2000), (2000, 3000)]
+    # One GetFolder, three pages and the retried page each passed the limiter on their own.
+    assert service.throttle_stats()["mailbox"]["calls"] - calls_before == 5
+
+
+def test_top_counter_evicts_the_least_frequent_key() -> None:
+    counter = TopCounter(capacity=3)
+    for key in ["a", "a", "a", "b", "b", "c", "d"]:
+        counter.add(key)
+
+    assert counter.top(3) == [("a", 3), ("b", 2), ("d", 2)]
+    assert counter.get("c") == 0
+
+    for index in range(1000):
+        counter.add(f"tail{index}")
+    assert len(counter.top(10)) == 3
+    assert len(counter._heap) == 3
+
+
+def test_mailbox_stats_rejects_unknown_folder() -> None:
+    service = EwsReadonlyService(settings=_settings(), account_factory=lambda _: _StatsAccount())
+    with pytest.raises(ValueError, match="stats folder must be one of"):
+        service.mailbox_stats(folders=["drafts"])
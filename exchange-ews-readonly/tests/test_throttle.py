@@ -0,0 +1,214 @@
+import threading
+import time
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.deadline import deadline_scope
+from exchange_ews_readonly.errors import ConfigError, DeadlineExceededError
+from exchange_ews_readonly.throttle import (
+    ConnectionBudget,
+    RateLimiter,
+    is_throttling_error,
+    limiter_for,
+    requested_back_off,
+    tenant_usage,
+)
+
+
+class ErrorServerBusy(Exception):
+    def __init__(self, back_off: float | None = None) -> None:
+        super().__init__("server busy")
+        self.back_off = back_off
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock: _Clock, **overrides: object) -> RateLimiter:
+    options: dict[str, object] = {"rate_per_sec": 2.0, "burst": 2, "max_concurrency": 4, "min_rate_per_sec": 0.5}
+    options.update(overrides)
+    return RateLimiter(clock=clock, **options)  # type: ignore[arg-type]
+
+
+def test_bucket_allows_burst_then_waits_for_refill() -> None:
+    clock = _Clock()
+    limiter = _limiter(clock)
+
+    assert limiter._bucket.try_take() == 0.0
+    assert limiter._bucket.try_take() == 0.0
+    assert limiter._bucket.try_take() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert limiter._bucket.try_take() == 0.0
+
+
+def test_throttling_error_halves_rate_and_pauses() -> None:
+    clock = _Clock()
+    limiter = _limiter(clock)
+
+    with pytest.raises(ErrorServerBusy):
+        with limiter.slot():
+            raise ErrorServerBusy(back_off=3.0)
+
+    stats = limiter.stats()
+    assert stats["throttled"] == 1
+    assert stats["rate_per_sec"] == 1.0
+    assert limiter._bucket.try_take() == pytest.approx(3.0)
+
+
+def test_rate_never_drops_below_floor_and_recovers_on_success() -> None:
+    clock = _Clock()
+    limiter = _limiter(clock, burst=100)
+
+    for _ in range(5):
+        with pytest.raises(ErrorServerBusy):
+            with limiter.slot():
+                raise ErrorServerBusy(back_off=0.001)
+        clock.now += 3
+    assert limiter.stats()["rate_per_sec"] == 0.5
+
+    clock.now += 1000
+    for _ in range(30):
+        with limiter.slot():
+            pass
+    assert limiter.stats()["rate_per_sec"] == 2.0
+
+
+def test_non_throttling_errors_do_not_reduce_rate() -> None:
+    clock = _Clock()
+    limiter = _limiter(clock)
+
+    with pytest.raises(LookupError):
+        with limiter.slot():
+            raise LookupError("missing")
+
+    assert limiter.stats()["throttled"] == 0
+    assert limiter.stats()["rate_per_sec"] == 2.0
+
+
+def test_concurrency_is_capped() -> None:
+    limiter = RateLimiter(rate_per_sec=1000.0, burst=1000, max_concurrency=2, min_rate_per_sec=1.0)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def _work() -> None:
+        nonlocal active, peak
+        with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=_work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter.stats()["calls"] == 8
+
+
+def test_waits_give_up_at_the_deadline_without_blocking_the_queue() -> None:
+    limiter = RateLimiter(rate_per_sec=0.01, burst=2, max_concurrency=1, min_rate_per_sec=0.01)
+    budget = ConnectionBudget(max_concurrency=1)
+    holder_in = threading.Event()
+    release = threading.Event()
+
+    def _hold() -> None:
+        with limiter.slot(), budget.slot():
+            holder_in.set()
+            release.wait()
+
+    holder = threading.Thread(target=_hold)
+    holder.start()
+    holder_in.wait()
+
+    started = time.monotonic()
+    for slot in (limiter.slot, budget.slot):
+        with pytest.raises(DeadlineExceededError):
+            with deadline_scope(0.05), slot():
+                pass
+    assert time.monotonic() - started < 1.0
+    release.set()
+    holder.join()
+
+    # The abandoned tickets were skipped; the one remaining token is handed out at once.
+    with limiter.slot(), budget.slot():
+        pass
+    assert limiter.stats()["waiting"] == 0 and budget.stats()["waiting"] == 0
+
+    # Now the bucket is empty and refills in 100 s: the wait is cut at the deadline too.
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        with deadline_scope(0.05), limiter.slot():
+            pass
+    assert time.monotonic() - started < 1.0
+
+
+def test_cross_process_file_backend_shares_tokens(tmp_path) -> None:
+    lock_path = str(tmp_path / "shared")
+    first = RateLimiter(rate_per_sec=0.01, burst=2, max_concurrency=1, min_rate_per_sec=0.01, lock_path=lock_path)
+    second = RateLimiter(rate_per_sec=0.01, burst=2, max_concurrency=1, min_rate_per_sec=0.01, lock_path=lock_path)
+
+    assert first._bucket.try_take() == 0.0
+    assert second._bucket.try_take() == 0.0
+    assert first._bucket.try_take() > 0
+
+    slot = first._file_slots.try_acquire()
+    assert slot is not None
+    assert second._file_slots.try_acquire() is None
+    first._file_slots.release(slot)
+
+
+def test_limiter_for_shares_server_limiter_across_mailboxes() -> None:
+    first = limiter_for(Settings(server="shared.example.local", email="a@example.local", username="a", password="x"))
+    second = limiter_for(Settings(server="shared.example.local", email="b@example.local", username="b", password="x"))
+
+    assert first.server is second.server
+    assert first.mailbox is not second.mailbox
+
+
+def test_limiter_for_gives_a_differently_configured_service_its_own_limiters() -> None:
+    def settings(throttling: Throttling) -> Settings:
+        return Settings(
+            server="config.example.local",
+            email="a@example.local",
+            username="a",
+            password="x",
+            throttling=throttling,
+        )
+
+    default = limiter_for(settings(Throttling()))
+    same = limiter_for(settings(Throttling()))
+    faster = limiter_for(settings(Throttling(mailbox_rate_per_sec=50, mailbox_burst=50, server_rate_per_sec=100)))
+
+    assert same.mailbox is default.mailbox and same.server is default.server
+    assert faster.mailbox is not default.mailbox and faster.server is not default.server
+    assert faster.mailbox.stats()["rate_per_sec"] == 50
+    usage = tenant_usage()
+    assert "config.example.local|a@example.local" in usage
+    assert "config.example.local|a@example.local#2" in usage
+
+
+def test_throttling_error_detection_uses_exchangelib_names() -> None:
+    assert is_throttling_error(ErrorServerBusy())
+    assert not is_throttling_error(ValueError())
+    assert requested_back_off(ErrorServerBusy(back_off=7)) == 7.0
+    assert requested_back_off(ErrorServerBusy()) == 5.0
+
+
+def test_throttling_settings_validation() -> None:
+    with pytest.raises(ConfigError, match="mailbox burst must be > 0"):
+        Throttling(mailbox_burst=0)
+    with pytest.raises(ConfigError, match="min rate cannot exceed"):
+        Throttling(mailbox_rate_per_sec=0.1, min_rate_per_sec=0.2)
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox
+from exchange_ews_readonly.tracing import Tracer, disable_tracing, enable_tracing, span, tracing_enabled
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracing():
+    disable_tracing()
+    yield
+    disable_tracing()
+
+
+def test_disabled_tracing_returns_shared_noop_span() -> None:
+    assert not tracing_enabled()
+    assert span("a") is span("b", key=1)
+    with span("a") as current:
+        current.set("ignored", True)
+
+
+def test_spans_are_recorded_and_exported_as_chrome_trace(tmp_path) -> None:
+    tracer = enable_tracing()
+    with span("outer", command="list"):
+        with span("inner") as inner:
+            inner.set("items", 3)
+    with pytest.raises(RuntimeError):
+        with span("failing"):
+            raise RuntimeError("boom")
+
+    names = [record.name for record in tracer.spans]
+    assert names == ["inner", "outer", "failing"]
+    assert tracer.spans[0].attributes == {"items": 3}
+    assert tracer.spans[2].attributes == {"error": "RuntimeError"}
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(str(path))
+    events = __import__("json").loads(path.read_text())["traceEvents"]
+    outer = next(event for event in events if event["name"] == "outer")
+    inner = next(event for event in events if event["name"] == "inner")
+    assert outer["ph"] == "X" and outer["args"] == {"command": "list"}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_spans_are_mirrored_to_an_opentelemetry_style_tracer() -> None:
+    started: list[tuple[str, dict]] = []
+
+    class _OtelTracer:
+        @contextmanager
+        def start_as_current_span(self, name: str, attributes: dict | None = None):
+            started.append((name, dict(attributes or {})))
+            yield object()
+
+    finished = []
+    enable_tracing(Tracer(otel_tracer=_OtelTracer(), listeners=[finished.append]))
+    with span("ews:search", attempt=1):
+        pass
+
+    assert started == [("ews:search", {"attempt": 1})]
+    assert [record.name for record in finished] == ["ews:search"]
+
+
+def test_service_emits_account_call_and_conversion_spans() -> None:
+    mailbox = SimulatedMailbox(items=500, seed=3)
+    settings = Settings(
+        server="sim.example.local",
+        email="user@example.local",
+        username="user",
+        password="unused",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: mailbox)
+    tracer = enable_tracing()
+
+    service.list_messages(limit=4)
+    service.search_messages("invoice", days=30, limit=2)
+
+    summary = tracer.summary()
+    assert summary["build_account"]["count"] == 1
+    assert summary["ews:list"]["count"] == 1
+    assert summary["ews:search"]["count"] == 1
+    assert summary["search.match"]["count"] == 1
+    assert summary["to_summary"]["count"] >= 4
@@ -0,0 +1,209 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from exchangelib.util import to_xml
+from requests.adapters import HTTPAdapter
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.simulator import SimulatedMailbox, soap_response
+from exchange_ews_readonly.throttle import ConnectionBudget, CompositeLimiter, RateLimiter, tenant_usage
+from exchange_ews_readonly.transport import scope_transport, transport_stats
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.mounted: dict[str, object] = {}
+
+    def mount(self, prefix: str, adapter: object) -> None:
+        self.mounted[prefix] = adapter
+
+
+class _Adapter:
+    def __init__(self, **kwargs: object) -> None:
+        self.kwargs = kwargs
+
+
+class NoVerifyHTTPAdapter(_Adapter):
+    pass
+
+
+class _Protocol:
+    TIMEOUT = 120
+    CONNECTIONS_PER_SESSION = 1
+
+    def __init__(self) -> None:
+        self.service_endpoint = "https://mail.example.local/EWS/Exchange.asmx"
+        self.session_pool_size = 0
+
+    @classmethod
+    def raw_session(cls, prefix: str) -> _Session:
+        session = _Session()
+        session.mount(prefix, "class-default")
+        return session
+
+
+def _settings(email: str = "user@example.local", **overrides: object) -> Settings:
+    options: dict[str, object] = {
+        "server": "sim.example.local",
+        "email": email,
+        "username": "user",
+        "password": "unused",
+        "throttling": Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    }
+    options.update(overrides)
+    return Settings(**options)  # type: ignore[arg-type]
+
+
+def test_scope_transport_sets_instance_options_only() -> None:
+    strict, lax = _Protocol(), _Protocol()
+
+    scope_transport(strict, _settings(timeout_seconds=5), _Adapter)
+    scope_transport(lax, _settings(timeout_seconds=60, verify_tls=False), NoVerifyHTTPAdapter)
+
+    assert _Protocol.TIMEOUT == 120 and "raw_session" not in vars(_Protocol())
+    assert (strict.TIMEOUT, lax.TIMEOUT) == (5, 60)
+    adapter = strict.raw_session("https://mail/").mounted["https://mail/"]
+    assert isinstance(adapter, _Adapter) and adapter.kwargs["max_retries"] == 0
+    assert isinstance(lax.raw_session("https://mail/").mounted["https://mail/"], NoVerifyHTTPAdapter)
+
+    class _Account:
+        protocol = lax
+
+    assert transport_stats(_Account())["verify_tls"] is False
+    assert transport_stats(_Account())["timeout_seconds"] == 60
+
+
+def test_connection_budget_caps_requests_across_tenants() -> None:
+    budget = ConnectionBudget(2)
+    services = []
+    for index in range(3):
+        settings = _settings(email=f"tenant{index}@example.local")
+        limiter = CompositeLimiter(
+            mailbox=RateLimiter(rate_per_sec=1000, burst=1000, max_concurrency=4, min_rate_per_sec=0.2),
+            server=RateLimiter(rate_per_sec=1000, burst=1000, max_concurrency=16, min_rate_per_sec=0.2),
+            process=budget,
+        )
+        mailbox = SimulatedMailbox(items=50, seed=index, latency_seconds=0.02)
+        services.append(EwsReadonlyService(settings=settings, account_factory=lambda _, m=mailbox: m, limiter=limiter))
+
+    threads = [
+        threading.Thread(target=service.list_messages, kwargs={"limit": 1 + n})
+        for service in services
+        for n in range(2)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = budget.stats()
+    assert stats["peak"] == 2 and stats["active"] == 0
+    assert stats["calls"] >= 6
+    assert time.monotonic() - started >= 0.05
+    assert services[0].throttle_stats()["process"]["max_concurrency"] == 2
+
+
+def test_tenant_usage_lists_every_mailbox_served() -> None:
+    for email in ("a@tenant-one.example", "b@tenant-two.example"):
+        mailbox = SimulatedMailbox(items=20, seed=1)
+        EwsReadonlyService(settings=_settings(email=email), account_factory=lambda _, m=mailbox: m).list_messages(limit=1)
+
+    usage = tenant_usage()
+
+    assert "sim.example.local|a@tenant-one.example" in usage
+    assert usage["sim.example.local|b@tenant-two.example"]["calls"] >= 1
+
+
+class _HttpProtocol(_Protocol):
+    @classmethod
+    def raw_session(cls, prefix: str) -> requests.Session:
+        return requests.Session()
+
+
+class _SoapServer(ThreadingHTTPServer):
+    """Serves simulated inbox items as SOAP, gzip-compressed when the client asks for it."""
+
+    def __init__(self, mailbox: SimulatedMailbox) -> None:
+        super().__init__(("127.0.0.1", 0), _SoapHandler)
+        self.messages = list(mailbox.inbox.all().order_by("-datetime_received")[:40])
+        self.accept_encodings: list[str] = []
+        self.sent: dict[str, tuple[bytes, bytes]] = {}
+
+
+class _SoapHandler(BaseHTTPRequestHandler):
+    server: _SoapServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        operation = "FindItem" if b"FindItem" in body else "GetItem"
+        payload = soap_response(operation, self.server.messages if operation == "FindItem" else self.server.messages[:1])
+        encoding = self.headers.get("Accept-Encoding", "")
+        self.server.accept_encodings.append(encoding)
+        wire = gzip.compress(payload) if "gzip" in encoding else payload
+        self.server.sent[operation] = (payload, wire)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        if wire is not payload:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(wire)))
+        self.end_headers()
+        self.wfile.write(wire)
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+def _soap_request(operation: str) -> bytes:
+    return (
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+        'xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"><s:Header/>'
+        f"<s:Body><m:{operation} Traversal=\"Shallow\"/></s:Body></s:Envelope>"
+    ).encode()
+
+
+def test_compressed_responses_are_decoded_and_counted_per_operation() -> None:
+    server = _SoapServer(SimulatedMailbox(items=200, seed=3))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        protocol = _HttpProtocol()
+        scope_transport(protocol, _settings(), HTTPAdapter)
+        url = f"http://127.0.0.1:{server.server_address[1]}/EWS/Exchange.asmx"
+        session = protocol.raw_session(url)
+
+        find = session.post(url, data=_soap_request("FindItem"), headers={"Content-Type": "text/xml"})
+        get = session.post(url, data=_soap_request("GetItem"))
+        session.post(url, data=_soap_request("GetItem"))
+        # exchangelib parses through iter_content() with no chunk size.
+        root = to_xml(find.iter_content())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert server.accept_encodings == ["gzip, deflate"] * 3
+    find_payload, find_wire = server.sent["FindItem"]
+    get_payload, get_wire = server.sent["GetItem"]
+    assert find.content == find_payload and get.content == get_payload
+    assert len(root.findall(".//{http://schemas.microsoft.com/exchange/services/2006/types}Message")) == 40
+    assert len(next(find.iter_content())) == min(len(find_payload), 64 * 1024)
+
+    class _Account:
+        pass
+
+    _Account.protocol = protocol
+    operations = transport_stats(_Account())["operations"]
+    assert operations["FindItem"] == {"requests": 1, "wire_bytes": len(find_wire), "decoded_bytes": len(find_payload)}
+    assert operations["GetItem"] == {
+        "requests": 2,
+        "wire_bytes": 2 * len(get_wire),
+        "decoded_bytes": 2 * len(get_payload),
+    }
+    assert len(find_wire) * 2 < len(find_payload)
+
+    scope_transport(protocol, _settings(timeout_seconds=5), HTTPAdapter)
+    assert transport_stats(_Account())["operations"]["FindItem"]["requests"] == 1
@@ -0,0 +1,165 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from exchange_ews_readonly.client import build_account, forget_version, remember_version
+from exchange_ews_readonly.config import AuthType, Settings
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.version_cache import VersionCache
+
+
+class ErrorInvalidServerVersion(Exception):
+    pass
+
+
+def _settings(tmp_path, server: str = "mail.example.local") -> Settings:
+    return Settings(
+        server=server,
+        email="user@example.local",
+        username="EXAMPLE\\user",
+        password="secret",
+        version_cache_path=str(tmp_path / "cache" / "versions.json"),
+    )
+
+
+def _fake_account(build: tuple[int, int, int, int] | None, endpoint: str = "https://cas1/EWS/Exchange.asmx"):
+    version = None
+    if build is not None:
+        version = SimpleNamespace(
+            build=SimpleNamespace(
+                major_version=build[0], minor_version=build[1], major_build=build[2], minor_build=build[3]
+            ),
+            api_version="Exchange2016",
+        )
+    return SimpleNamespace(protocol=SimpleNamespace(config=SimpleNamespace(version=version, service_endpoint=endpoint)))
+
+
+def test_cache_round_trip_is_keyed_by_server_and_auth(tmp_path) -> None:
+    settings = _settings(tmp_path)
+    cache = VersionCache(settings.version_cache_path)
+
+    cache.store(settings, (15, 1, 2507, 6), "Exchange2016", "https://cas1/EWS/Exchange.asmx")
+
+    loaded = cache.load(settings)
+    assert loaded is not None
+    assert loaded.build == (15, 1, 2507, 6)
+    assert cache.load(replace(settings, auth_type=AuthType.BASIC)) is None
+    assert cache.load(replace(settings, server="other.example.local")) is None
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path) -> None:
+    settings = _settings(tmp_path)
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "versions.json").write_text("{not json", encoding="utf-8")
+
+    assert VersionCache(settings.version_cache_path).load(settings) is None
+
+
+def test_remember_and_forget_version(tmp_path) -> None:
+    settings = _settings(tmp_path)
+    account = _fake_account((15, 1, 2507, 6))
+
+    assert remember_version(settings, account)
+    assert VersionCache(settings.version_cache_path).load(settings) is not None
+
+    forget_version(settings, account)
+    assert VersionCache(settings.version_cache_path).load(settings) is None
+    assert account.protocol.config.version is None
+
+
+def test_remember_version_skips_unknown_version(tmp_path) -> None:
+    settings = _settings(tmp_path)
+    assert not remember_version(settings, _fake_account(None))
+    assert not remember_version(replace(settings, version_cache_path=""), _fake_account((15, 1, 0, 0)))
+
+
+def test_build_account_uses_cached_version_and_endpoint(tmp_path) -> None:
+    pytest.importorskip("exchangelib")
+    settings = _settings(tmp_path, server="cached-version.example.local")
+    VersionCache(settings.version_cache_path).store(
+        settings, (15, 1, 2507, 6), "Exchange2016", "https://cas7.example.local/EWS/Exchange.asmx"
+    )
+
+    account = build_account(settings)
+
+    config = account.protocol.config
+    assert config.service_endpoint == "https://cas7.example.local/EWS/Exchange.asmx"
+    assert config.version.build.major_build == 2507
+    assert config.version.api_version == "Exchange2016"
+
+
+def test_service_invalidates_cache_and_retries_on_version_error(tmp_path) -> None:
+    settings = _settings(tmp_path, server="stale-version.example.local")
+    VersionCache(settings.version_cache_path).store(settings, (14, 0, 0, 0), "Exchange2010", "https://old/EWS")
+    attempts: list[int] = []
+
+    class _Inbox:
+        def all(self) -> "_Inbox":
+            return self
+
+        def order_by(self, _field: str) -> "_Inbox":
+            return self
+
+        def __getitem__(self, slc: slice) -> list[object]:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ErrorInvalidServerVersion("stale")
+            account.protocol.config.version = _fake_account((15, 2, 1, 1)).protocol.config.version
+            return []
+
+    account = _fake_account((14, 0, 0, 0))
+    account.inbox = _Inbox()
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+    assert service.list_messages() == []
+    assert len(attempts) == 2
+    loaded = VersionCache(settings.version_cache_path).load(settings)
+    assert loaded is not None and loaded.build == (15, 2, 1, 1)
+
+
+def test_version_error_retry_sends_the_renegotiated_version(tmp_path) -> None:
+    settings = _settings(tmp_path, server="account-copy.example.local")
+    stale = _fake_account((14, 0, 0, 0)).protocol.config.version
+    fresh = _fake_account((15, 2, 1, 1)).protocol.config.version
+    sent: list[object] = []
+
+    class _Protocol:
+        def __init__(self) -> None:
+            self.config = SimpleNamespace(version=stale, service_endpoint="https://cas1/EWS/Exchange.asmx")
+
+        @property
+        def version(self) -> object:
+            if self.config.version is None:
+                self.config.version = fresh  # the re-probe
+            return self.config.version
+
+    class _Account:
+        """Mimics exchangelib.Account: keeps its own copy of the protocol version."""
+
+        def __init__(self) -> None:
+            self.protocol = _Protocol()
+            self._version = None
+
+        @property
+        def version(self) -> object:
+            if self._version is None:
+                self._version = self.protocol.version
+            return self._version
+
+        @version.setter
+        def version(self, value: object) -> None:
+            self._version = value
+
+    account = _Account()
+
+    def _request(acct: _Account) -> str:
+        sent.append(acct.version)
+        if acct.version is stale:
+            raise ErrorInvalidServerVersion("stale")
+        return "ok"
+
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+    assert service._call(_request) == "ok"
+    assert sent == [stale, fresh]
@@ -0,0 +1,218 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from exchange_ews_readonly.config import Settings, Throttling
+from exchange_ews_readonly.models import MailSummary
+from exchange_ews_readonly.service import EwsReadonlyService
+from exchange_ews_readonly.watch import MailWatcher, WatermarkStore
+
+
+class NewMailEvent:
+    def __init__(self, item_id: str, watermark: str, changekey: str = "ck") -> None:
+        self.item_id = SimpleNamespace(id=item_id, changekey=changekey)
+        self.watermark = watermark
+
+
+class ModifiedEvent(NewMailEvent):
+    pass
+
+
+class _DroppedConnection(ConnectionError):
+    pass
+
+
+class ErrorInvalidWatermark(Exception):
+    pass
+
+
+class ErrorAccessDenied(Exception):
+    pass
+
+
+class _Inbox:
+    def __init__(self, batches: list[object]) -> None:
+        self._batches = batches
+        self.subscribed_from: list[str | None] = []
+        self.polled_from: list[str] = []
+        self.unsubscribed: list[str] = []
+        self.rejected_watermarks: set[str] = set()
+
+    def subscribe_to_pull(self, event_types: list[str], watermark: str | None, timeout: int) -> tuple[str, str]:
+        self.subscribed_from.append(watermark)
+        if watermark in self.rejected_watermarks:
+            raise ErrorInvalidWatermark(watermark)
+        return f"sub{len(self.subscribed_from)}", "w0"
+
+    def unsubscribe(self, subscription_id: str) -> bool:
+        self.unsubscribed.append(subscription_id)
+        return True
+
+    def get_events(self, subscription_id: str, watermark: str) -> list[object]:
+        self.polled_from.append(watermark)
+        batch = self._batches.pop(0) if self._batches else []
+        if isinstance(batch, Exception):
+            raise batch
+        return [SimpleNamespace(events=batch)]
+
+
+class _Account:
+    def __init__(self, batches: list[object]) -> None:
+        self.inbox = _Inbox(batches)
+        self.fetched: list[list[str]] = []
+
+    def fetch(self, ids: list[object], folder: object, only_fields: list[str]) -> list[object]:
+        self.fetched.append([item_id.id for item_id in ids])
+        return [
+            SimpleNamespace(
+                id=item_id.id,
+                subject=f"subject {item_id.id}",
+                sender=SimpleNamespace(email_address="a@example.local"),
+                datetime_received=datetime(2026, 2, 16, tzinfo=timezone.utc),
+                text_body="hello",
+            )
+            for item_id in ids
+        ]
+
+
+def _watcher(account: _Account, store: WatermarkStore) -> MailWatcher:
+    def _summaries(acct: object, ids: list[object]) -> list[MailSummary | None]:
+        return [
+            MailSummary(id=item.id, subject=item.subject, sender="", datetime_received="", preview="")
+            for item in acct.fetch(ids=ids, folder=None, only_fields=[])
+        ]
+
+    return MailWatcher(
+        call=lambda fn: fn(account),
+        fetch_summaries=_summaries,
+        poll_seconds=1,
+        store=store,
+        sleep=lambda _seconds: None,
+    )
+
+
+def _take(iterator, count: int) -> list:
+    return [next(iterator) for _ in range(count)]
+
+
+def test_events_are_fetched_in_one_batch_per_poll(tmp_path) -> None:
+    account = _Account([[NewMailEvent("m1", "w1"), ModifiedEvent("m2", "w2")]])
+    watcher = _watcher(account, WatermarkStore(str(tmp_path / "state.json")))
+
+    events = _take(watcher.events(), 2)
+
+    assert [(event.event, event.message.id) for event in events] == [("new_mail", "m1"), ("modified", "m2")]
+    assert account.fetched == [["m1", "m2"]]
+
+
+def test_reconnect_resumes_from_last_emitted_watermark_without_duplicates(tmp_path) -> None:
+    account = _Account(
+        [
+            [NewMailEvent("m1", "w1")],
+            _DroppedConnection(),
+            # The server replays m1 after resume; only m2 is new.
+            [NewMailEvent("m1", "w1"), NewMailEvent("m2", "w2")],
+        ]
+    )
+    store = WatermarkStore(str(tmp_path / "state.json"))
+    watcher = _watcher(account, store)
+
+    events = _take(watcher.events(), 2)
+
+    assert [event.message.id for event in events] == ["m1", "m2"]
+    assert account.inbox.subscribed_from == [None, "w1"]
+    assert watcher.reconnects == 1
+
+
+def test_closing_mid_batch_persists_the_last_emitted_event_and_unsubscribes(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    account = _Account([[NewMailEvent("m1", "w1"), NewMailEvent("m2", "w2"), NewMailEvent("m3", "w3")]])
+    events = _watcher(account, WatermarkStore(str(path))).events()
+
+    assert [event.message.id for event in _take(events, 2)] == ["m1", "m2"]
+    events.close()
+
+    assert WatermarkStore(str(path)).load() == "w2"
+    assert account.inbox.unsubscribed == ["sub1"]
+    restarted = _Account([[NewMailEvent("m3", "w3")]])
+    assert [event.message.id for event in _take(_watcher(restarted, WatermarkStore(str(path))).events(), 1)] == ["m3"]
+    assert restarted.inbox.subscribed_from == ["w2"]
+
+
+def test_service_max_events_stops_without_replay(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    settings = Settings(
+        server="watch-take.example.local",
+        email="user@example.local",
+        username="user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    account = _Account([[NewMailEvent("m1", "w1"), NewMailEvent("m2", "w2")]])
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+    assert [event.message.id for event in service.watch_messages(state_path=str(path), max_events=1)] == ["m1"]
+
+    assert WatermarkStore(str(path)).load() == "w1"
+    assert account.inbox.unsubscribed == ["sub1"]
+
+
+def test_rejected_watermark_is_dropped_and_watch_starts_fresh(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    WatermarkStore(str(path)).save("w-expired")
+    account = _Account([[NewMailEvent("m1", "w1")]])
+    account.inbox.rejected_watermarks.add("w-expired")
+
+    events = _take(_watcher(account, WatermarkStore(str(path))).events(), 1)
+
+    assert [event.message.id for event in events] == ["m1"]
+    assert account.inbox.subscribed_from == ["w-expired", None]
+
+
+def test_non_transient_errors_are_raised(tmp_path) -> None:
+    account = _Account([ErrorAccessDenied("no")])
+    watcher = _watcher(account, WatermarkStore(str(tmp_path / "state.json")))
+
+    with pytest.raises(ErrorAccessDenied):
+        next(watcher.events())
+    assert watcher.reconnects == 0
+    assert account.inbox.unsubscribed == ["sub1"]
+
+
+def test_restart_subscribes_from_persisted_watermark(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    WatermarkStore(str(path)).save("w7")
+
+    restarted = _Account([[NewMailEvent("m9", "w8")]])
+    _take(_watcher(restarted, WatermarkStore(str(path))).events(), 1)
+
+    assert restarted.inbox.subscribed_from == ["w7"]
+
+
+def test_corrupt_watermark_file_starts_fresh(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text("not json", encoding="utf-8")
+
+    assert WatermarkStore(str(path)).load() is None
+
+
+def test_watch_messages_guards_and_validates(monkeypatch: pytest.MonkeyPatch) -> None:
+    called: list[str] = []
+    monkeypatch.setattr("exchange_ews_readonly.service.assert_read_only", called.append)
+    settings = Settings(
+        server="watch.example.local",
+        email="user@example.local",
+        username="user",
+        password="secret",
+        throttling=Throttling(mailbox_rate_per_sec=1000, mailbox_burst=1000),
+    )
+    account = _Account([[NewMailEvent("m1", "w1")]])
+    service = EwsReadonlyService(settings=settings, account_factory=lambda _: account)
+
+    events = list(service.watch_messages(preview=3, max_events=1))
+
+    assert called == ["watch"]
+    assert events[0].message.preview == "..."
+    with pytest.raises(ValueError, match="max events must be > 0"):
+        service.watch_messages(max_events=0)